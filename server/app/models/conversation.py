@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -13,6 +13,10 @@ class Conversation(Base):
     )
     title = Column(String(255), nullable=False)
     domain_filter = Column(String(100), nullable=True)
+    # Rolling summary of the earlier turns, maintained by the chat service
+    summary = Column(Text, nullable=True)
+    # Id of the last message folded into the summary
+    summary_message_id = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -25,6 +29,7 @@ class Conversation(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_conversation_id_id", "conversation_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(
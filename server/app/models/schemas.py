@@ -1,10 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class SearchRequest(BaseModel):
     query: str
     domain: Optional[str] = None
 
+class BatchSearchQuery(BaseModel):
+    query: str
+    domain: Optional[str] = None
+
+class BatchSearchRequest(BaseModel):
+    queries: List[BatchSearchQuery]
+    n_results: int = Field(5, ge=1, le=20)
+    include_answers: bool = False
+
 class LawCitation(BaseModel):
     id: str
     source: str
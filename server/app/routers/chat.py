@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
+import json
 from ..database import get_db
 from ..services.rag_service import rag_service
+from ..services.answer_cache import bypass_requested
 from ..models.user import User
 from ..routers.conversations import get_current_user
 
@@ -29,24 +32,18 @@ async def chat(
     request: ChatRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
+    x_bypass_cache: Optional[str] = Header(None),
 ):
     session_id = f"conv_{request.conversation_id}"
 
-    context = rag_service.retrieve_context(
-        query=request.message, domain=request.domain, n_results=3
-    )
-
-    answer_dict = rag_service.generate_answer(
+    _, answer_dict, related_cases = await rag_service.answer_query(
         query=request.message,
-        context=context,
-        session_id=session_id,
         domain=request.domain,
+        session_id=session_id,
+        n_results=3,
+        use_cache=not bypass_requested(x_bypass_cache),
     )
 
-    related_cases = rag_service.find_related_cases(request.message)
-
-    import json
-
     citations = answer_dict.get("citations", [])
 
     response_json_str = json.dumps(answer_dict)
@@ -57,3 +54,43 @@ async def chat(
         "citations": citations,
         "related_cases": related_cases,
     }
+
+
+@router.post("/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    x_bypass_cache: Optional[str] = Header(None),
+):
+    """
+    Server-sent events variant of /api/chat. Each answer field (law, examples,
+    simple_answer, citations, ...) is pushed as a `field` event as soon as the
+    model completes it; the final `done` event carries the same payload as
+    the non-streaming endpoint.
+    """
+    session_id = f"conv_{request.conversation_id}"
+
+    async def event_stream():
+        async for event, data in rag_service.stream_query(
+            query=request.message,
+            domain=request.domain,
+            session_id=session_id,
+            n_results=3,
+            use_cache=not bypass_requested(x_bypass_cache),
+        ):
+            if event == "done":
+                answer_dict = data["answer"]
+                data = {
+                    "response": json.dumps(answer_dict),
+                    "sources": [],
+                    "citations": answer_dict.get("citations", []),
+                    "related_cases": data["related_cases"],
+                }
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
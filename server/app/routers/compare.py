@@ -1,7 +1,7 @@
 from fastapi import APIRouter
 from app.models.schemas import CompareRequest, CompareResponse
 from app.data.legal_mapping import get_mapping
-from app.services.rag_service import rag_service
+from app.services.llm_client import llm_client
 import json
 import re
 
@@ -48,10 +48,9 @@ async def compare_laws(request: CompareRequest):
         }}
         """
 
-        response = rag_service.chat.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+        response = await llm_client.complete(
+            "compare",
             temperature=0.1,
-            max_tokens=800,
             response_format={"type": "json_object"},
             messages=[
                 {
@@ -1,18 +1,20 @@
-from fastapi import APIRouter
-from app.models.schemas import SearchRequest, SearchResponse
+import json
+import os
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional
+from app.models.schemas import BatchSearchRequest, SearchRequest, SearchResponse
 from app.services.rag_service import rag_service
+from app.services.answer_cache import bypass_requested
 
 router = APIRouter(prefix="/api/search", tags=["Search"])
 
+SEARCH_BATCH_MAX_QUERIES = int(os.environ.get("SEARCH_BATCH_MAX_QUERIES", "500"))
+# Queries searched (and answered) at the same time within one batch
+SEARCH_BATCH_CONCURRENCY = int(os.environ.get("SEARCH_BATCH_CONCURRENCY", "8"))
 
-@router.post("/", response_model=SearchResponse)
-async def search_legal_code(request: SearchRequest):
-    context = rag_service.retrieve_context(query=request.query, domain=request.domain)
-
-    answer_dict = rag_service.generate_answer(query=request.query, context=context)
-
-    related_cases_list = rag_service.find_related_cases(request.query)
 
+def _format_citations(context: List[Dict]) -> List[Dict]:
     formatted_citations = []
     for item in context:
         meta = item["metadata"]
@@ -25,6 +27,19 @@ async def search_legal_code(request: SearchRequest):
                 "url": f"https://indiankanoon.org/search/?formInput={meta.get('act', '').replace(' ', '+')}",
             }
         )
+    return formatted_citations
+
+
+@router.post("/", response_model=SearchResponse)
+async def search_legal_code(
+    request: SearchRequest, x_bypass_cache: Optional[str] = Header(None)
+):
+    # Searches are stateless: no session history and no classification
+    context, answer_dict, related_cases_list = await rag_service.search_query(
+        query=request.query,
+        domain=request.domain,
+        use_cache=not bypass_requested(x_bypass_cache),
+    )
 
     return {
         "structured_answer": {
@@ -32,7 +47,50 @@ async def search_legal_code(request: SearchRequest):
             "yellow_layer": answer_dict.get("yellow_layer", ""),
             "red_layer": answer_dict.get("red_layer", ""),
         },
-        "citations": formatted_citations,
+        "citations": _format_citations(context),
         "related_cases": related_cases_list,
         "legal_domain_detected": request.domain or "GENERAL",
     }
+
+
+@router.post("/batch")
+async def search_batch(
+    request: BatchSearchRequest, x_bypass_cache: Optional[str] = Header(None)
+):
+    """
+    Searches many queries in one call. Queries are embedded together and
+    searched with bounded parallelism; results stream back as NDJSON, one
+    line per query in completion order, each tagged with its index in the
+    request. Set include_answers to also get the /api/search answer layers
+    for each query.
+    """
+    if len(request.queries) > SEARCH_BATCH_MAX_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {SEARCH_BATCH_MAX_QUERIES} queries per batch",
+        )
+
+    async def lines():
+        async for index, context, answer in rag_service.search_batch(
+            [(item.query, item.domain) for item in request.queries],
+            n_results=request.n_results,
+            include_answers=request.include_answers,
+            concurrency=SEARCH_BATCH_CONCURRENCY,
+            use_cache=not bypass_requested(x_bypass_cache),
+        ):
+            item = request.queries[index]
+            result = {
+                "index": index,
+                "query": item.query,
+                "domain": item.domain,
+                "citations": _format_citations(context),
+            }
+            if answer is not None:
+                result["answer"] = answer
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -14,7 +14,7 @@ class TTSRequest(BaseModel):
 @router.post("/process-tts")
 async def process_tts(request: TTSRequest):
     try:
-        audio_base64 = sarvam_service.text_to_speech(request.text)
+        audio_base64 = await sarvam_service.text_to_speech(request.text)
         if not audio_base64:
             raise HTTPException(status_code=500, detail="Failed to generate speech")
         return {"audio": audio_base64}
@@ -25,7 +25,7 @@ async def process_tts(request: TTSRequest):
 async def process_stt(file: UploadFile = File(...)):
     try:
         content = await file.read()
-        transcript = sarvam_service.speech_to_text(content)
+        transcript = await sarvam_service.speech_to_text(content)
         if not transcript:
             raise HTTPException(status_code=500, detail="Failed to transcribe audio")
         return {"transcript": transcript}
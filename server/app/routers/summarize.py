@@ -36,7 +36,7 @@ async def upload_and_summarize(
 
     try:
         # Process PDF and generate summary
-        result = process_pdf_document(content)
+        result = await process_pdf_document(content)
 
         return {
             "success": True,
@@ -0,0 +1,140 @@
+import copy
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+def bypass_requested(header_value: Optional[str]) -> bool:
+    """True when the X-Bypass-Cache request header asks to skip the answer cache."""
+    return bool(header_value) and header_value.strip().lower() in ("1", "true", "yes")
+
+
+class _Entry:
+    __slots__ = ("domain", "vector", "chunk_ids", "answer", "expires_at")
+
+    def __init__(self, domain, vector, chunk_ids, answer, expires_at):
+        self.domain = domain
+        self.vector = vector
+        self.chunk_ids = chunk_ids
+        self.answer = answer
+        self.expires_at = expires_at
+
+
+class SemanticAnswerCache:
+    """
+    Reuses generated legal answers for semantically equivalent queries.
+
+    An entry matches when it is in the same domain, its query embedding is
+    within ``threshold`` cosine similarity of the new query, and it was
+    generated from exactly the same retrieved chunk IDs. Re-ingesting the corpus
+    changes chunk IDs, so stale answers stop matching on their own. Entries are
+    evicted in LRU order and after a TTL.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        max_entries: int = 2000,
+        ttl_seconds: float = 24 * 3600,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        # Per-domain (entry ids, stacked unit vectors), rebuilt lazily
+        self._matrices: Dict[str, tuple] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SemanticAnswerCache":
+        return cls(
+            threshold=float(os.environ.get("ANSWER_CACHE_THRESHOLD", "0.95")),
+            max_entries=int(os.environ.get("ANSWER_CACHE_SIZE", "2000")),
+            ttl_seconds=float(os.environ.get("ANSWER_CACHE_TTL", str(24 * 3600))),
+        )
+
+    def lookup(
+        self, embedding: List[float], domain: Optional[str], chunk_ids: Iterable[str]
+    ) -> Optional[Dict]:
+        domain_key = domain or ""
+        chunk_key = frozenset(chunk_ids)
+        vector = self._unit(embedding)
+
+        with self._lock:
+            ids, matrix = self._matrix(domain_key)
+            if matrix is not None:
+                scores = matrix @ vector
+                now = time.time()
+                for i in np.argsort(-scores):
+                    if scores[i] < self.threshold:
+                        break
+                    entry = self._entries.get(ids[i])
+                    if entry is None or entry.expires_at < now:
+                        continue
+                    if entry.chunk_ids == chunk_key:
+                        self._entries.move_to_end(ids[i])
+                        self.hits += 1
+                        return copy.deepcopy(entry.answer)
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        embedding: List[float],
+        domain: Optional[str],
+        chunk_ids: Iterable[str],
+        answer: Dict,
+    ):
+        domain_key = domain or ""
+        entry = _Entry(
+            domain_key,
+            self._unit(embedding),
+            frozenset(chunk_ids),
+            copy.deepcopy(answer),
+            time.time() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._entries[next(self._ids)] = entry
+            self._matrices.pop(domain_key, None)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._matrices.pop(evicted.domain, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _matrix(self, domain_key: str):
+        # Caller must hold the lock
+        cached = self._matrices.get(domain_key)
+        if cached is None:
+            ids = [i for i, e in self._entries.items() if e.domain == domain_key]
+            matrix = np.stack([self._entries[i].vector for i in ids]) if ids else None
+            cached = (ids, matrix)
+            self._matrices[domain_key] = cached
+        return cached
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
@@ -0,0 +1,164 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+BM25_INDEX_PATH = os.environ.get(
+    "BM25_INDEX_PATH", os.path.join(BASE_DIR, "data", "index", "bm25.json")
+)
+
+# Keeps statute tokens such as "318", "124a" and "bnss" intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9ऀ-ॿ]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it of on or that the this "
+    "to was were what which who will with under shall any such".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    In-memory Okapi BM25 inverted index over statute chunks.
+
+    Documents carry the same IDs as in the vector store, so lexical and dense
+    results can be fused. Supports incremental add/remove and persists the raw
+    chunks as JSON; postings are rebuilt on load.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, Document] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: str = BM25_INDEX_PATH) -> "BM25Index":
+        index = cls(path=path)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for doc in data["docs"]:
+                index._add(
+                    doc["id"],
+                    Document(page_content=doc["text"], metadata=doc["metadata"]),
+                )
+        return index
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            docs = [
+                {"id": doc_id, "text": doc.page_content, "metadata": doc.metadata}
+                for doc_id, doc in self._docs.items()
+            ]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"docs": docs}, f, ensure_ascii=False)
+        os.replace(self.path + ".tmp", self.path)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add_documents(self, documents: Sequence[Document], ids: Sequence[str]):
+        with self._lock:
+            for doc_id, doc in zip(ids, documents):
+                self._add(doc_id, doc)
+
+    def delete(self, ids: Sequence[str]):
+        with self._lock:
+            for doc_id in ids:
+                self._remove(doc_id)
+
+    def search(
+        self, query: str, k: int = 5, filter: Optional[dict] = None
+    ) -> List[Document]:
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self._docs)
+            if not n_docs or not terms:
+                return []
+            avg_length = self._total_length / n_docs
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(
+                    1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (
+                        1 - self.b + self.b * self._lengths[doc_id] / avg_length
+                    )
+                    weight = tf * (self.k1 + 1) / (tf + norm)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for doc_id, _ in ranked:
+                doc = self._docs[doc_id]
+                if filter and any(doc.metadata.get(f) != v for f, v in filter.items()):
+                    continue
+                results.append(
+                    Document(
+                        id=doc_id,
+                        page_content=doc.page_content,
+                        metadata=dict(doc.metadata),
+                    )
+                )
+                if len(results) == k:
+                    break
+            return results
+
+    def _add(self, doc_id: str, doc: Document):
+        self._remove(doc_id)
+        counts = Counter(tokenize(doc.page_content))
+        self._docs[doc_id] = Document(
+            page_content=doc.page_content, metadata=dict(doc.metadata)
+        )
+        self._lengths[doc_id] = sum(counts.values())
+        self._total_length += self._lengths[doc_id]
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove(self, doc_id: str):
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= self._lengths.pop(doc_id)
+        for term in set(tokenize(doc.page_content)):
+            postings = self._postings.get(term)
+            if postings:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[Document]], k: int = 60
+) -> List[Document]:
+    """Merges ranked Document lists by reciprocal rank, keyed on document ID."""
+    scores: Dict[str, float] = {}
+    docs: Dict[str, Document] = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            key = doc.id or doc.page_content
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+            docs.setdefault(key, doc)
+    return [docs[key] for key in sorted(scores, key=scores.get, reverse=True)]
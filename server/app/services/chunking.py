@@ -0,0 +1,233 @@
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+# Target chunk length in characters; a section longer than this is split at
+# sub-section, explanation, proviso or clause boundaries with some overlap.
+# On the bundled acts (benchmarks/bench_chunking.py) 1500/150 gives 3850
+# chunks against 4587 for the old 900-character splitter and 6776 at 800/80,
+# with the best recall@3/@5 (0.88/0.92) of the sizes tried
+CHUNK_SIZE = int(os.environ.get("CHUNK_SIZE", "1500"))
+CHUNK_OVERLAP = int(os.environ.get("CHUNK_OVERLAP", "150"))
+
+# Section numbers skip omitted sections, but a larger jump is a false match
+MAX_SECTION_GAP = 10
+
+# "57.Whoever", "47. Factors ... .–", "6[49. [Composition" (amendment marker)
+_SECTION_START = re.compile(
+    r"^\s*(?:\d+\[)?(\d{1,3})([A-Z]{0,3})\.\s*"
+    r"(?!(?:Subs|Ins|Omitted|Added|Rep|The words|Vide|Renumbered)\b)(?=\S)"
+)
+# "47. Factors to be taken into account.–" or "253. [Determination of
+# sickness.] Omitted by": headings that can't be mistaken for anything else
+_TITLED = re.compile(r"\.\s*[—–]|^\s*(?:\d+\[)?\d{1,3}[A-Z]{0,3}\.\s*\[")
+_AMENDMENT_MARK = re.compile(r"\d+\[|\]")
+_SECTION_TITLE = re.compile(
+    r"^\s*(?:\d+\[)?\d{1,3}[A-Z]{0,3}\.\s*\[?([^.—–]{3,200}?)\s*\]?\s*\.\s*[—–-]"
+)
+# Amendment footnotes at the foot of a page, dropped: "5. Clause (n)
+# omitted by Act 7 of 2017", "1. Subs. by s. 3, ibid."
+_FOOTNOTE = re.compile(r"\b(?:by|vide)\s+(?:Act|s\.|Notification)\s*(?:No\.\s*)?\d")
+_CHAPTER = re.compile(r"^\s*CHAPTER\s+([IVXLC]+[A-Z]?)\s*$")
+_PART = re.compile(r"^\s*PART\s+([IVXLC]+[A-Z]?)\s*$")
+_TOC = re.compile(r"ARRANGEMENT OF (?:SECTIONS|RULES)")
+# Page numbers and running heads of gazette prints
+_NOISE = re.compile(
+    r"^\s*(?:\d{1,4}|\d{0,4}\s*THE GAZETTE OF INDIA EXTRAORDINARY.*"
+    r"|SEC\.\s*\d+\].*)\s*$"
+)
+# Where a long section may be split, in the statute's own structure
+_BOUNDARY = re.compile(
+    r"^\s*(?:\d+\[)?(?:\(\d+[A-Z]?\)|\([a-z]{1,4}\)|\([ivx]+\)"
+    r"|Explanation|Illustration|Provided)"
+)
+
+
+def _tail(text: str, overlap: int) -> str:
+    """The last ``overlap`` characters of text, starting at a word."""
+    if overlap <= 0 or len(text) <= overlap:
+        return text if overlap > 0 else ""
+    tail = text[-overlap:]
+    space = tail.find(" ")
+    return tail[space + 1 :] if space != -1 else tail
+
+
+def _hard_split(block: str, size: int) -> List[str]:
+    """Splits a block with no inner boundary at line, then word, breaks."""
+    if len(block) <= size:
+        return [block]
+    pieces, current = [], ""
+    for word in re.split(r"(?<=\s)", block):
+        if current and len(current) + len(word) > size:
+            pieces.append(current.strip())
+            current = ""
+        current += word
+    if current.strip():
+        pieces.append(current.strip())
+    return pieces
+
+
+def split_section(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """
+    One section's text as chunks of about ``chunk_size`` characters, split at
+    the section's own sub-section, explanation, proviso and clause starts;
+    each chunk after the first repeats the end of the previous one.
+    """
+    if len(text) <= chunk_size:
+        return [text]
+
+    blocks: List[str] = []
+    for line in text.split("\n"):
+        if blocks and not _BOUNDARY.match(line):
+            blocks[-1] += "\n" + line
+        else:
+            blocks.append(line)
+
+    pieces = []
+    for block in blocks:
+        pieces.extend(_hard_split(block, max(1, chunk_size - chunk_overlap)))
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > chunk_size:
+            chunks.append(current)
+            tail = _tail(current, chunk_overlap)
+            current = f"{tail}\n{piece}" if tail else piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class _Section:
+    def __init__(self, number: Optional[str], page: int, structure: Dict[str, str]):
+        self.number = number
+        self.page = page
+        self.structure = dict(structure)
+        self.lines: List[str] = []
+
+
+def chunk_statute(
+    pages: Iterable[str],
+    metadata: Dict,
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+) -> Iterator[Document]:
+    """
+    Chunks an Act or set of Rules page by page, one section at a time.
+
+    A section starts at a numbered heading ("57.", "43A.") that follows the
+    previous section number, within MAX_SECTION_GAP unless the heading has an
+    inline title; the arrangement-of-sections table at the start of many
+    prints is skipped. Sections up to ``chunk_size`` characters are one chunk,
+    longer ones are split by split_section() and every part after the first
+    starts with the section heading, counted within ``chunk_size``.
+
+    Every chunk carries the ``section`` number, its ``section_title`` when the
+    print has one inline, the ``part``/``part_title`` and
+    ``chapter``/``chapter_title`` it falls under and the 0-based ``page`` where
+    the section starts. Text before the first section is the "Preamble"; a
+    document without numbered sections (a policy note or judgment) is split by
+    size and has no ``section``.
+    """
+    structure: Dict[str, str] = {}
+    current = _Section(None, 0, structure)
+    last_key: Optional[Tuple[int, str]] = None
+    in_toc = False
+    toc_starts = 0
+    awaiting_title: Optional[str] = None
+
+    def emit(section: _Section, preamble: bool = False) -> Iterator[Document]:
+        text = "\n".join(section.lines).strip()
+        if not text:
+            return
+        section_metadata = {**metadata, **section.structure, "page": section.page}
+        # Repeated on every later chunk of a split section, so each one still
+        # says which section it belongs to
+        heading = section.lines[0][:80]
+        if section.number is not None:
+            section_metadata["section"] = section.number
+            title = _SECTION_TITLE.match(section.lines[0])
+            if title:
+                section_metadata["section_title"] = " ".join(title.group(1).split())
+                heading = f"{section.number}. {section_metadata['section_title']}"
+        elif preamble:
+            section_metadata["section"] = "Preamble"
+        prefix = f"{heading} ...\n" if section.number is not None else ""
+        # Leave room for the heading so no chunk exceeds chunk_size
+        budget = max(chunk_overlap + 1, chunk_size - len(prefix))
+        for i, chunk in enumerate(split_section(text, budget, chunk_overlap)):
+            if i:
+                chunk = prefix + chunk
+            yield Document(page_content=chunk, metadata=dict(section_metadata))
+
+    for page_number, page in enumerate(pages):
+        for raw_line in page.split("\n"):
+            line = raw_line.rstrip()
+            if not line.strip() or _NOISE.match(line):
+                continue
+
+            if _TOC.search(line) and last_key is None:
+                in_toc = True
+                continue
+
+            chapter = _CHAPTER.match(line)
+            part = _PART.match(line)
+            if chapter or part:
+                if part:
+                    structure.clear()
+                    structure["part"] = part.group(1)
+                    awaiting_title = "part_title"
+                else:
+                    structure.pop("chapter_title", None)
+                    structure["chapter"] = chapter.group(1)
+                    awaiting_title = "chapter_title"
+                continue
+
+            heading = _SECTION_START.match(line)
+            titled = bool(heading and _TITLED.search(line))
+            if heading and _FOOTNOTE.search(line) and not titled:
+                continue
+            if awaiting_title:
+                if not heading and line.strip().upper() == line.strip():
+                    structure[awaiting_title] = " ".join(
+                        _AMENDMENT_MARK.sub("", line).split()
+                    )
+                    awaiting_title = None
+                    continue
+                awaiting_title = None
+
+            if heading:
+                key = (int(heading.group(1)), heading.group(2))
+                if in_toc:
+                    # The table lists section 1 first; the Act restarts at it
+                    if key == (1, ""):
+                        toc_starts += 1
+                    if toc_starts < 2:
+                        # Only headings after the table's last entry count
+                        structure.clear()
+                        continue
+                    in_toc = False
+                if last_key is None:
+                    accepted = key[0] <= MAX_SECTION_GAP
+                elif titled:
+                    accepted = last_key < key
+                else:
+                    accepted = last_key < key <= (last_key[0] + MAX_SECTION_GAP, "~")
+                if accepted:
+                    yield from emit(current, preamble=last_key is None)
+                    last_key = key
+                    current = _Section(
+                        heading.group(1) + heading.group(2), page_number, structure
+                    )
+                    current.lines.append(line.strip())
+                    continue
+
+            if in_toc:
+                continue
+            current.lines.append(line.strip())
+
+    yield from emit(current)
@@ -0,0 +1,304 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from app.database import SessionLocal
+from app.models.conversation import Conversation, Message
+from app.services.history_store import CONVERSATION_SESSION, _to_chat_message
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a conversation between a user and SamvidhanAI, an Indian legal assistant.
+
+Merge the new turns into the existing summary. Keep the user's situation and key facts, the acts and sections discussed, the conclusions given and any open questions. Drop greetings and repetition.
+
+Write at most 120 words of plain text. Output only the updated summary."""
+
+
+def answer_text(answer: dict) -> str:
+    """Plain-text form of a generated answer for the summarizer."""
+    if "casual" in answer:
+        return answer["casual"]
+    parts = [answer.get("law", ""), answer.get("simple_answer", "")]
+    return "\n".join(p for p in parts if p)[:1500]
+
+
+class _Entry:
+    __slots__ = ("summary", "turns", "folding", "expires_at")
+
+    def __init__(self, expires_at: float):
+        self.summary = ""
+        # (user, assistant) turns not yet folded into the summary
+        self.turns: List[Tuple[str, str]] = []
+        self.folding = False
+        self.expires_at = expires_at
+
+
+class ConversationMemory:
+    """
+    Compact rolling summary per conversation.
+
+    Once more than ``recent_turns`` turns are waiting, the oldest are folded
+    into the summary by the small summary model in a background task, so the
+    answer path never waits on it. Prompts then carry the summary plus the
+    turns not yet folded, which keeps their size flat however long the
+    conversation runs.
+
+    Summaries of ``conv_<id>`` sessions live on the conversation row next to
+    the id of the last message they cover, and are folded from the messages
+    table rather than from this worker's turns, so turns served by any worker
+    are included. The save is a compare-and-set on that id: when two workers
+    fold the same turns, the first one wins and the other drops its result.
+    Other sessions queue their turns in memory.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        recent_turns: int = 2,
+        max_sessions: int = 1000,
+        ttl_seconds: float = 1800,
+    ):
+        self.client = client
+        self.recent_turns = recent_turns
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tasks = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, client=None) -> "ConversationMemory":
+        return cls(
+            client=client,
+            recent_turns=int(os.environ.get("HISTORY_RECENT_TURNS", "2")),
+            max_sessions=int(os.environ.get("HISTORY_CACHE_SIZE", "1000")),
+            ttl_seconds=float(os.environ.get("HISTORY_CACHE_TTL", "1800")),
+        )
+
+    async def get_summary(self, session_id: str) -> Tuple[str, int]:
+        """The summary and how many recent messages it does not cover yet."""
+        if self._conversation_id(session_id) is not None:
+            summary, _, unfolded = await asyncio.to_thread(self._load, session_id)
+            return summary or "", unfolded
+        with self._lock:
+            entry = self._get_entry(session_id)
+            return entry.summary, 2 * len(entry.turns)
+
+    def record_turn(self, session_id: str, user_text: str, assistant_text: str):
+        """Queues a finished turn; folding runs in the background if needed."""
+        stored = self._conversation_id(session_id) is not None
+        with self._lock:
+            entry = self._get_entry(session_id)
+            if not stored:
+                entry.turns.append((user_text, assistant_text))
+            # Stored sessions count their backlog in the database
+            if entry.folding or (not stored and len(entry.turns) <= self.recent_turns):
+                return
+            entry.folding = True
+
+        fold = self._fold_stored if stored else self._fold
+        try:
+            task = asyncio.get_running_loop().create_task(fold(session_id))
+        except RuntimeError:
+            with self._lock:
+                self._get_entry(session_id).folding = False
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def clear(self, session_id: str = "default"):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    async def _fold(self, session_id: str):
+        try:
+            while True:
+                with self._lock:
+                    entry = self._get_entry(session_id)
+                    folded = entry.turns[: -self.recent_turns or None]
+                    summary = entry.summary
+                if not folded:
+                    return
+
+                updated = await self._summarize(
+                    summary,
+                    [
+                        f"User: {user}\nAssistant: {assistant}"
+                        for user, assistant in folded
+                    ],
+                )
+                if updated is None:
+                    # Keep the backlog bounded while the summarizer is failing
+                    with self._lock:
+                        entry = self._get_entry(session_id)
+                        del entry.turns[
+                            : max(len(entry.turns) - 4 * self.recent_turns, 0)
+                        ]
+                    return
+
+                with self._lock:
+                    entry = self._get_entry(session_id)
+                    entry.summary = updated
+                    del entry.turns[: len(folded)]
+        finally:
+            with self._lock:
+                self._get_entry(session_id).folding = False
+
+    async def _fold_stored(self, session_id: str):
+        try:
+            while True:
+                summary, last_id, _ = await asyncio.to_thread(self._load, session_id)
+                rows = await asyncio.to_thread(self._unfolded, session_id, last_id)
+                folded = rows[: -2 * self.recent_turns or None]
+                if not folded:
+                    return
+
+                updated = await self._summarize(
+                    summary,
+                    [
+                        f"{'User' if row.role == 'user' else 'Assistant'}: "
+                        f"{_to_chat_message(row).content}"
+                        for row in folded
+                    ],
+                )
+                if updated is None:
+                    return
+                saved = await asyncio.to_thread(
+                    self._save, session_id, updated, last_id, folded[-1].id
+                )
+                if not saved:
+                    # Another worker folded these turns first
+                    return
+        finally:
+            with self._lock:
+                self._get_entry(session_id).folding = False
+
+    async def _summarize(self, summary: str, lines: List[str]) -> Optional[str]:
+        if self.client is None:
+            return None
+        transcript = "\n".join(lines)
+        try:
+            response = await self.client.complete(
+                "conversation_summary",
+                temperature=0,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": f"Current summary:\n{summary or '(none)'}\n\nNew turns:\n{transcript}",
+                    },
+                ],
+            )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Conversation summary update failed: {e}")
+            return None
+
+    def _conversation_id(self, session_id: str) -> Optional[int]:
+        match = CONVERSATION_SESSION.match(session_id)
+        return int(match.group(1)) if match else None
+
+    def _load(self, session_id: str) -> Tuple[Optional[str], Optional[int], int]:
+        """The stored summary, the last message it covers and the messages after it."""
+        conversation_id = self._conversation_id(session_id)
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(Conversation.summary, Conversation.summary_message_id)
+                .filter(Conversation.id == conversation_id)
+                .first()
+            )
+            if row is None:
+                return None, None, 0
+            if not row.summary:
+                return None, row.summary_message_id, 0
+            unfolded = (
+                db.query(Message.id)
+                .filter(
+                    Message.conversation_id == conversation_id,
+                    Message.id > (row.summary_message_id or 0),
+                )
+                .count()
+            )
+            return row.summary, row.summary_message_id, unfolded
+        except Exception as e:
+            print(f"Conversation summary load failed for {session_id}: {e}")
+            return None, None, 0
+        finally:
+            db.close()
+
+    def _unfolded(self, session_id: str, last_id: Optional[int]) -> List[Message]:
+        """Oldest-first messages after ``last_id``, capped like the memory backlog."""
+        conversation_id = self._conversation_id(session_id)
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Message)
+                .filter(
+                    Message.conversation_id == conversation_id,
+                    Message.id > (last_id or 0),
+                )
+                .order_by(Message.id.desc())
+                .limit(6 * self.recent_turns)
+                .all()
+            )
+        except Exception as e:
+            print(f"Conversation summary history load failed for {session_id}: {e}")
+            return []
+        finally:
+            db.close()
+        rows.reverse()
+        return rows
+
+    def _save(
+        self,
+        session_id: str,
+        summary: str,
+        last_id: Optional[int],
+        message_id: int,
+    ) -> bool:
+        """Stores the summary unless another worker moved it past ``last_id``."""
+        conversation_id = self._conversation_id(session_id)
+        if last_id is None:
+            current = Conversation.summary_message_id.is_(None)
+        else:
+            current = Conversation.summary_message_id == last_id
+        db = SessionLocal()
+        try:
+            updated = (
+                db.query(Conversation)
+                .filter(Conversation.id == conversation_id, current)
+                .update(
+                    {
+                        "summary": summary,
+                        "summary_message_id": message_id,
+                        # Keep the sidebar order: a summary is not user activity
+                        "updated_at": Conversation.updated_at,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            db.commit()
+            return updated > 0
+        except Exception as e:
+            db.rollback()
+            print(f"Conversation summary save failed for {session_id}: {e}")
+            return False
+        finally:
+            db.close()
+
+    def _get_entry(self, session_id: str) -> _Entry:
+        # Caller must hold the lock
+        now = time.monotonic()
+        entry = self._entries.get(session_id)
+        if entry is None or entry.expires_at < now:
+            entry = _Entry(now + self.ttl_seconds)
+            self._entries[session_id] = entry
+        else:
+            entry.expires_at = now + self.ttl_seconds
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+        return entry
@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer assumed
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+EMBEDDING_CACHE = os.environ.get("EMBEDDING_CACHE", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = os.environ.get(
+    "EMBEDDING_CACHE_PATH", os.path.join(BASE_DIR, "data", "index", "embeddings")
+)
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.tsv"
+META_FILE = "meta.json"
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingCache:
+    """
+    Persistent embeddings keyed by (model name, sha256 of the text).
+
+    Each model has its own directory under ``path`` holding an append-only
+    float32 matrix (``vectors.f32``, memory-mapped for reads) and an index
+    file of ``sha256<TAB>row`` lines. Rows are appended under an exclusive
+    file lock, vectors before their index line, so ingestion runs can write
+    and the API server read one cache; entries written by another process
+    are picked up on the next miss. A partial row left by a crashed writer
+    is cut off before the next append. Once ``max_rows`` entries are stored
+    the cache stops growing but keeps serving hits.
+    """
+
+    def __init__(self, path: str, model: str, max_rows: int = 1_000_000):
+        self.model = model
+        self.path = os.path.join(path, re.sub(r"[^\w.-]+", "_", model))
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self.writable = True
+        self._rows: Dict[str, int] = {}
+        self._dim: Optional[int] = None
+        self._matrix: Optional[np.ndarray] = None
+        self._index_offset = 0
+        self._lock = threading.Lock()
+        with self._lock:
+            self._refresh()
+
+    @classmethod
+    def from_env(cls, model: str) -> "DiskEmbeddingCache":
+        return cls(
+            EMBEDDING_CACHE_PATH,
+            model,
+            max_rows=int(os.environ.get("EMBEDDING_CACHE_MAX_ROWS", "1000000")),
+        )
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            if any(key not in self._rows for key in keys):
+                self._refresh()
+            rows = [self._rows.get(key) for key in keys]
+            found = [row for row in rows if row is not None]
+            matrix = self._mapped(max(found)) if found else None
+            vectors = [
+                matrix[row].tolist() if row is not None else None for row in rows
+            ]
+            self.hits += len(found)
+            self.misses += len(rows) - len(found)
+        return vectors
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[Sequence[float]]):
+        if not self.writable or not texts:
+            return
+        new = {}
+        for text, vector in zip(texts, vectors):
+            new.setdefault(text_key(text), vector)
+        with self._lock:
+            try:
+                self._append(new)
+            except OSError as e:
+                # e.g. a read-only deployment: keep serving what is on disk
+                print(f"Embedding cache at {self.path} is read-only from now on: {e}")
+                self.writable = False
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _append(self, new: Dict[str, Sequence[float]]):
+        # Caller must hold the lock
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, VECTORS_FILE), "ab") as vectors_file:
+            if fcntl is not None:
+                fcntl.flock(vectors_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have appended since we last looked
+                self._refresh()
+                keys = [key for key in new if key not in self._rows]
+                keys = keys[: max(0, self.max_rows - len(self._rows))]
+                if not keys:
+                    return
+                matrix = np.asarray([new[key] for key in keys], dtype=np.float32)
+                if self._dim is None:
+                    self._dim = matrix.shape[1]
+                    with open(os.path.join(self.path, META_FILE), "w") as f:
+                        json.dump({"model": self.model, "dim": self._dim}, f)
+                elif matrix.shape[1] != self._dim:
+                    print(
+                        f"Embedding cache for {self.model} holds {self._dim}-d "
+                        f"vectors, not caching {matrix.shape[1]}-d ones"
+                    )
+                    return
+
+                first_row = self._truncate_torn_writes(vectors_file)
+                vectors_file.write(matrix.tobytes())
+                vectors_file.flush()
+                lines = "".join(
+                    f"{key}\t{first_row + i}\n" for i, key in enumerate(keys)
+                )
+                with open(os.path.join(self.path, INDEX_FILE), "a") as index_file:
+                    index_file.write(lines)
+                self._refresh()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(vectors_file, fcntl.LOCK_UN)
+
+    def _truncate_torn_writes(self, vectors_file) -> int:
+        """
+        Cuts a partial row (or index line) left by a writer that died mid-append,
+        so new rows land where their index lines say; returns the row count.
+        Caller holds the file lock.
+        """
+        row_bytes = self._dim * 4
+        size = vectors_file.seek(0, os.SEEK_END)
+        if size % row_bytes:
+            print(f"Embedding cache {self.path}: dropping a partially written row")
+            vectors_file.truncate(size - size % row_bytes)
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, "rb+") as index_file:
+                end = index_file.seek(0, os.SEEK_END)
+                # Index lines are 66-75 bytes; read back a few to find the last one
+                index_file.seek(max(0, end - 1024))
+                data = index_file.read()
+                if data and not data.endswith(b"\n"):
+                    index_file.truncate(end - len(data) + data.rfind(b"\n") + 1)
+        return size // row_bytes
+
+    def _refresh(self):
+        """Reads index lines appended since the last call (caller holds the lock)."""
+        if self._dim is None:
+            meta_path = os.path.join(self.path, META_FILE)
+            if not os.path.exists(meta_path):
+                return
+            with open(meta_path, "r") as f:
+                self._dim = json.load(f)["dim"]
+
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        # A line still being written by another process is read next time
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.decode("ascii").splitlines():
+            key, row = line.split("\t")
+            self._rows[key] = int(row)
+        self._index_offset += len(complete)
+
+    def _mapped(self, row: int) -> np.ndarray:
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            vectors_path = os.path.join(self.path, VECTORS_FILE)
+            rows = os.path.getsize(vectors_path) // (self._dim * 4)
+            self._matrix = np.memmap(
+                vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim)
+            )
+        return self._matrix
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings that consult a DiskEmbeddingCache first and only send the
+    misses to the wrapped model. Queries share the document cache only when
+    the model embeds both the same way (``symmetric``), as mistral-embed does.
+
+    Read-only: this wraps the API server's query path, where vectors are
+    cached in memory by QueryEmbeddingCache. Writing every distinct query to
+    disk would grow the file shared with ingestion until ``max_rows`` and
+    then leave no room for statute chunks; only ingestion writes.
+    """
+
+    def __init__(
+        self, embeddings: Embeddings, cache: DiskEmbeddingCache, symmetric: bool = True
+    ):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.symmetric = symmetric
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fetched = self.embeddings.embed_documents([texts[i] for i in missing])
+            self._fill(vectors, missing, fetched)
+        return vectors
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        # A miss re-reads the index file, keep it off the event loop
+        vectors = await asyncio.to_thread(self.cache.get_many, texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fetched = await self.embeddings.aembed_documents(
+                [texts[i] for i in missing]
+            )
+            self._fill(vectors, missing, fetched)
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        if not self.symmetric:
+            return self.embeddings.embed_query(text)
+        return self.embed_documents([text])[0]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        if not self.symmetric:
+            return await self.embeddings.aembed_query(text)
+        return (await self.aembed_documents([text]))[0]
+
+    @staticmethod
+    def _fill(vectors, missing, fetched):
+        for i, vector in zip(missing, fetched):
+            vectors[i] = vector
@@ -0,0 +1,110 @@
+import asyncio
+import functools
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.services.llm_client import detached_context
+
+
+class EmbeddingBatcher:
+    """
+    Groups concurrent single-text embedding requests into batched API calls.
+
+    A request waits at most ``max_wait_ms`` for others to join it, and a batch
+    is sent as soon as it reaches ``max_batch_size`` texts. At most
+    ``max_concurrent`` batches are in flight; while all of them are busy new
+    texts keep queueing, so batches grow with load instead of piling up as
+    separate requests. Each caller gets back its own vector; if the batched
+    call fails or is cancelled, every caller in it sees the error. Batches
+    serve several requests, so they run without any one request's deadline.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[List[float]]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+        max_concurrent: int = 4,
+    ):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_concurrent = max_concurrent
+        self.batches = 0
+        self.texts = 0
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight = 0
+        self._tasks = set()
+
+    @classmethod
+    def from_env(cls, embed_batch) -> "EmbeddingBatcher":
+        return cls(
+            embed_batch,
+            max_batch_size=int(os.environ.get("EMBED_BATCH_SIZE", "32")),
+            max_wait_ms=float(os.environ.get("EMBED_BATCH_WAIT_MS", "5")),
+            max_concurrent=int(os.environ.get("EMBED_BATCH_CONCURRENCY", "4")),
+        )
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        # With every slot busy the text goes out when a batch completes
+        if self._in_flight < self.max_concurrent:
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending and self._in_flight < self.max_concurrent:
+            batch = self._pending[: self.max_batch_size]
+            del self._pending[: self.max_batch_size]
+            self._in_flight += 1
+            task = asyncio.get_running_loop().create_task(
+                self._run(batch), context=detached_context()
+            )
+            self._tasks.add(task)
+            task.add_done_callback(functools.partial(self._done, batch))
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]):
+        self.batches += 1
+        self.texts += len(batch)
+        try:
+            vectors = await self.embed_batch([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    def _done(self, batch: List[Tuple[str, asyncio.Future]], task: asyncio.Task):
+        # Runs however the batch ended, including cancelled (at shutdown, or
+        # before it started): callers must not wait for a result never coming
+        self._tasks.discard(task)
+        for _, future in batch:
+            if not future.done():
+                future.cancel()
+        self._in_flight -= 1
+        if self._pending:
+            self._flush()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "fill_ratio": (
+                self.texts / (self.batches * self.max_batch_size)
+                if self.batches
+                else 0.0
+            ),
+        }
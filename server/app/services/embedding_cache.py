@@ -0,0 +1,118 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: case, punctuation and whitespace are ignored."""
+    return " ".join(PUNCTUATION.sub(" ", query.lower()).split())
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU cache of query embeddings with a TTL.
+
+    Vectors are stored as float32 arrays. When a path is given the cache can be
+    saved to and loaded from a compressed .npz file so popular queries survive
+    restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "QueryEmbeddingCache":
+        cache = cls(
+            max_entries=int(os.environ.get("QUERY_EMBEDDING_CACHE_SIZE", "10000")),
+            ttl_seconds=float(
+                os.environ.get("QUERY_EMBEDDING_CACHE_TTL", str(7 * 24 * 3600))
+            ),
+            path=os.environ.get("QUERY_EMBEDDING_CACHE_PATH") or None,
+        )
+        cache.load()
+        return cache
+
+    def get(self, query: str) -> Optional[List[float]]:
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0].tolist()
+
+    def put(self, query: str, embedding: List[float]):
+        key = normalize_query(query)
+        vector = np.asarray(embedding, dtype=np.float32)
+        with self._lock:
+            self._entries[key] = (vector, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._entries:
+                return
+            keys = list(self._entries.keys())
+            vectors = np.stack([v for v, _ in self._entries.values()])
+            expires = np.array([e for _, e in self._entries.values()], dtype=np.float64)
+        tmp_path = self.path + ".tmp.npz"
+        np.savez_compressed(
+            tmp_path, keys=np.array(keys), vectors=vectors, expires=expires
+        )
+        os.replace(tmp_path, self.path)
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            data = np.load(self.path)
+            now = time.time()
+            with self._lock:
+                for key, vector, expires in zip(
+                    data["keys"], data["vectors"], data["expires"]
+                ):
+                    if expires > now:
+                        self._entries[str(key)] = (
+                            vector.astype(np.float32),
+                            float(expires),
+                        )
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        except Exception as e:
+            print(f"Query embedding cache not loaded from {self.path}: {e}")
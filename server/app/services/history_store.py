@@ -0,0 +1,172 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+
+from app.database import SessionLocal
+from app.models.conversation import Message
+
+CONVERSATION_SESSION = re.compile(r"^conv_(\d+)$")
+
+
+def format_ai_message(answer: dict) -> str:
+    """Compact form of a generated answer as it is kept in chat history."""
+    if "casual" in answer:
+        return answer["casual"]
+    return f"Law: {answer.get('law', '')[:200]}...\nExamples: {answer.get('examples', '')[:200]}..."
+
+
+def _to_chat_message(row: Message) -> BaseMessage:
+    if row.role == "user":
+        return HumanMessage(content=row.content)
+
+    # Assistant rows hold the JSON answer the chat endpoint returned
+    try:
+        answer = json.loads(row.content)
+    except (TypeError, ValueError):
+        answer = None
+    if isinstance(answer, dict):
+        return AIMessage(content=format_ai_message(answer))
+    return AIMessage(content=row.content[:400])
+
+
+class _Entry:
+    __slots__ = ("persisted", "pending", "last_id", "expires_at")
+
+    def __init__(self, persisted: List[BaseMessage], last_id: int, expires_at: float):
+        self.persisted = persisted
+        self.pending: List[BaseMessage] = []
+        self.last_id = last_id
+        self.expires_at = expires_at
+
+
+class ChatHistoryStore:
+    """
+    Bounded chat-history cache backed by the messages table.
+
+    Conversation sessions (``conv_<id>``) are rehydrated from the database on a
+    miss and topped up with rows written since the last access, so every worker
+    sees the same history. Messages added by the service itself are kept as
+    pending until the client has persisted them. Other sessions are memory-only.
+    The number of sessions, messages per session and entry age are all capped.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        max_messages: int = 14,
+        ttl_seconds: float = 1800,
+    ):
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ChatHistoryStore":
+        return cls(
+            max_sessions=int(os.environ.get("HISTORY_CACHE_SIZE", "1000")),
+            max_messages=int(os.environ.get("HISTORY_MAX_MESSAGES", "14")),
+            ttl_seconds=float(os.environ.get("HISTORY_CACHE_TTL", "1800")),
+        )
+
+    async def get_messages(self, session_id: str = "default") -> List[BaseMessage]:
+        conversation_id = self._conversation_id(session_id)
+        if conversation_id is not None:
+            await asyncio.to_thread(self._sync_from_db, session_id, conversation_id)
+
+        with self._lock:
+            entry = self._get_entry(session_id)
+            return list(entry.persisted + entry.pending)[-self.max_messages :]
+
+    def add_message(self, session_id: str, message: BaseMessage):
+        with self._lock:
+            entry = self._get_entry(session_id)
+            messages = entry.persisted + entry.pending
+            # The client saves the user turn before calling the API, so it may
+            # already be in the persisted history
+            if (
+                messages
+                and messages[-1].type == message.type
+                and messages[-1].content == message.content
+            ):
+                return
+            entry.pending.append(message)
+            overflow = len(entry.persisted) + len(entry.pending) - self.max_messages
+            if overflow > 0:
+                del entry.persisted[: min(overflow, len(entry.persisted))]
+                overflow = len(entry.persisted) + len(entry.pending) - self.max_messages
+                if overflow > 0:
+                    del entry.pending[:overflow]
+
+    def clear(self, session_id: str = "default"):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _conversation_id(self, session_id: str) -> Optional[int]:
+        match = CONVERSATION_SESSION.match(session_id)
+        return int(match.group(1)) if match else None
+
+    def _get_entry(self, session_id: str) -> _Entry:
+        # Caller must hold the lock
+        now = time.monotonic()
+        entry = self._entries.get(session_id)
+        if entry is None or entry.expires_at < now:
+            entry = _Entry([], 0, now + self.ttl_seconds)
+            self._entries[session_id] = entry
+        else:
+            entry.expires_at = now + self.ttl_seconds
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_sessions:
+            self._entries.popitem(last=False)
+        return entry
+
+    def _sync_from_db(self, session_id: str, conversation_id: int):
+        with self._lock:
+            last_id = self._get_entry(session_id).last_id
+
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Message)
+                .filter(
+                    Message.conversation_id == conversation_id, Message.id > last_id
+                )
+                .order_by(Message.id.desc())
+                .limit(self.max_messages)
+                .all()
+            )
+        except Exception as e:
+            print(f"Chat history rehydration failed for {session_id}: {e}")
+            return
+        finally:
+            db.close()
+
+        if not rows:
+            return
+
+        rows.reverse()
+        new_messages = [_to_chat_message(row) for row in rows]
+
+        with self._lock:
+            entry = self._get_entry(session_id)
+            if entry.last_id != last_id:
+                # Another request synced in the meantime
+                return
+            entry.persisted = (entry.persisted + new_messages)[-self.max_messages :]
+            # Newer rows mean the client has caught up with what we added locally
+            entry.pending = []
+            entry.last_id = rows[-1].id
+
+
+history_store = ChatHistoryStore.from_env()
@@ -0,0 +1,593 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from langchain_core.documents import Document
+
+from app.services.chunking import CHUNK_OVERLAP, CHUNK_SIZE
+from app.services.vector_store import upsert_vectors
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+INGEST_MANIFEST_PATH = os.environ.get(
+    "INGEST_MANIFEST_PATH",
+    os.path.join(BASE_DIR, "data", "index", "ingest_manifest.json"),
+)
+
+# Fixed namespace so the same chunk always gets the same ID across runs
+CHUNK_ID_NAMESPACE = uuid.UUID("6f1c2a8e-5b0d-4f4e-9a57-2d7c1e3b9f10")
+
+UPSERT_BATCH_SIZE = 100
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(act: str, section: str, text: str) -> str:
+    """Deterministic ID for a chunk from its act, section and content."""
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, f"{act}|{section}|{content_hash(text)}"))
+
+
+def document_id(doc: Document) -> str:
+    return chunk_id(
+        str(doc.metadata.get("act", "")),
+        str(doc.metadata.get("section", "")),
+        doc.page_content,
+    )
+
+
+class IngestManifest:
+    """
+    What is currently indexed: for each source file (path relative to the data
+    directory) its content hash and the IDs of the chunks it produced.
+
+    ``pipeline`` names the embedding model and chunker. A manifest written by a
+    different pipeline cannot be diffed against, so loading it marks every
+    recorded chunk as stale and starts empty. Stale IDs are saved with the
+    manifest until the new pipeline has indexed every file and they are
+    deleted, so an interrupted rebuild still removes them later.
+    """
+
+    def __init__(self, path: Optional[str] = None, pipeline: str = ""):
+        self.path = path
+        self.pipeline = pipeline
+        self.files: Dict[str, Dict] = {}
+        # Chunks from an incompatible earlier pipeline, still in the indexes
+        self.stale_ids: List[str] = []
+
+    @classmethod
+    def load(
+        cls, path: str = INGEST_MANIFEST_PATH, pipeline: str = ""
+    ) -> "IngestManifest":
+        manifest = cls(path=path, pipeline=pipeline)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            files = data.get("files", {})
+            manifest.stale_ids = data.get("stale", [])
+            if data.get("pipeline") == pipeline:
+                manifest.files = files
+            else:
+                manifest.stale_ids += [
+                    doc_id for entry in files.values() for doc_id in entry["chunks"]
+                ]
+        return manifest
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "pipeline": self.pipeline,
+                    "files": self.files,
+                    "stale": self.stale_ids,
+                },
+                f,
+                indent=1,
+            )
+        os.replace(self.path + ".tmp", self.path)
+
+    def chunk_ids(self, exclude: Optional[str] = None) -> Set[str]:
+        return {
+            doc_id
+            for name, entry in self.files.items()
+            if name != exclude
+            for doc_id in entry["chunks"]
+        }
+
+
+def reset_ingest_state():
+    """
+    Forgets what was ingested: the manifest and the BM25 and section indexes
+    that mirror the vector store. Call after the vector store is emptied so
+    the next ingestion run indexes everything again.
+    """
+    from app.services.bm25_index import BM25_INDEX_PATH
+    from app.services.section_index import SECTION_INDEX_PATH
+
+    for path in (INGEST_MANIFEST_PATH, BM25_INDEX_PATH, SECTION_INDEX_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+class StageStats:
+    """Items through one pipeline stage and the wall-clock span it was active."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts: Dict[str, int] = {}
+        self.busy = 0.0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, started: float, finished: float, **counts: int):
+        with self._lock:
+            for unit, n in counts.items():
+                self.counts[unit] = self.counts.get(unit, 0) + n
+            self.busy += finished - started
+            self.first = started if self.first is None else min(self.first, started)
+            self.last = finished if self.last is None else max(self.last, finished)
+
+    def report(self) -> Dict[str, float]:
+        span = (self.last - self.first) if self.first is not None else 0.0
+        report = {"active_s": round(span, 3), "busy_s": round(self.busy, 3)}
+        for unit, n in self.counts.items():
+            report[unit] = n
+            report[f"{unit}_per_s"] = round(n / span, 1) if span > 0 else 0.0
+        return report
+
+
+class RateLimiter:
+    """Spaces calls at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def read_pages(path: str) -> Iterator[str]:
+    if path.endswith(".pdf"):
+        from pypdf import PdfReader
+
+        for page in PdfReader(path).pages:
+            yield page.extract_text() or ""
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield f.read()
+
+
+def parse_source(
+    path: str, metadata: Dict, chunk_size: int, chunk_overlap: int
+) -> Tuple[int, List[Document], float]:
+    """
+    Parse worker, run in a separate process: page count, chunks and seconds
+    spent parsing a file (timed here so time queued in the pool isn't counted).
+    """
+    from app.services.chunking import chunk_statute
+
+    started = time.perf_counter()
+    pages = 0
+
+    def counted(path: str) -> Iterator[str]:
+        nonlocal pages
+        for page in read_pages(path):
+            pages += 1
+            yield page
+
+    chunks = list(chunk_statute(counted(path), metadata, chunk_size, chunk_overlap))
+    return pages, chunks, time.perf_counter() - started
+
+
+class _FileJob:
+    def __init__(self, name: str, sha: str, ids: List[str], removed: List[str]):
+        self.name = name
+        self.sha = sha
+        self.ids = ids
+        self.removed = removed
+        self.added = 0
+        self.pending = 0
+        self.error: Optional[Exception] = None
+
+
+class IngestionPipeline:
+    """
+    Brings the indexes in line with a set of source files (relative name ->
+    path) in three overlapping stages:
+
+    - parse: files are read page by page and chunked by section
+      (chunking.chunk_statute) in a process pool;
+    - embed: new chunks are embedded in batches by a thread pool, with the
+      request rate to the embedding API capped; with an ``embedding_cache``
+      only text never embedded before reaches the API;
+    - upsert: embedded batches are written to the vector store and the BM25
+      and section indexes by another thread pool.
+
+    Files whose hash matches the manifest are not even parsed, and only chunks
+    with IDs not already indexed are embedded. At most ``max_pending_batches``
+    batches are between parsing and upsert, so memory does not grow with the
+    corpus. A file is recorded in the manifest once all its batches are
+    upserted; a file with a failed batch is retried on the next run.
+
+    With VECTOR_STORE=local every upsert batch rewrites the store's files
+    under one lock, so upserts run one at a time whatever ``upsert_workers``
+    says and their cost grows with the corpus. That is fine at the size of
+    the bundled acts; a larger corpus belongs in Pinecone.
+    """
+
+    def __init__(
+        self,
+        manifest: IngestManifest,
+        embeddings,
+        vector_store,
+        bm25_index,
+        section_index,
+        metadata_for: Callable[[str], Dict],
+        chunk_size: int = CHUNK_SIZE,
+        chunk_overlap: int = CHUNK_OVERLAP,
+        parse_workers: int = 1,
+        embed_batch_size: int = UPSERT_BATCH_SIZE,
+        embed_concurrency: int = 4,
+        embed_rate_limit: float = 0.0,
+        upsert_workers: int = 4,
+        max_pending_batches: int = 16,
+        embedding_cache=None,
+    ):
+        self.manifest = manifest
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.bm25_index = bm25_index
+        self.section_index = section_index
+        self.metadata_for = metadata_for
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.parse_workers = max(1, parse_workers)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.embed_concurrency = max(1, embed_concurrency)
+        self.rate_limiter = RateLimiter(embed_rate_limit)
+        self.upsert_workers = max(1, upsert_workers)
+        self.max_pending_batches = max(1, max_pending_batches)
+        # DiskEmbeddingCache: chunks embedded before are not sent again
+        self.embedding_cache = embedding_cache
+        self.stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, *args, **kwargs) -> "IngestionPipeline":
+        settings = {
+            "parse_workers": int(
+                os.environ.get("INGEST_PARSE_WORKERS", os.cpu_count() or 1)
+            ),
+            "embed_batch_size": int(
+                os.environ.get("INGEST_EMBED_BATCH_SIZE", UPSERT_BATCH_SIZE)
+            ),
+            "embed_concurrency": int(os.environ.get("INGEST_EMBED_CONCURRENCY", "4")),
+            # Embedding requests per second across all workers, 0 for no limit
+            "embed_rate_limit": float(os.environ.get("INGEST_EMBED_RATE_LIMIT", "5")),
+            "upsert_workers": int(os.environ.get("INGEST_UPSERT_WORKERS", "4")),
+            "max_pending_batches": int(
+                os.environ.get("INGEST_MAX_PENDING_BATCHES", "16")
+            ),
+        }
+        settings.update(kwargs)
+        return cls(*args, **settings)
+
+    def run(self, sources: Dict[str, str]) -> Dict[str, int]:
+        self.stages = {name: StageStats(name) for name in ("parse", "embed", "upsert")}
+        self.stats = dict.fromkeys(
+            (
+                "files_unchanged",
+                "files_changed",
+                "files_removed",
+                "files_failed",
+                "chunks_added",
+                "chunks_kept",
+                "chunks_deleted",
+            ),
+            0,
+        )
+        manifest = self.manifest
+
+        for name in sorted(set(manifest.files) - set(sources)):
+            removed = set(manifest.files.pop(name)["chunks"]) - manifest.chunk_ids()
+            print(f"Removed {name}: deleting {len(removed)} chunks")
+            self._delete(list(removed))
+            self.stats["files_removed"] += 1
+            self.stats["chunks_deleted"] += len(removed)
+            manifest.save()
+
+        changed = []
+        for name, path in sorted(sources.items()):
+            sha = file_hash(path)
+            previous = manifest.files.get(name)
+            if previous and previous["sha256"] == sha:
+                self.stats["files_unchanged"] += 1
+            else:
+                changed.append((name, path, sha))
+
+        if changed:
+            self._process(changed)
+
+        if manifest.stale_ids:
+            # Only now: deleting first would leave the live index empty for
+            # the whole rebuild. Unchanged chunks keep their IDs, so a stale ID
+            # may already hold the new pipeline's vector.
+            if self.stats["files_failed"]:
+                print(
+                    f"Keeping {len(manifest.stale_ids)} chunks of the previous "
+                    "pipeline until every file is re-indexed"
+                )
+            else:
+                stale = list(set(manifest.stale_ids) - manifest.chunk_ids())
+                print(f"Removing {len(stale)} chunks of the previous pipeline")
+                self._delete(stale)
+                self.stats["chunks_deleted"] += len(stale)
+                manifest.stale_ids = []
+                manifest.save()
+
+        self.bm25_index.save()
+        self.section_index.save()
+        return self.stats
+
+    def throughput(self) -> Dict[str, Dict[str, float]]:
+        return {name: stage.report() for name, stage in self.stages.items()}
+
+    def _process(self, changed: List[Tuple[str, str, str]]):
+        slots = threading.BoundedSemaphore(self.max_pending_batches)
+        embed_pool = ThreadPoolExecutor(
+            self.embed_concurrency, thread_name_prefix="ingest-embed"
+        )
+        upsert_pool = ThreadPoolExecutor(
+            self.upsert_workers, thread_name_prefix="ingest-upsert"
+        )
+        # spawn rather than fork: the parent already runs embedding threads
+        parse_pool = ProcessPoolExecutor(
+            self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        try:
+            for name, sha, parsed in self._parsed(parse_pool, changed):
+                if isinstance(parsed, Exception):
+                    print(f"{name}: parsing failed: {parsed}")
+                    with self._lock:
+                        self.stats["files_failed"] += 1
+                    continue
+
+                documents: Dict[str, Document] = {}
+                for doc in parsed:
+                    documents.setdefault(document_id(doc), doc)
+
+                with self._lock:
+                    previous = set(self.manifest.files.get(name, {}).get("chunks", []))
+                    others = self.manifest.chunk_ids(exclude=name)
+                added = [
+                    doc_id
+                    for doc_id in documents
+                    if doc_id not in others and doc_id not in previous
+                ]
+                removed = list(previous - set(documents) - others)
+                job = _FileJob(name, sha, list(documents), removed)
+                job.added = len(added)
+
+                batches = [
+                    added[start : start + self.embed_batch_size]
+                    for start in range(0, len(added), self.embed_batch_size)
+                ]
+                if not batches:
+                    self._finish(job)
+                    continue
+                job.pending = len(batches)
+                for batch_ids in batches:
+                    slots.acquire()
+                    embed_pool.submit(
+                        self._embed,
+                        job,
+                        batch_ids,
+                        [documents[doc_id] for doc_id in batch_ids],
+                        slots,
+                        upsert_pool,
+                    )
+        finally:
+            parse_pool.shutdown(wait=True, cancel_futures=True)
+            # Embed workers hand batches to the upsert pool, so drain them first
+            embed_pool.shutdown(wait=True)
+            upsert_pool.shutdown(wait=True)
+
+    def _parsed(
+        self, pool: ProcessPoolExecutor, changed: List[Tuple[str, str, str]]
+    ) -> Iterator[Tuple[str, str, object]]:
+        """Parsed files in completion order, with a bounded number in flight."""
+        queue = iter(changed)
+        in_flight = {}
+
+        def submit(limit: int):
+            for name, path, sha in itertools.islice(queue, limit):
+                future = pool.submit(
+                    parse_source,
+                    path,
+                    self.metadata_for(name),
+                    self.chunk_size,
+                    self.chunk_overlap,
+                )
+                in_flight[future] = (name, sha)
+
+        submit(self.parse_workers * 2)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, sha = in_flight.pop(future)
+                submit(1)
+                try:
+                    pages, chunks, elapsed = future.result()
+                except Exception as e:
+                    yield name, sha, e
+                    continue
+                finished = time.perf_counter()
+                self.stages["parse"].record(
+                    finished - elapsed, finished, pages=pages, chunks=len(chunks)
+                )
+                yield name, sha, chunks
+
+    def _embed(self, job, ids, documents, slots, upsert_pool):
+        try:
+            texts = [doc.page_content for doc in documents]
+            if self.embedding_cache is not None:
+                vectors = self.embedding_cache.get_many(texts)
+            else:
+                vectors = [None] * len(texts)
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            if missing:
+                # Only requests that reach the embedding API count against the limit
+                self.rate_limiter.wait()
+            started = time.perf_counter()
+            if missing:
+                fetched = self.embeddings.embed_documents([texts[i] for i in missing])
+                for i, vector in zip(missing, fetched):
+                    vectors[i] = vector
+                if self.embedding_cache is not None:
+                    self.embedding_cache.put_many([texts[i] for i in missing], fetched)
+            self.stages["embed"].record(
+                started,
+                time.perf_counter(),
+                chunks=len(documents),
+                cached=len(documents) - len(missing),
+            )
+            upsert_pool.submit(self._upsert, job, ids, documents, vectors, slots)
+        except Exception as e:
+            slots.release()
+            self._batch_done(job, e)
+
+    def _upsert(self, job, ids, documents, vectors, slots):
+        try:
+            started = time.perf_counter()
+            upsert_vectors(self.vector_store, documents, vectors, ids)
+            self.bm25_index.add_documents(documents, ids)
+            self.section_index.add_documents(documents, ids)
+            self.stages["upsert"].record(started, time.perf_counter(), vectors=len(ids))
+            self._batch_done(job)
+        except Exception as e:
+            self._batch_done(job, e)
+        finally:
+            slots.release()
+
+    def _batch_done(self, job: _FileJob, error: Optional[Exception] = None):
+        with self._lock:
+            job.pending -= 1
+            if error is not None and job.error is None:
+                job.error = error
+            last = job.pending == 0
+        if last:
+            self._finish(job)
+
+    def _finish(self, job: _FileJob):
+        if job.error is not None:
+            print(f"{job.name}: ingestion failed, will retry next run: {job.error}")
+            with self._lock:
+                self.stats["files_failed"] += 1
+            return
+
+        self._delete(job.removed)
+        with self._lock:
+            self.manifest.files[job.name] = {"sha256": job.sha, "chunks": job.ids}
+            self.manifest.save()
+            kept = len(job.ids) - job.added
+            self.stats["files_changed"] += 1
+            self.stats["chunks_added"] += job.added
+            self.stats["chunks_kept"] += kept
+            self.stats["chunks_deleted"] += len(job.removed)
+            # Under the lock: concurrent saves would share a temporary file
+            self.bm25_index.save()
+            self.section_index.save()
+        print(
+            f"{job.name}: {job.added} new, {kept} unchanged, "
+            f"{len(job.removed)} deleted chunks"
+        )
+
+    def _delete(self, ids: List[str]):
+        _delete(ids, self.vector_store, self.bm25_index, self.section_index)
+
+
+def _delete(ids: List[str], vector_store, bm25_index, section_index):
+    if not ids:
+        return
+    for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+        vector_store.delete(ids=ids[start : start + UPSERT_BATCH_SIZE])
+    bm25_index.delete(ids)
+    section_index.delete(ids)
+
+
+def _snapshot(sources: Dict[str, str]) -> Dict[str, Tuple[float, int]]:
+    snapshot = {}
+    for name, path in sources.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        snapshot[name] = (stat.st_mtime, stat.st_size)
+    return snapshot
+
+
+def watch(
+    list_sources: Callable[[], Dict[str, str]],
+    run: Callable[[Dict[str, str]], Dict[str, int]],
+    interval: float = 5.0,
+):
+    """
+    Runs a sync, then polls the source files every ``interval`` seconds and
+    runs an incremental sync whenever a file is added, removed or modified.
+    A failed sync, the first one included, and a sync that left any file
+    failed are retried on the next poll. Runs until interrupted.
+    """
+    snapshot = None
+    print(f"Watching {DATA_DIR} for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            sources = list_sources()
+            current = _snapshot(sources)
+            if current != snapshot:
+                try:
+                    stats = run(sources)
+                    print(stats)
+                    # Files that already synced are skipped by the manifest
+                    if not stats.get("files_failed"):
+                        snapshot = current
+                except Exception as e:
+                    # Retried on the next poll
+                    print(f"Incremental ingestion failed: {e}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,103 @@
+import json
+from typing import Any, Dict, List, Tuple
+
+
+class JSONFieldStreamer:
+    """
+    Incremental parser for a JSON object arriving in chunks.
+
+    ``feed`` returns the top-level ``(key, value)`` pairs whose values became
+    complete in that chunk, so callers can forward each field as soon as the
+    model has finished writing it. Text before the opening brace (for example a
+    markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.complete = False
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._text += chunk
+        completed = []
+
+        while self._pos < len(self._text) and not self.complete:
+            i = self._pos
+            c = self._text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_string":
+                        self._key = json.loads(self._text[self._key_start : i + 1])
+                        self._expect = "colon"
+                    elif self._depth == 1 and self._expect == "value":
+                        completed.extend(self._emit(self._value_start, i + 1))
+                continue
+
+            if self._depth == 0:
+                if c == "{":
+                    self._depth = 1
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = i
+                    self._expect = "key_string"
+                elif self._depth == 1 and self._expect == "value":
+                    if self._value_start is None:
+                        self._value_start = i
+            elif c == ":" and self._depth == 1 and self._expect == "colon":
+                self._expect = "value"
+            elif c in "{[":
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._expect == "value":
+                    completed.extend(self._emit(self._value_start, i + 1))
+                elif self._depth == 0:
+                    if self._expect == "value" and self._value_start is not None:
+                        completed.extend(self._emit(self._value_start, i))
+                    self.complete = True
+            elif c == "," and self._depth == 1:
+                if self._expect == "value" and self._value_start is not None:
+                    completed.extend(self._emit(self._value_start, i))
+                self._expect = "key"
+            elif (
+                self._depth == 1
+                and self._expect == "value"
+                and self._value_start is None
+                and not c.isspace()
+            ):
+                # Start of a number, true, false or null
+                self._value_start = i
+
+        return completed
+
+    def _emit(self, start: int, end: int) -> List[Tuple[str, Any]]:
+        key = self._key
+        self._key = None
+        self._value_start = None
+        self._expect = "after_value"
+        try:
+            value = json.loads(self._text[start:end])
+        except ValueError:
+            return []
+        self.fields[key] = value
+        return [(key, value)]
@@ -0,0 +1,501 @@
+import asyncio
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import cached_property
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+from app.services.model_routes import ModelRoute, model_route
+
+load_dotenv()
+
+# Absolute monotonic time by which the current request must be answered.
+# Set once at the HTTP boundary; tasks spawned for the request inherit it.
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "llm_deadline", default=None
+)
+
+# Upper bound on the LLM time a single API request may consume, retries included
+LLM_REQUEST_DEADLINE = float(os.environ.get("LLM_REQUEST_DEADLINE", "60"))
+
+# Below this much remaining budget a call is not worth starting
+MIN_ATTEMPT_SECONDS = 0.5
+
+# Hedge delay for a task until enough latency samples exist, as a fraction of
+# the route timeout
+MIN_LATENCY_SAMPLES = 20
+DEFAULT_HEDGE_FRACTION = 0.25
+
+
+class LLMUnavailableError(Exception):
+    """The call was not attempted: circuit open or request deadline spent."""
+
+
+@contextmanager
+def request_deadline(seconds: float):
+    """Bounds every LLM call made inside the block to ``seconds`` in total."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def detached_context() -> contextvars.Context:
+    """The current context without a request deadline, for work shared by requests."""
+    context = contextvars.copy_context()
+    context.run(_deadline.set, None)
+    return context
+
+
+def remaining_time() -> Optional[float]:
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive upstream failures and rejects
+    calls for ``reset_timeout`` seconds, then lets a single probe through;
+    the probe's outcome closes or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def release_probe(self):
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+def _is_retryable(error: Exception) -> bool:
+    # Imported here so the SDK loads with the first client, not the app
+    from groq import (
+        APIConnectionError,
+        APIStatusError,
+        APITimeoutError,
+        RateLimitError,
+    )
+
+    if isinstance(error, (APIConnectionError, APITimeoutError, RateLimitError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _pooled_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.environ.get("LLM_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.environ.get("LLM_MAX_KEEPALIVE", "20")),
+        ),
+    )
+
+
+class MistralChatClient:
+    """
+    Minimal ``chat.completions.create`` for Mistral's OpenAI-style API,
+    returning objects shaped like the Groq SDK's so callers need not care
+    which provider answered. HTTP errors surface as httpx exceptions.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        http_client: httpx.AsyncClient,
+        base_url: str = "https://api.mistral.ai/v1",
+    ):
+        self.api_key = api_key
+        self.http_client = http_client
+        self.base_url = base_url
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(
+        self,
+        model: str,
+        messages: List[Dict],
+        max_tokens: int,
+        timeout: float,
+        stream: bool = False,
+        **kwargs,
+    ):
+        request = self.http_client.build_request(
+            "POST",
+            f"{self.base_url}/chat/completions",
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={
+                "model": model,
+                "messages": messages,
+                "max_tokens": max_tokens,
+                "stream": stream,
+                **kwargs,
+            },
+            timeout=timeout,
+        )
+        response = await self.http_client.send(request, stream=stream)
+        if response.status_code >= 400:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+
+        if stream:
+            return self._events(response)
+
+        data = response.json()
+        return SimpleNamespace(
+            choices=[
+                SimpleNamespace(message=SimpleNamespace(**choice["message"]))
+                for choice in data["choices"]
+            ]
+        )
+
+    @staticmethod
+    async def _events(response: httpx.Response):
+        try:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:") :].strip()
+                if payload == "[DONE]":
+                    break
+                data = json.loads(payload)
+                yield SimpleNamespace(
+                    choices=[
+                        SimpleNamespace(
+                            delta=SimpleNamespace(
+                                content=choice.get("delta", {}).get("content")
+                            )
+                        )
+                        for choice in data.get("choices", [])
+                    ]
+                )
+        finally:
+            await response.aclose()
+
+
+def _latency_key(task: str, stream: bool) -> str:
+    # A streamed call returns at the response headers, a plain one after the
+    # whole generation, so their latencies are tracked apart
+    return f"{task} (stream)" if stream else task
+
+
+class ChatBackend:
+    """
+    One chat provider: its client, circuit breaker and recent latencies per
+    task and streaming mode. The client is built by ``client_factory`` on
+    first use.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client_factory: Callable,
+        model_field: str = "model",
+        breaker: CircuitBreaker = None,
+    ):
+        self.name = name
+        self.client_factory = client_factory
+        self.model_field = model_field
+        self.breaker = breaker or CircuitBreaker()
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    @cached_property
+    def client(self):
+        return self.client_factory()
+
+    def model(self, route: ModelRoute) -> str:
+        return getattr(route, self.model_field)
+
+    def record_latency(self, task: str, seconds: float, stream: bool = False):
+        key = _latency_key(task, stream)
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=200)).append(seconds)
+
+    def p95(self, task: str, stream: bool = False) -> Optional[float]:
+        return self._p95(_latency_key(task, stream))
+
+    def _p95(self, key: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies.get(key, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[int(len(samples) * 0.95) - 1]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            keys = list(self._latencies)
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "p95_seconds": {key: self._p95(key) for key in keys},
+        }
+
+
+class LLMClient:
+    """
+    Process-wide chat completion client shared by every service and router.
+
+    Each backend reuses one pooled HTTP connection set. Each call takes its
+    model, token limit and timeout from the task's route, never outlives the
+    request deadline, and retries 429/5xx/connection failures with jittered
+    exponential backoff. A backend whose circuit breaker is open is skipped.
+
+    With a secondary provider configured, a call that has not answered within
+    the primary's p95 latency for that task, streamed or not, is hedged: the
+    same request goes to the secondary and whichever succeeds first wins. If
+    the primary fails or its circuit is open, the secondary takes over
+    outright.
+    """
+
+    def __init__(
+        self,
+        primary: ChatBackend,
+        secondary: Optional[ChatBackend] = None,
+        hedging: bool = True,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.hedging = hedging
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        def breaker():
+            return CircuitBreaker(
+                failure_threshold=int(os.environ.get("LLM_BREAKER_FAILURES", "5")),
+                reset_timeout=float(os.environ.get("LLM_BREAKER_RESET", "30")),
+            )
+
+        def groq_client():
+            from groq import AsyncGroq
+
+            return AsyncGroq(
+                api_key=os.environ.get("GROQ_API_KEY"),
+                # Retries are handled here so they respect the request deadline
+                max_retries=0,
+                http_client=_pooled_http_client(),
+            )
+
+        primary = ChatBackend("groq", groq_client, breaker=breaker())
+
+        secondary = None
+        provider = os.environ.get("LLM_SECONDARY_PROVIDER", "mistral").lower()
+        if provider == "mistral" and os.environ.get("MISTRAL_API_KEY"):
+            secondary = ChatBackend(
+                "mistral",
+                lambda: MistralChatClient(
+                    os.environ.get("MISTRAL_API_KEY"), _pooled_http_client()
+                ),
+                model_field="secondary_model",
+                breaker=breaker(),
+            )
+
+        return cls(
+            primary,
+            secondary,
+            hedging=os.environ.get("LLM_HEDGING", "true").lower() == "true",
+            max_retries=int(os.environ.get("LLM_MAX_RETRIES", "2")),
+            backoff_base=float(os.environ.get("LLM_BACKOFF_BASE", "0.25")),
+            backoff_max=float(os.environ.get("LLM_BACKOFF_MAX", "4")),
+        )
+
+    async def complete(self, task: str, messages: List[Dict], **kwargs):
+        """
+        chat.completions.create for ``task``. Extra keyword arguments
+        (temperature, response_format, stream, ...) are passed through.
+        """
+        route = model_route(task)
+        call = (task, route, messages, kwargs)
+        secondary = self.secondary
+
+        if secondary is None:
+            return await self._call(self.primary, *call)
+        if self.primary.breaker.state == "open":
+            return await self._call(secondary, *call)
+        if not self.hedging:
+            try:
+                return await self._call(self.primary, *call)
+            except Exception as e:
+                print(f"LLM failover to {secondary.name} ({task}): {e}")
+                return await self._call(secondary, *call)
+
+        delay = (
+            self.primary.p95(task, stream=bool(kwargs.get("stream")))
+            or route.timeout * DEFAULT_HEDGE_FRACTION
+        )
+        pending = {asyncio.create_task(self._call(self.primary, *call))}
+        errors = []
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            for finished in done:
+                if finished.exception() is None:
+                    return finished.result()
+                errors.append(finished.exception())
+
+            pending.add(asyncio.create_task(self._call(secondary, *call)))
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for finished in done:
+                    if finished.exception() is None:
+                        return finished.result()
+                    errors.append(finished.exception())
+            raise errors[0]
+        finally:
+            for task_ in pending:
+                task_.cancel()
+
+    async def _call(
+        self,
+        backend: ChatBackend,
+        task: str,
+        route: ModelRoute,
+        messages: List[Dict],
+        kwargs: Dict,
+    ):
+        attempt = 0
+        while True:
+            timeout = route.timeout
+            remaining = remaining_time()
+            if remaining is not None:
+                if remaining < MIN_ATTEMPT_SECONDS:
+                    raise LLMUnavailableError(f"Request deadline exceeded ({task})")
+                timeout = min(timeout, remaining)
+            if not backend.breaker.allow():
+                raise LLMUnavailableError(f"{backend.name} circuit open ({task})")
+
+            start = time.monotonic()
+            try:
+                response = await backend.client.chat.completions.create(
+                    model=backend.model(route),
+                    max_tokens=route.max_tokens,
+                    timeout=timeout,
+                    messages=messages,
+                    **kwargs,
+                )
+            except asyncio.CancelledError:
+                # Lost a hedge race; the outcome says nothing about the backend
+                backend.breaker.release_probe()
+                raise
+            except Exception as e:
+                if not _is_retryable(e):
+                    # The upstream answered; a bad request is not an outage
+                    backend.breaker.record_success()
+                    raise
+                backend.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                delay = _retry_after(e) or min(
+                    self.backoff_max, self.backoff_base * 2**attempt
+                )
+                delay = random.uniform(delay / 2, delay)
+                remaining = remaining_time()
+                if remaining is not None and delay + MIN_ATTEMPT_SECONDS > remaining:
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+
+            backend.breaker.record_success()
+            backend.record_latency(
+                task, time.monotonic() - start, stream=bool(kwargs.get("stream"))
+            )
+            return response
+
+    def _backends(self) -> List[ChatBackend]:
+        return [self.primary] + ([self.secondary] if self.secondary else [])
+
+    def warm_up(self):
+        """Builds the provider clients ahead of the first call."""
+        for backend in self._backends():
+            try:
+                backend.client
+            except Exception as e:
+                print(f"Warm-up of {backend.name} client failed: {e}")
+
+    def stats(self) -> Dict:
+        return {backend.name: backend.stats() for backend in self._backends()}
+
+    async def aclose(self):
+        for backend in self._backends():
+            if "client" not in backend.__dict__:
+                # Never used, nothing to close
+                continue
+            close = getattr(backend.client, "close", None)
+            if close:
+                await close()
+            elif hasattr(backend.client, "http_client"):
+                await backend.client.http_client.aclose()
+
+
+llm_client = LLMClient.from_env()
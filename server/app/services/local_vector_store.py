@@ -0,0 +1,335 @@
+import json
+import os
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+VECTORS_FILE = "vectors.npy"
+DOCS_FILE = "docs.jsonl"
+
+
+class _Snapshot:
+    """Immutable view of the index so searches never see a half-applied write."""
+
+    __slots__ = ("vectors", "ids", "texts", "metadatas", "by_field")
+
+    def __init__(self, vectors, ids, texts, metadatas):
+        self.vectors = vectors
+        self.ids = ids
+        self.texts = texts
+        self.metadatas = metadatas
+        # field -> value -> row indices, built lazily for metadata filters
+        self.by_field: Dict[str, Dict[Any, np.ndarray]] = {}
+
+    def rows_matching(self, filter: Optional[dict]) -> Optional[np.ndarray]:
+        if not filter:
+            return None
+        rows = None
+        for field, condition in filter.items():
+            if isinstance(condition, dict):
+                if "$eq" in condition:
+                    values = [condition["$eq"]]
+                elif "$in" in condition:
+                    values = list(condition["$in"])
+                else:
+                    raise ValueError(f"Unsupported filter operator: {condition}")
+            else:
+                values = [condition]
+
+            index = self._field_index(field)
+            matched = np.concatenate(
+                [index.get(v, np.empty(0, dtype=np.int64)) for v in values]
+            )
+            rows = matched if rows is None else np.intersect1d(rows, matched)
+        return np.sort(rows)
+
+    def _field_index(self, field: str) -> Dict[Any, np.ndarray]:
+        index = self.by_field.get(field)
+        if index is None:
+            groups: Dict[Any, List[int]] = {}
+            for row, metadata in enumerate(self.metadatas):
+                value = metadata.get(field)
+                if value is not None:
+                    groups.setdefault(value, []).append(row)
+            index = {v: np.array(r, dtype=np.int64) for v, r in groups.items()}
+            self.by_field[field] = index
+        return index
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process vector index for the small statute corpus.
+
+    Unit-normalised float32 vectors live in ``vectors.npy`` and are
+    memory-mapped on load; chunk text and metadata live in ``docs.jsonl``.
+    Search is an exact cosine top-k over the matrix (optionally restricted by a
+    Pinecone-style metadata filter such as ``{"domain": "Criminal Law"}``), so
+    it needs no network and returns the same Documents as PineconeVectorStore.
+    """
+
+    def __init__(self, embedding: Embeddings, path: str):
+        self._embedding = embedding
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = self._load()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        vectors = self._normalize(
+            np.asarray(self._embedding.embed_documents(texts), dtype=np.float32)
+        )
+        return self.add_vectors(vectors, texts, metadatas, ids)
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        metadatas: List[dict],
+        ids: List[str],
+    ) -> List[str]:
+        """Upserts precomputed embeddings; rows with an existing id are replaced."""
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            current = self._snapshot
+            replaced = set(ids)
+            keep = [i for i, doc_id in enumerate(current.ids) if doc_id not in replaced]
+            if current.vectors.size:
+                kept_vectors = np.asarray(current.vectors[keep])
+                all_vectors = np.concatenate([kept_vectors, vectors])
+            else:
+                all_vectors = vectors
+            self._snapshot = self._write(
+                all_vectors,
+                [current.ids[i] for i in keep] + list(ids),
+                [current.texts[i] for i in keep] + list(texts),
+                [current.metadatas[i] for i in keep] + list(metadatas),
+            )
+        return list(ids)
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        with self._lock:
+            current = self._snapshot
+            if ids is None:
+                removed = set(current.ids)
+            else:
+                removed = set(ids)
+            keep = [i for i, doc_id in enumerate(current.ids) if doc_id not in removed]
+            if len(keep) == len(current.ids):
+                return True
+            vectors = (
+                np.asarray(current.vectors[keep])
+                if keep
+                else np.empty((0, current.vectors.shape[1]), dtype=np.float32)
+            )
+            self._snapshot = self._write(
+                vectors,
+                [current.ids[i] for i in keep],
+                [current.texts[i] for i in keep],
+                [current.metadatas[i] for i in keep],
+            )
+        return True
+
+    def get_by_ids(self, ids: List[str]) -> List[Document]:
+        snapshot = self._snapshot
+        wanted = set(ids)
+        return [
+            self._document(snapshot, row)
+            for row, doc_id in enumerate(snapshot.ids)
+            if doc_id in wanted
+        ]
+
+    def similarity_search(
+        self, query: str, k: int = 4, filter: Optional[dict] = None, **kwargs: Any
+    ) -> List[Document]:
+        embedding = self._embedding.embed_query(query)
+        return self.similarity_search_by_vector(embedding, k=k, filter=filter)
+
+    def similarity_search_by_vector(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+        **kwargs: Any,
+    ) -> List[Document]:
+        return [
+            doc
+            for doc, _ in self.similarity_search_by_vector_with_score(
+                embedding, k=k, filter=filter
+            )
+        ]
+
+    def similarity_search_by_vector_with_score(
+        self,
+        embedding: List[float],
+        *,
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[Tuple[Document, float]]:
+        [results] = self.batch_similarity_search_by_vector(
+            [embedding], k=k, filter=filter
+        )
+        return results
+
+    def batch_similarity_search_by_vector(
+        self,
+        embeddings: List[List[float]],
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[List[Tuple[Document, float]]]:
+        """Cosine top-k for several query vectors with one matrix product."""
+        snapshot = self._snapshot
+        return [
+            [(self._document(snapshot, row), score) for row, score in hits]
+            for hits in self._top_rows(snapshot, embeddings, k, filter)
+        ]
+
+    def similarity_search_with_vectors(
+        self,
+        embedding: List[float],
+        k: int = 4,
+        filter: Optional[dict] = None,
+    ) -> List[Tuple[Document, np.ndarray]]:
+        """Top-k Documents together with their stored unit vectors, for reranking."""
+        snapshot = self._snapshot
+        [hits] = self._top_rows(snapshot, [embedding], k, filter)
+        return [
+            (self._document(snapshot, row), np.asarray(snapshot.vectors[row]))
+            for row, _ in hits
+        ]
+
+    def get_vectors(self, ids: List[str]) -> Dict[str, np.ndarray]:
+        snapshot = self._snapshot
+        wanted = set(ids)
+        return {
+            doc_id: np.asarray(snapshot.vectors[row])
+            for row, doc_id in enumerate(snapshot.ids)
+            if doc_id in wanted
+        }
+
+    def _top_rows(
+        self,
+        snapshot: _Snapshot,
+        embeddings: List[List[float]],
+        k: int,
+        filter: Optional[dict],
+    ) -> List[List[Tuple[int, float]]]:
+        if not snapshot.ids or not embeddings:
+            return [[] for _ in embeddings]
+
+        queries = self._normalize(np.asarray(embeddings, dtype=np.float32))
+        rows = snapshot.rows_matching(filter)
+        if rows is None:
+            scores = queries @ snapshot.vectors.T
+        elif rows.size == 0:
+            return [[] for _ in embeddings]
+        else:
+            scores = queries @ snapshot.vectors[rows].T
+
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for q, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[q, candidates])]
+            hits = []
+            for column in ordered:
+                row = int(rows[column]) if rows is not None else int(column)
+                hits.append((row, float(scores[q, column])))
+            results.append(hits)
+        return results
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        path: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        if path is None:
+            raise ValueError("LocalVectorStore.from_texts requires a path")
+        store = cls(embedding=embedding, path=path)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+    def _document(self, snapshot: _Snapshot, row: int) -> Document:
+        return Document(
+            id=snapshot.ids[row],
+            page_content=snapshot.texts[row],
+            metadata=dict(snapshot.metadatas[row]),
+        )
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _load(self) -> _Snapshot:
+        vectors_path = os.path.join(self.path, VECTORS_FILE)
+        docs_path = os.path.join(self.path, DOCS_FILE)
+        if not os.path.exists(vectors_path) or not os.path.exists(docs_path):
+            return _Snapshot(np.empty((0, 0), dtype=np.float32), [], [], [])
+
+        vectors = np.load(vectors_path, mmap_mode="r")
+        ids, texts, metadatas = [], [], []
+        with open(docs_path, "r", encoding="utf-8") as f:
+            for line in f:
+                doc = json.loads(line)
+                ids.append(doc["id"])
+                texts.append(doc["text"])
+                metadatas.append(doc["metadata"])
+        if len(ids) != vectors.shape[0]:
+            raise ValueError(
+                f"Local vector index at {self.path} is inconsistent: "
+                f"{vectors.shape[0]} vectors for {len(ids)} documents"
+            )
+        return _Snapshot(vectors, ids, texts, metadatas)
+
+    def _write(self, vectors, ids, texts, metadatas) -> _Snapshot:
+        # Caller must hold the lock. Files are replaced atomically so a
+        # concurrent reader of the old memory map is unaffected.
+        os.makedirs(self.path, exist_ok=True)
+        vectors_path = os.path.join(self.path, VECTORS_FILE)
+        docs_path = os.path.join(self.path, DOCS_FILE)
+
+        with open(vectors_path + ".tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(vectors, dtype=np.float32))
+        with open(docs_path + ".tmp", "w", encoding="utf-8") as f:
+            for doc_id, text, metadata in zip(ids, texts, metadatas):
+                f.write(
+                    json.dumps(
+                        {"id": doc_id, "text": text, "metadata": metadata},
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+        os.replace(vectors_path + ".tmp", vectors_path)
+        os.replace(docs_path + ".tmp", docs_path)
+
+        return _Snapshot(np.load(vectors_path, mmap_mode="r"), ids, texts, metadatas)
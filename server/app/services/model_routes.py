@@ -0,0 +1,71 @@
+import json
+import os
+from typing import Dict
+
+LARGE_MODEL = os.environ.get("LLM_LARGE_MODEL", "llama-3.3-70b-versatile")
+SMALL_MODEL = os.environ.get("LLM_SMALL_MODEL", "llama-3.1-8b-instant")
+# Equivalent tiers on the secondary (failover/hedge) provider
+SECONDARY_LARGE_MODEL = os.environ.get(
+    "LLM_SECONDARY_LARGE_MODEL", "mistral-large-latest"
+)
+SECONDARY_SMALL_MODEL = os.environ.get(
+    "LLM_SECONDARY_SMALL_MODEL", "mistral-small-latest"
+)
+
+
+class ModelRoute:
+    __slots__ = ("model", "max_tokens", "timeout", "secondary_model")
+
+    def __init__(
+        self, model: str, max_tokens: int, timeout: float, secondary_model: str
+    ):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.secondary_model = secondary_model
+
+
+# Small, fast models for short routing/chit-chat/list outputs; the large model
+# only where the answer is long-form legal content
+MODEL_ROUTES: Dict[str, ModelRoute] = {
+    "classify": ModelRoute(SMALL_MODEL, 10, 5, SECONDARY_SMALL_MODEL),
+    "casual": ModelRoute(SMALL_MODEL, 100, 10, SECONDARY_SMALL_MODEL),
+    "related_cases": ModelRoute(SMALL_MODEL, 400, 15, SECONDARY_SMALL_MODEL),
+    "conversation_summary": ModelRoute(SMALL_MODEL, 300, 20, SECONDARY_SMALL_MODEL),
+    "compare": ModelRoute(LARGE_MODEL, 800, 30, SECONDARY_LARGE_MODEL),
+    "legal_answer": ModelRoute(LARGE_MODEL, 2000, 60, SECONDARY_LARGE_MODEL),
+    "search_answer": ModelRoute(LARGE_MODEL, 600, 30, SECONDARY_LARGE_MODEL),
+    "pdf_summary": ModelRoute(LARGE_MODEL, 4000, 90, SECONDARY_LARGE_MODEL),
+}
+
+
+def _apply_overrides(raw: str):
+    """
+    LLM_MODEL_ROUTES holds JSON overrides per task, e.g.
+    {"casual": {"model": "llama-3.3-70b-versatile"}, "classify": {"timeout": 3}}
+    ("secondary_model" sets the failover provider's model)
+    """
+    try:
+        overrides = json.loads(raw)
+    except ValueError as e:
+        print(f"Ignoring invalid LLM_MODEL_ROUTES: {e}")
+        return
+    for task, values in overrides.items():
+        route = MODEL_ROUTES.get(task)
+        if route is None:
+            print(f"Ignoring LLM_MODEL_ROUTES entry for unknown task: {task}")
+            continue
+        MODEL_ROUTES[task] = ModelRoute(
+            values.get("model", route.model),
+            int(values.get("max_tokens", route.max_tokens)),
+            float(values.get("timeout", route.timeout)),
+            values.get("secondary_model", route.secondary_model),
+        )
+
+
+if os.environ.get("LLM_MODEL_ROUTES"):
+    _apply_overrides(os.environ["LLM_MODEL_ROUTES"])
+
+
+def model_route(task: str) -> ModelRoute:
+    return MODEL_ROUTES[task]
@@ -1,15 +1,13 @@
-import os
-from groq import Groq
-from pypdf import PdfReader
+import asyncio
 from io import BytesIO
 from typing import Dict, Any
-
-# Initialize Groq client
-groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+from app.services.llm_client import llm_client
 
 
 def extract_text_from_pdf(pdf_file: bytes) -> str:
     """Extract text from PDF file bytes"""
+    from pypdf import PdfReader
+
     try:
         pdf_reader = PdfReader(BytesIO(pdf_file))
         text = ""
@@ -22,7 +20,7 @@ def extract_text_from_pdf(pdf_file: bytes) -> str:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
 
 
-def summarize_legal_document(text: str) -> Dict[str, Any]:
+async def summarize_legal_document(text: str) -> Dict[str, Any]:
     """Summarize legal document using Groq AI"""
 
     system_prompt = """You are a legal document analyzer specializing in Indian law. 
@@ -79,14 +77,13 @@ IMPORTANT:
 Remember: Return ONLY valid JSON in the specified format."""
 
     try:
-        response = groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
+        response = await llm_client.complete(
+            "pdf_summary",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt},
             ],
             temperature=0.3,
-            max_tokens=4000,
         )
 
         summary_text = response.choices[0].message.content.strip()
@@ -148,11 +145,11 @@ Remember: Return ONLY valid JSON in the specified format."""
         raise Exception(f"Error generating summary: {str(e)}")
 
 
-def process_pdf_document(pdf_file: bytes) -> Dict[str, Any]:
+async def process_pdf_document(pdf_file: bytes) -> Dict[str, Any]:
     """Main function to process PDF and return summary"""
 
-    # Extract text from PDF
-    text = extract_text_from_pdf(pdf_file)
+    # Extract text from PDF (CPU-bound, so keep it off the event loop)
+    text = await asyncio.to_thread(extract_text_from_pdf, pdf_file)
 
     if not text or len(text) < 100:
         raise Exception(
@@ -160,6 +157,6 @@ def process_pdf_document(pdf_file: bytes) -> Dict[str, Any]:
         )
 
     # Generate summary using Groq
-    summary = summarize_legal_document(text)
+    summary = await summarize_legal_document(text)
 
     return {"success": True, "summary": summary, "extracted_text_length": len(text)}
@@ -0,0 +1,141 @@
+import os
+import re
+from functools import cached_property
+from typing import Dict, List
+
+TRUNCATION_MARKER = " ... [truncated]"
+
+# Fallback estimate when no BPE vocabulary is available: roughly one token per
+# short word or punctuation mark, and one per four characters of longer words
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def _estimate(word: str) -> int:
+    return max(1, (len(word) + 3) // 4)
+
+
+class TokenCounter:
+    """
+    Counts tokens locally with tiktoken's cl100k_base, which tracks the Llama 3
+    tokenizer closely enough for budgeting. Falls back to a word-based estimate
+    when tiktoken or its vocabulary file is unavailable. The vocabulary is
+    loaded on first use.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self.encoding_name = encoding_name
+
+    @cached_property
+    def encoding(self):
+        try:
+            import tiktoken
+
+            return tiktoken.get_encoding(self.encoding_name)
+        except Exception as e:
+            print(
+                f"Tokenizer unavailable, estimating prompt tokens: {type(e).__name__}"
+            )
+            return None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return sum(_estimate(word) for word in _WORD_PATTERN.findall(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cuts text to at most max_tokens, marking the cut."""
+        if self.count(text) <= max_tokens:
+            return text
+        budget = max(max_tokens - self.count(TRUNCATION_MARKER), 0)
+        if self.encoding:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            return self.encoding.decode(tokens[:budget]) + TRUNCATION_MARKER
+
+        used = 0
+        for match in _WORD_PATTERN.finditer(text):
+            used += _estimate(match.group())
+            if used > budget:
+                return text[: match.start()].rstrip() + TRUNCATION_MARKER
+        return text
+
+
+class PromptBuilder:
+    """
+    Keeps each generation prompt within a fixed token budget.
+
+    The system prompt and question are always sent in full. Recent history
+    gets up to ``history_tokens``, keeping the newest lines. The rest of
+    ``max_tokens`` goes to retrieved chunks in rank order: the budget is split
+    evenly, short chunks hand their unused share to longer ones, and anything
+    over its share is truncated. Chunks that would get fewer than
+    ``min_chunk_tokens`` are dropped.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 6000,
+        history_tokens: int = 800,
+        min_chunk_tokens: int = 64,
+        counter: TokenCounter = None,
+    ):
+        self.max_tokens = max_tokens
+        self.history_tokens = history_tokens
+        self.min_chunk_tokens = min_chunk_tokens
+        self.counter = counter or TokenCounter()
+
+    @classmethod
+    def from_env(cls) -> "PromptBuilder":
+        return cls(
+            max_tokens=int(os.environ.get("PROMPT_MAX_TOKENS", "6000")),
+            history_tokens=int(os.environ.get("PROMPT_HISTORY_TOKENS", "800")),
+            min_chunk_tokens=int(os.environ.get("PROMPT_MIN_CHUNK_TOKENS", "64")),
+        )
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    def fit_history(self, history_text: str, max_tokens: int = None) -> str:
+        """Keeps the most recent history lines that fit the budget."""
+        budget = self.history_tokens if max_tokens is None else max_tokens
+        kept: List[str] = []
+        for line in reversed(history_text.splitlines()):
+            cost = self.count(line) + 1
+            if cost > budget:
+                if not kept:
+                    kept.append(self.counter.truncate(line, budget))
+                break
+            kept.append(line)
+            budget -= cost
+        return "".join(f"{line}\n" for line in reversed(kept))
+
+    def fit_context(self, context: List[Dict], max_tokens: int) -> List[Dict]:
+        """Returns copies of the context items with text trimmed to the budget."""
+        if max_tokens <= 0 or not context:
+            return []
+
+        sizes = [self.count(item["text"]) for item in context]
+        allowance = [0] * len(context)
+        remaining = max_tokens
+        pending = sorted(range(len(context)), key=lambda i: sizes[i])
+        while pending:
+            share = remaining // len(pending)
+            i = pending.pop(0)
+            allowance[i] = min(sizes[i], share)
+            remaining -= allowance[i]
+
+        fitted = []
+        for item, size, tokens in zip(context, sizes, allowance):
+            if tokens < min(self.min_chunk_tokens, size):
+                continue
+            text = item["text"]
+            if tokens < size:
+                text = self.counter.truncate(text, tokens)
+            fitted.append({**item, "text": text})
+        return fitted
+
+    def usage(self, system_prompt: str, user_prompt: str) -> Dict[str, int]:
+        system = self.count(system_prompt)
+        user = self.count(user_prompt)
+        return {"system": system, "user": user, "total": system + user}
@@ -0,0 +1,156 @@
+import json
+import math
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+MODEL_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "query_router_model.json"
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9ऀ-ॿ]+")
+
+# Questions about the app's own domain filter ("which domain is selected",
+# "is the criminal law filter on"), not about filters or domain names in law
+FILTER_PATTERN = re.compile(
+    r"\b(filters?|domains?|category)\b(?! names?\b).*"
+    r"\b(active|selected|applied|chosen|set|using|filtered|laga)\b"
+    r"|\b(filters?|domains?)\b(?! names?\b).*\bon\W*$"
+    r"|\b(active|selected|applied|chosen|current|my)\s+(filters?|domains?|category)\b"
+    r"|\b(select|selected|chose|chosen|using)\b.*\b(filters?|domains?)\W*$",
+    re.IGNORECASE,
+)
+
+LEGAL_PATTERN = re.compile(
+    r"\b(sec(tion)?s?|article|act|acts|ipc|bns|bnss|bsa|crpc|cpc|fir|bail|court|courts|"
+    r"judge|judgment|judgement|lawyer|advocate|law|laws|legal|illegal|offen[cs]es?|crime|"
+    r"criminal|punish(ment|able)?|penalty|fine|imprisonment|jail|arrest(ed)?|police|"
+    r"complaint|petition|appeal|rights?|constitution|contract|divorce|maintenance|"
+    r"property|tenant|landlord|cheating|fraud|theft|murder|assault|harassment|dowry|"
+    r"defamation|consumer|gst|tax|company|companies|director|insolvency|cyber|data|"
+    r"privacy|evidence|witness|summons|warrant|notice|accused|victim|liable|liability|"
+    r"kanoon|adhiniyam|sanhita|dhara|adalat|kanooni)\b|\b\d{2,3}[a-z]?\b",
+    re.IGNORECASE,
+)
+
+CASUAL_PATTERNS = [
+    re.compile(p, re.IGNORECASE)
+    for p in [
+        r"^(hi+|hello+|hey+|hiya|yo|hola|namaste|namaskar|good (morning|afternoon|evening|night))"
+        r"( there| again| samvidhan(ai)?| bot| buddy| friend)?[\s!.,]*$",
+        r"^(thanks?|thank you|thx|ty|dhanyavaa?d|shukriya)( (a lot|so much|very much|again|for (the|your) help))?[\s!.,]*$",
+        r"^(bye+|goodbye|see (you|ya)|take care|good night|cya)( (later|soon|then))?[\s!.,]*$",
+        r"^(ok(ay)?|cool|great|nice|awesome|got it|understood|alright|perfect|sure|fine)"
+        r"( thanks?| thank you)?[\s!.,]*$",
+        r"^(how are you|how's it going|what's up|whats up|sup|who are you|what can you do|"
+        r"what is your name|what's your name)[\s?!.,]*$",
+    ]
+]
+
+
+class NaiveBayesModel:
+    """Tiny multinomial naive Bayes over word tokens, small enough to bundle as JSON."""
+
+    def __init__(self, class_counts: Dict[str, int], token_counts: Dict[str, Dict[str, int]]):
+        self.class_counts = class_counts
+        self.token_counts = token_counts
+        self.vocab = {t for counts in token_counts.values() for t in counts}
+        self.totals = {c: sum(counts.values()) for c, counts in token_counts.items()}
+
+    @classmethod
+    def fit(cls, samples: List[Tuple[str, str]]) -> "NaiveBayesModel":
+        class_counts: Dict[str, int] = {}
+        token_counts: Dict[str, Dict[str, int]] = {}
+        for text, label in samples:
+            class_counts[label] = class_counts.get(label, 0) + 1
+            counts = token_counts.setdefault(label, {})
+            for token in tokenize(text):
+                counts[token] = counts.get(token, 0) + 1
+        return cls(class_counts, token_counts)
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesModel":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["class_counts"], data["token_counts"])
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"class_counts": self.class_counts, "token_counts": self.token_counts},
+                f,
+                ensure_ascii=False,
+                sort_keys=True,
+            )
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        tokens = [t for t in tokenize(text) if t in self.vocab]
+        n_samples = sum(self.class_counts.values())
+        vocab_size = len(self.vocab) or 1
+
+        log_scores = {}
+        for label, count in self.class_counts.items():
+            counts = self.token_counts.get(label, {})
+            denominator = self.totals.get(label, 0) + vocab_size
+            score = math.log(count / n_samples)
+            for token in tokens:
+                score += math.log((counts.get(token, 0) + 1) / denominator)
+            log_scores[label] = score
+
+        top = max(log_scores.values())
+        exp_scores = {c: math.exp(s - top) for c, s in log_scores.items()}
+        norm = sum(exp_scores.values())
+        return {c: s / norm for c, s in exp_scores.items()}
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class QueryRouter:
+    """
+    Classifies a query as legal, casual or filter without calling the LLM.
+    Returns the label and a confidence in [0, 1]; callers fall back to the LLM
+    classifier when the confidence is below their threshold.
+    """
+
+    def __init__(self, model: Optional[NaiveBayesModel] = None):
+        self.model = model
+
+    @classmethod
+    def from_env(cls) -> "QueryRouter":
+        path = os.environ.get("QUERY_ROUTER_MODEL", MODEL_PATH)
+        model = None
+        if path and os.path.exists(path):
+            try:
+                model = NaiveBayesModel.load(path)
+            except Exception as e:
+                print(f"Query router model not loaded: {e}")
+        return cls(model=model)
+
+    def classify(self, query: str) -> Tuple[str, float]:
+        text = " ".join(query.strip().split())
+
+        if not text:
+            return "casual", 0.9
+
+        if FILTER_PATTERN.search(text):
+            # "Is the criminal law filter on?" names a domain, but legal
+            # vocabulary may also mean a legal question: let the LLM decide
+            return ("filter", 0.75) if LEGAL_PATTERN.search(text) else ("filter", 0.95)
+
+        if any(p.match(text) for p in CASUAL_PATTERNS):
+            return "casual", 0.97
+
+        if LEGAL_PATTERN.search(text):
+            return "legal", 0.95
+
+        if self.model:
+            probabilities = self.model.predict_proba(text)
+            label = max(probabilities, key=probabilities.get)
+            return label, probabilities[label]
+
+        return "legal", 0.5
+
+
+query_router = QueryRouter.from_env()
@@ -1,46 +1,197 @@
 import os
-from typing import List, Dict
-from langchain_mistralai import MistralAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
-from pinecone import Pinecone
-from langchain_community.chat_message_histories import ChatMessageHistory
+import asyncio
+import threading
+import time
+from functools import wraps
+from typing import AsyncIterator, List, Dict, Tuple
+from langchain_core.messages import AIMessage, HumanMessage
 from dotenv import load_dotenv
-from groq import Groq
 import re
 import json
 from app.data.legal_mapping import get_mapping
+from app.services.query_router import query_router
+from app.services.history_store import history_store, format_ai_message
+from app.services.conversation_memory import ConversationMemory, answer_text
+from app.services.json_stream import JSONFieldStreamer
+from app.services.embedding_cache import QueryEmbeddingCache, normalize_query
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.answer_cache import SemanticAnswerCache
+from app.services.vector_store import (
+    build_vector_store,
+    fetch_vectors,
+    search_with_vectors,
+)
+from app.services.bm25_index import BM25Index, BM25_INDEX_PATH, reciprocal_rank_fusion
+from app.services.section_index import SectionIndex, SECTION_INDEX_PATH
+from app.services.reranker import ContextReranker
+from app.services.prompt_builder import PromptBuilder
+from app.services.llm_client import LLM_REQUEST_DEADLINE, llm_client, request_deadline
+from app.services.single_flight import SingleFlight
 
 load_dotenv()
 
+# Local router answers above this confidence skip the LLM classifier
+QUERY_ROUTER_MIN_CONFIDENCE = float(
+    os.environ.get("QUERY_ROUTER_MIN_CONFIDENCE", "0.8")
+)
+
+# Fuse BM25 results with vector search when a lexical index has been built
+HYBRID_RETRIEVAL = os.environ.get("HYBRID_RETRIEVAL", "true").lower() == "true"
+
+# Send concurrent query embeddings to the API as one batched request
+EMBED_BATCHING = os.environ.get("EMBED_BATCHING", "true").lower() == "true"
+
+
+LEGAL_FALLBACK_ANSWER = {
+    "law": "I encountered a technical issue processing your request.",
+    "examples": "Please try rephrasing your question or ask about a specific law or section.",
+    "simple_answer": "There was an error, but I'm here to help. Could you please rephrase your legal question?",
+    "citations": [],
+}
+
+SEARCH_FALLBACK_ANSWER = {
+    "green_layer": "I encountered a technical issue processing your search.",
+    "yellow_layer": "",
+    "red_layer": "",
+}
+
+CASUAL_FALLBACK_ANSWER = (
+    "Hello! I'm SamvidhanAI, your legal assistant. How can I help you today?"
+)
+
+
+def lazy_client(build):
+    """
+    Like cached_property, but the value is built at most once even when the
+    warm-up thread and a request thread ask for it at the same time. As with
+    cached_property, assigning the attribute replaces the value.
+    """
+    name = build.__name__
+    lock = threading.Lock()
+
+    @wraps(build)
+    def get(self):
+        if name not in self.__dict__:
+            with lock:
+                if name not in self.__dict__:
+                    self.__dict__[name] = build(self)
+        return self.__dict__[name]
+
+    def set(self, value):
+        self.__dict__[name] = value
+
+    return property(get, set)
+
 
 class RAGService:
-    def __init__(self):
-        # Initialize Pinecone and other services silently
-        pc = Pinecone(api_key=os.environ.get("PINECONE_API_KEY"))
-        index_name = os.environ.get("PINECONE_INDEX", "samvidhan")
-        self.index = pc.Index(index_name)
+    """
+    Clients and indexes that need network calls, file loads or heavy imports
+    are built on first use, so importing the app stays fast. warm_up() builds
+    them all ahead of the first request; a request that arrives earlier
+    builds (or waits for) what it needs in a worker thread via _ready(), never
+    on the event loop.
+    """
+
+    LAZY_CLIENTS = (
+        "embeddings",
+        "vector_store",
+        "bm25_index",
+        "section_index",
+        "embedding_cache",
+    )
 
-        self.embeddings = MistralAIEmbeddings(
-            model="mistral-embed", mistral_api_key=os.environ.get("MISTRAL_API_KEY")
+    def __init__(self):
+        self.reranker = ContextReranker.from_env()
+        self.prompt_builder = PromptBuilder.from_env()
+        self.answer_cache = SemanticAnswerCache.from_env()
+        # Search answers have their own shape, so they are cached apart
+        self.search_answer_cache = SemanticAnswerCache.from_env()
+        # Identical questions arriving together share one upstream call per
+        # stage; answers still land in each caller's own session
+        self.single_flight = SingleFlight.from_env()
+        self.embedding_batcher = EmbeddingBatcher.from_env(
+            lambda texts: self.embeddings.aembed_documents(texts)
         )
 
-        self.vector_store = PineconeVectorStore(
-            index=self.index, embedding=self.embeddings
+        self.llm = llm_client
+        self.memory = ConversationMemory.from_env(self.llm)
+        self.warmed_up = False
+
+    @lazy_client
+    def embeddings(self):
+        from langchain_mistralai import MistralAIEmbeddings
+        from app.services.disk_embedding_cache import (
+            EMBEDDING_CACHE,
+            CachedEmbeddings,
+            DiskEmbeddingCache,
         )
 
-        self.chat = Groq(api_key=os.environ.get("GROQ_API_KEY"))
-        self.chat_histories = {}
+        embeddings = MistralAIEmbeddings(
+            model="mistral-embed", mistral_api_key=os.environ.get("MISTRAL_API_KEY")
+        )
+        if not EMBEDDING_CACHE:
+            return embeddings
+        # Reads the vectors ingestion cached; query vectors stay in the LRU
+        return CachedEmbeddings(
+            embeddings, DiskEmbeddingCache.from_env("mistral-embed")
+        )
 
-    def get_chat_history(self, session_id: str = "default") -> ChatMessageHistory:
-        if session_id not in self.chat_histories:
-            self.chat_histories[session_id] = ChatMessageHistory()
-        return self.chat_histories[session_id]
+    @lazy_client
+    def vector_store(self):
+        # Pinecone by default, or the in-process index when VECTOR_STORE=local
+        return build_vector_store(self.embeddings)
+
+    @lazy_client
+    def bm25_index(self):
+        return BM25Index.load(BM25_INDEX_PATH) if HYBRID_RETRIEVAL else None
+
+    @lazy_client
+    def section_index(self):
+        return SectionIndex.load(SECTION_INDEX_PATH)
+
+    @lazy_client
+    def embedding_cache(self):
+        return QueryEmbeddingCache.from_env()
+
+    def disk_embedding_stats(self):
+        # Not built yet means no lookups yet; don't force it here
+        embeddings = self.__dict__.get("embeddings")
+        cache = getattr(embeddings, "cache", None)
+        return cache.stats() if cache else None
+
+    def warm_up(self):
+        """Builds every lazy client and index; blocking, run it off the event loop."""
+        start = time.perf_counter()
+        for name in self.LAZY_CLIENTS:
+            try:
+                getattr(self, name)
+            except Exception as e:
+                print(f"Warm-up of {name} failed: {e}")
+        self.prompt_builder.count("warm up")
+        self.llm.warm_up()
+        self.warmed_up = True
+        print(f"RAG service warmed up in {time.perf_counter() - start:.2f}s")
+
+    async def _ready(self, *names: str):
+        """Builds the named lazy clients off the event loop if not built yet."""
+        if all(name in self.__dict__ for name in names):
+            return
+        await asyncio.to_thread(lambda: [getattr(self, name) for name in names])
 
     def clear_chat_history(self, session_id: str = "default"):
-        if session_id in self.chat_histories:
-            self.chat_histories[session_id].clear()
+        history_store.clear(session_id)
+        self.memory.clear(session_id)
+
+    async def classify_query(self, query: str) -> str:
+        label, confidence = query_router.classify(query)
+        if confidence >= QUERY_ROUTER_MIN_CONFIDENCE:
+            return label
+        return await self.single_flight.do(
+            ("classify", normalize_query(query)),
+            lambda: self.classify_query_llm(query),
+        )
 
-    def classify_query(self, query: str) -> str:
+    async def classify_query_llm(self, query: str) -> str:
         classification_prompt = """You are a query classifier. Classify the user's query into ONE category only.
 
 Categories:
@@ -61,10 +212,9 @@ Query: {query}
 Respond with ONLY ONE WORD: legal, casual, or filter"""
 
         try:
-            response = self.chat.chat.completions.create(
-                model="llama-3.3-70b-versatile",
+            response = await self.llm.complete(
+                "classify",
                 temperature=0.1,
-                max_tokens=10,
                 messages=[
                     {
                         "role": "user",
@@ -82,101 +232,161 @@ Respond with ONLY ONE WORD: legal, casual, or filter"""
         except Exception:
             return "legal"
 
-    def retrieve_context(
+    async def embed_query(self, query: str) -> List[float]:
+        await self._ready("embedding_cache", "embeddings")
+        embedding = self.embedding_cache.get(query)
+        if embedding is None:
+            embedding = await self.single_flight.do(
+                ("embed", normalize_query(query)),
+                lambda: self._embed_and_cache(query),
+            )
+        return embedding
+
+    async def _embed_and_cache(self, query: str) -> List[float]:
+        if EMBED_BATCHING:
+            # mistral-embed embeds queries and documents the same way
+            embedding = await self.embedding_batcher.embed(query)
+        else:
+            embedding = await self.embeddings.aembed_query(query)
+        self.embedding_cache.put(query, embedding)
+        return embedding
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embeds many queries at once; cache misses go out in one batched call."""
+        await self._ready("embedding_cache", "embeddings")
+        embeddings = [self.embedding_cache.get(query) for query in queries]
+        missing = {}
+        for query, embedding in zip(queries, embeddings):
+            if embedding is None:
+                missing.setdefault(normalize_query(query), query)
+
+        if missing:
+            vectors = await self.embeddings.aembed_documents(list(missing.values()))
+            fetched = dict(zip(missing, vectors))
+            for query, vector in zip(missing.values(), vectors):
+                self.embedding_cache.put(query, vector)
+            embeddings = [
+                embedding or fetched[normalize_query(query)]
+                for query, embedding in zip(queries, embeddings)
+            ]
+        return embeddings
+
+    async def retrieve_context(
+        self, query: str, domain: str = None, n_results: int = 5
+    ) -> List[Dict]:
+        return await self.single_flight.do(
+            ("retrieve", normalize_query(query), domain, n_results),
+            lambda: self._retrieve_context(query, domain, n_results),
+        )
+
+    async def _retrieve_context(
         self, query: str, domain: str = None, n_results: int = 5
     ) -> List[Dict]:
         try:
-            if domain:
-                results = self.vector_store.similarity_search(
-                    query, k=n_results, filter={"domain": domain}
+            await self._ready("section_index", "bm25_index", "vector_store")
+            # Queries naming a section ("BNS 318", "IPC 420") resolve straight
+            # to the statutory text without a similarity search
+            results = self.section_index.lookup(query, domain=domain, k=n_results)
+            if results:
+                return [
+                    {"id": doc.id, "text": doc.page_content, "metadata": doc.metadata}
+                    for doc in results
+                ]
+
+            embedding = await self.embed_query(query)
+            search_filter = {"domain": domain} if domain else None
+
+            # Over-fetch candidates for the reranker. Vector store clients
+            # are synchronous, so the index query runs in a worker thread to
+            # keep the event loop free for other requests.
+            hits = await asyncio.to_thread(
+                search_with_vectors,
+                self.vector_store,
+                embedding,
+                self.reranker.fetch_k,
+                search_filter,
+            )
+            candidates = [doc for doc, _ in hits]
+            vectors = {doc.id: vector for doc, vector in hits}
+            missing = []
+
+            if self.bm25_index:
+                # Exact tokens like "Section 318" or "124A" are where dense
+                # retrieval is weakest, so blend in lexical matches
+                lexical = self.bm25_index.search(
+                    query, k=self.reranker.fetch_k, filter=search_filter
                 )
-            else:
-                results = self.vector_store.similarity_search(query, k=n_results)
+                candidates = reciprocal_rank_fusion([candidates, lexical])
+                # BM25-only hits have no similarity from the search yet
+                missing = [doc.id for doc in candidates if doc.id not in vectors]
+                if missing:
+                    vectors.update(
+                        await asyncio.to_thread(
+                            fetch_vectors, self.vector_store, missing
+                        )
+                    )
+
+            results = self.reranker.rerank(
+                embedding, candidates, vectors, n_results, lexical=set(missing)
+            )
 
             citations = []
             for doc in results:
-                citations.append({"text": doc.page_content, "metadata": doc.metadata})
+                citations.append(
+                    {"id": doc.id, "text": doc.page_content, "metadata": doc.metadata}
+                )
             return citations
         except Exception:
             return []
 
-    def generate_answer(
-        self,
-        query: str,
-        context: List[Dict],
-        session_id: str = "default",
-        domain: str = None,
-    ) -> Dict[str, str]:
-        chat_history = self.get_chat_history(session_id)
-
-        query_type = self.classify_query(query)
-
-        if len(chat_history.messages) > 14:
-            chat_history.messages = chat_history.messages[-14:]
+    async def _history_text(self, session_id: str, query: str) -> str:
+        history = await history_store.get_messages(session_id)
+        # The current question may already be persisted as the latest turn
+        if history and history[-1].type == "human" and history[-1].content == query:
+            history = history[:-1]
+
+        # Older turns reach the prompt through the rolling summary; without one
+        # yet, fall back to the last few raw messages
+        summary, unfolded = await self.memory.get_summary(session_id)
+        if summary:
+            history_text = f"Summary of earlier conversation: {summary}\n"
+            # Everything the summary does not cover yet, however far folding lags
+            recent = history[-max(unfolded, 2 * self.memory.recent_turns) :]
+        else:
+            history_text = ""
+            recent = history[-6:]
 
-        history_text = ""
-        for msg in chat_history.messages[-6:]:
+        for msg in recent:
             role = "User" if msg.type == "human" else "Assistant"
             history_text += f"{role}: {msg.content}\n"
+        return history_text
 
-        if query_type == "casual":
-            system_prompt = """You are SamvidhanAI, a friendly and helpful legal assistant for Indian law.
+    def _casual_prompts(self, query: str, history_text: str) -> Tuple[str, str]:
+        history_text = self.prompt_builder.fit_history(history_text)
+        system_prompt = """You are SamvidhanAI, a friendly and helpful legal assistant for Indian law.
 
 Respond naturally and warmly to casual messages. Keep it brief and conversational.
 Invite users to ask legal questions if appropriate."""
 
-            user_prompt = f"""Conversation History:
+        user_prompt = f"""Conversation History:
 {history_text}
 
 User: {query}
 
 Respond in a friendly, natural way."""
 
-            try:
-                chat_history.add_user_message(query)
-
-                response = self.chat.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    temperature=0.7,
-                    max_tokens=100,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                )
-
-                casual_response = response.choices[0].message.content
-                chat_history.add_ai_message(casual_response)
+        return system_prompt, user_prompt
 
-                return {"casual": casual_response}
-
-            except Exception as _e:
-                return {
-                    "casual": "Hello! I'm SamvidhanAI, your legal assistant. How can I help you today?"
-                }
-
-        if query_type == "filter":
-            filter_status = (
-                f"You currently have the **{domain}** filter active, so I'll focus on {domain} related queries."
-                if domain
-                else "You haven't selected any specific filter, so I can help with questions across all areas of Indian law."
-            )
-
-            chat_history.add_user_message(query)
-            chat_history.add_ai_message(filter_status)
-
-            return {"casual": filter_status}
-
-        context_str = ""
-        has_strong_context = bool(context and len(context) > 0)
-
-        if context:
-            for i, item in enumerate(context, 1):
-                meta = item["metadata"]
-                act_name = meta.get("act", "Unknown Act")
-                section = meta.get("section", "N/A")
-                context_str += f"\n[Source {i}: {act_name} | Section: {section}]\n{item['text']}\n{'=' * 50}\n"
+    def _filter_status(self, domain: str = None) -> str:
+        return (
+            f"You currently have the **{domain}** filter active, so I'll focus on {domain} related queries."
+            if domain
+            else "You haven't selected any specific filter, so I can help with questions across all areas of Indian law."
+        )
 
+    def _legal_prompts(
+        self, query: str, context: List[Dict], history_text: str, domain: str = None
+    ) -> Tuple[str, str]:
         filter_info = f"The user has selected **{domain}** filter." if domain else ""
 
         system_prompt = f"""You are SamvidhanAI, a knowledgeable legal assistant for Indian law.
@@ -251,16 +461,22 @@ IMPORTANT:
 
 {filter_info}"""
 
-        context_instruction = ""
-        if has_strong_context:
-            context_instruction = f"""Legal Documents Retrieved:
+        def render(context: List[Dict], history_text: str) -> str:
+            if context:
+                context_str = ""
+                for i, item in enumerate(context, 1):
+                    meta = item["metadata"]
+                    act_name = meta.get("act", "Unknown Act")
+                    section = meta.get("section", "N/A")
+                    context_str += f"\n[Source {i}: {act_name} | Section: {section}]\n{item['text']}\n{'=' * 50}\n"
+                context_instruction = f"""Legal Documents Retrieved:
 {context_str}
 
 Use these documents as primary sources. Cite them in your response."""
-        else:
-            context_instruction = "No specific documents found in database. Use your general knowledge of Indian law to provide a helpful, accurate response."
+            else:
+                context_instruction = "No specific documents found in database. Use your general knowledge of Indian law to provide a helpful, accurate response."
 
-        user_prompt = f"""{context_instruction}
+            return f"""{context_instruction}
 
 Conversation History:
 {history_text}
@@ -269,56 +485,536 @@ User's Question: {query}
 
 Provide a detailed, comprehensive response in JSON format."""
 
-        try:
-            chat_history.add_user_message(query)
+        # Whatever the system prompt, question, history and source headers
+        # leave of the budget goes to the retrieved text itself
+        builder = self.prompt_builder
+        history_text = builder.fit_history(history_text)
+        empty_chunks = [{**item, "text": ""} for item in context]
+        overhead = builder.count(system_prompt) + builder.count(
+            render(empty_chunks, history_text)
+        )
+        fitted = builder.fit_context(context, builder.max_tokens - overhead)
+        user_prompt = render(fitted, history_text)
 
-            response = self.chat.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                temperature=0.2,
-                max_tokens=2000,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+        usage = builder.usage(system_prompt, user_prompt)
+        print(
+            f"Prompt tokens: {usage['total']} (system {usage['system']}, "
+            f"user {usage['user']}, {len(fitted)}/{len(context)} chunks)"
+        )
+
+        return system_prompt, user_prompt
+
+    def _search_prompts(
+        self, query: str, context: List[Dict], domain: str = None
+    ) -> Tuple[str, str]:
+        filter_info = f"Focus on {domain}." if domain else ""
+        system_prompt = f"""You are SamvidhanAI, a legal search assistant for Indian law. BNS, BNSS and BSA replaced IPC, CrPC and the Evidence Act in 2023.
+
+Answer the search in three short layers, grounded in the sources when they are relevant, in the language of the question. {filter_info}
+
+Return JSON:
+{{
+    "green_layer": "What the law says, in 2-4 plain sentences, naming the act and section.",
+    "yellow_layer": "Conditions, exceptions and practical next steps, in 2-4 sentences.",
+    "red_layer": "Penalties, risks and when to consult a lawyer, in 1-3 sentences."
+}}"""
+
+        def render(context: List[Dict]) -> str:
+            sources = "".join(
+                f"[{item['metadata'].get('act', 'Unknown Act')} | Section: "
+                f"{item['metadata'].get('section', 'N/A')}]\n{item['text']}\n\n"
+                for item in context
             )
+            return f"Sources:\n{sources or '(none found)'}\nSearch: {query}"
 
-            content = response.choices[0].message.content
+        builder = self.prompt_builder
+        empty_chunks = [{**item, "text": ""} for item in context]
+        overhead = builder.count(system_prompt) + builder.count(render(empty_chunks))
+        fitted = builder.fit_context(context, builder.max_tokens - overhead)
+        return system_prompt, render(fitted)
+
+    async def search_answer(
+        self,
+        query: str,
+        context: List[Dict],
+        domain: str = None,
+        use_cache: bool = True,
+    ) -> Dict[str, str]:
+        """
+        Stateless answer in the SearchResponse layers: no history is read or
+        written and nothing is classified, so concurrent searches share no
+        mutable per-user state.
+        """
+        try:
+            if use_cache:
+                embedding, chunk_ids, cached = await self._lookup_answer(
+                    self.search_answer_cache, query, context, domain
+                )
+                if cached:
+                    return cached
+
+            system_prompt, user_prompt = self._search_prompts(query, context, domain)
+            content = await self.single_flight.do(
+                (
+                    "search_answer",
+                    normalize_query(query),
+                    domain,
+                    tuple(item.get("id") for item in context),
+                ),
+                lambda: self._complete_text(
+                    "search_answer",
+                    system_prompt,
+                    user_prompt,
+                    temperature=0.2,
+                    response_format={"type": "json_object"},
+                ),
+            )
             result = json.loads(content)
+            answer = {
+                layer: str(result.get(layer, "")) for layer in SEARCH_FALLBACK_ANSWER
+            }
+
+            if use_cache:
+                self._store_answer(
+                    self.search_answer_cache, embedding, domain, chunk_ids, answer
+                )
+            return answer
+        except Exception:
+            return dict(SEARCH_FALLBACK_ANSWER)
+
+    async def search_query(
+        self,
+        query: str,
+        domain: str = None,
+        n_results: int = 5,
+        use_cache: bool = True,
+    ) -> Tuple[List[Dict], Dict[str, str], List[str]]:
+        """
+        Fast path for /api/search: retrieval then a compact answer, with
+        related cases looked up alongside. Returns (context, answer,
+        related_cases).
+        """
+        related_task = asyncio.create_task(self.find_related_cases(query))
+        try:
+            context = await self.retrieve_context(query, domain, n_results)
+            answer = await self.search_answer(query, context, domain, use_cache)
+            related_cases = await related_task
+        except BaseException:
+            related_task.cancel()
+            raise
+        return context, answer, related_cases
+
+    def _finish_legal_answer(self, query: str, result: Dict, session_id: str) -> Dict:
+        if "citations" not in result or not result["citations"]:
+            result["citations"] = []
+
+        comparison = None
+        section_matches = re.findall(
+            r"(?:section|ipc|bns)\s*([0-9]+[a-zA-Z]*)", query.lower()
+        )
+        for sec in section_matches:
+            mapping = get_mapping(sec.upper())
+            if mapping:
+                comparison = mapping
+                break
+
+        history_store.add_message(
+            session_id, AIMessage(content=format_ai_message(result))
+        )
+        self.memory.record_turn(session_id, query, answer_text(result))
 
-            if "citations" not in result or not result["citations"]:
-                result["citations"] = []
+        if comparison:
+            result["comparison"] = comparison
 
-            comparison = None
-            section_matches = re.findall(
-                r"(?:section|ipc|bns)\s*([0-9]+[a-zA-Z]*)", query.lower()
+        return result
+
+    async def _lookup_answer(
+        self,
+        cache: SemanticAnswerCache,
+        query: str,
+        context: List[Dict],
+        domain: str = None,
+    ) -> Tuple[List[float], List[str], Dict]:
+        """
+        Returns (query embedding, context chunk IDs, cached answer or None).
+        A failed lookup (e.g. the embedding API is down) is a miss with no
+        embedding, so the answer is still generated, just not cached.
+        """
+        chunk_ids = [item.get("id") for item in context]
+        try:
+            embedding = await self.embed_query(query)
+            return embedding, chunk_ids, cache.lookup(embedding, domain, chunk_ids)
+        except Exception as e:
+            print(f"Answer cache lookup failed, generating without it: {e}")
+            return None, chunk_ids, None
+
+    @staticmethod
+    def _store_answer(
+        cache: SemanticAnswerCache,
+        embedding: List[float],
+        domain: str,
+        chunk_ids: List[str],
+        answer: Dict,
+    ):
+        if embedding is None:
+            return
+        try:
+            cache.store(embedding, domain, chunk_ids, answer)
+        except Exception as e:
+            print(f"Answer cache store failed: {e}")
+
+    async def generate_answer(
+        self,
+        query: str,
+        context: List[Dict],
+        session_id: str = "default",
+        domain: str = None,
+        query_type: str = None,
+        use_cache: bool = True,
+    ) -> Dict[str, str]:
+        if query_type is None:
+            query_type = await self.classify_query(query)
+
+        history_text = await self._history_text(session_id, query)
+
+        if query_type == "casual":
+            system_prompt, user_prompt = self._casual_prompts(query, history_text)
+
+            try:
+                history_store.add_message(session_id, HumanMessage(content=query))
+
+                casual_response = await self.single_flight.do(
+                    ("casual", normalize_query(query), history_text),
+                    lambda: self._complete_text(
+                        "casual", system_prompt, user_prompt, temperature=0.7
+                    ),
+                )
+                history_store.add_message(
+                    session_id, AIMessage(content=casual_response)
+                )
+                self.memory.record_turn(session_id, query, casual_response)
+
+                return {"casual": casual_response}
+
+            except Exception as _e:
+                return {"casual": CASUAL_FALLBACK_ANSWER}
+
+        if query_type == "filter":
+            filter_status = self._filter_status(domain)
+
+            history_store.add_message(session_id, HumanMessage(content=query))
+            history_store.add_message(session_id, AIMessage(content=filter_status))
+            self.memory.record_turn(session_id, query, filter_status)
+
+            return {"casual": filter_status}
+
+        system_prompt, user_prompt = self._legal_prompts(
+            query, context, history_text, domain
+        )
+
+        try:
+            history_store.add_message(session_id, HumanMessage(content=query))
+
+            if use_cache:
+                embedding, chunk_ids, cached = await self._lookup_answer(
+                    self.answer_cache, query, context, domain
+                )
+                if cached:
+                    return self._finish_legal_answer(query, cached, session_id)
+
+            # History is part of the key: callers only share an answer when
+            # their prompts would have been the same
+            content = await self.single_flight.do(
+                (
+                    "legal_answer",
+                    normalize_query(query),
+                    domain,
+                    tuple(item.get("id") for item in context),
+                    history_text,
+                ),
+                lambda: self._complete_text(
+                    "legal_answer",
+                    system_prompt,
+                    user_prompt,
+                    temperature=0.2,
+                    response_format={"type": "json_object"},
+                ),
+            )
+            result = json.loads(content)
+
+            if use_cache:
+                self._store_answer(
+                    self.answer_cache, embedding, domain, chunk_ids, result
+                )
+
+            return self._finish_legal_answer(query, result, session_id)
+
+        except Exception:
+            return dict(LEGAL_FALLBACK_ANSWER, citations=[])
+
+    async def _complete_text(
+        self, task: str, system_prompt: str, user_prompt: str, **kwargs
+    ) -> str:
+        response = await self.llm.complete(
+            task,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            **kwargs,
+        )
+        return response.choices[0].message.content
+
+    async def _stream_completion(
+        self, system_prompt: str, user_prompt: str
+    ) -> AsyncIterator[str]:
+        # Groq does not combine JSON mode with streaming; the prompt
+        # already pins the output to a JSON object.
+        stream = await self.llm.complete(
+            "legal_answer",
+            temperature=0.2,
+            stream=True,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        )
+
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+    @staticmethod
+    async def _replay(text: str) -> AsyncIterator[str]:
+        yield text
+
+    async def stream_answer(
+        self,
+        query: str,
+        context: List[Dict],
+        session_id: str = "default",
+        domain: str = None,
+        query_type: str = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Tuple[str, object]]:
+        """
+        Streaming variant of generate_answer. Yields (field, value) for each
+        top-level answer field as soon as the model finishes writing it, then
+        ("answer", full_answer_dict).
+        """
+        if query_type is None:
+            query_type = await self.classify_query(query)
+
+        if query_type != "legal":
+            answer = await self.generate_answer(
+                query, context, session_id, domain, query_type
             )
-            for sec in section_matches:
-                mapping = get_mapping(sec.upper())
-                if mapping:
-                    comparison = mapping
-                    break
+            yield "casual", answer["casual"]
+            yield "answer", answer
+            return
 
-            ai_response = f"Law: {result.get('law', '')[:200]}...\nExamples: {result.get('examples', '')[:200]}..."
-            chat_history.add_ai_message(ai_response)
+        history_text = await self._history_text(session_id, query)
+        system_prompt, user_prompt = self._legal_prompts(
+            query, context, history_text, domain
+        )
+        streamer = JSONFieldStreamer()
 
-            if comparison:
-                result["comparison"] = comparison
+        try:
+            history_store.add_message(session_id, HumanMessage(content=query))
 
-            return result
+            cached = None
+            if use_cache:
+                embedding, chunk_ids, cached = await self._lookup_answer(
+                    self.answer_cache, query, context, domain
+                )
+
+            if cached:
+                # Replay the cached answer through the parser so the client
+                # sees the same field events as a live generation
+                deltas = self._replay(json.dumps(cached))
+            else:
+                deltas = self._stream_completion(system_prompt, user_prompt)
+
+            async for delta in deltas:
+                for field, value in streamer.feed(delta):
+                    yield field, value
+
+            if not streamer.complete:
+                raise ValueError("Incomplete JSON answer")
+
+            if use_cache and not cached:
+                self._store_answer(
+                    self.answer_cache, embedding, domain, chunk_ids, streamer.fields
+                )
+
+            result = self._finish_legal_answer(query, dict(streamer.fields), session_id)
 
         except Exception:
-            return {
-                "law": "I encountered a technical issue processing your request.",
-                "examples": "Please try rephrasing your question or ask about a specific law or section.",
-                "simple_answer": "There was an error, but I'm here to help. Could you please rephrase your legal question?",
-                "citations": [],
+            result = {**LEGAL_FALLBACK_ANSWER, "citations": [], **streamer.fields}
+
+        for field, value in result.items():
+            if field not in streamer.fields:
+                yield field, value
+
+        yield "answer", result
+
+    async def answer_query(
+        self,
+        query: str,
+        domain: str = None,
+        session_id: str = "default",
+        n_results: int = 5,
+        use_cache: bool = True,
+    ) -> Tuple[List[Dict], Dict[str, str], List[str]]:
+        """
+        Runs classification, retrieval and related-case lookup concurrently.
+        Retrieval and the related-case lookup are cancelled when the query
+        turns out to be casual or a filter question, so only legal answers
+        wait on them. Returns (context, answer, related_cases).
+        """
+        classify_task = asyncio.create_task(self.classify_query(query))
+        context_task = asyncio.create_task(
+            self.retrieve_context(query=query, domain=domain, n_results=n_results)
+        )
+        related_task = asyncio.create_task(self.find_related_cases(query))
+
+        try:
+            query_type = await classify_task
+
+            if query_type == "legal":
+                context = await context_task
+            else:
+                context_task.cancel()
+                related_task.cancel()
+                context = []
+
+            answer = await self.generate_answer(
+                query=query,
+                context=context,
+                session_id=session_id,
+                domain=domain,
+                query_type=query_type,
+                use_cache=use_cache,
+            )
+            related_cases = await related_task if query_type == "legal" else []
+        except BaseException:
+            for task in (classify_task, context_task, related_task):
+                task.cancel()
+            raise
+
+        return context, answer, related_cases
+
+    async def stream_query(
+        self,
+        query: str,
+        domain: str = None,
+        session_id: str = "default",
+        n_results: int = 5,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Tuple[str, object]]:
+        """
+        Streaming counterpart of answer_query. Yields ("field", {"name", "value"})
+        events while the answer is generated, then ("related_cases", list) and
+        finally ("done", {"context", "answer", "related_cases"}).
+        """
+        classify_task = asyncio.create_task(self.classify_query(query))
+        context_task = asyncio.create_task(
+            self.retrieve_context(query=query, domain=domain, n_results=n_results)
+        )
+        related_task = asyncio.create_task(self.find_related_cases(query))
+
+        try:
+            query_type = await classify_task
+
+            if query_type == "legal":
+                context = await context_task
+            else:
+                context_task.cancel()
+                related_task.cancel()
+                context = []
+
+            answer = {}
+            async for field, value in self.stream_answer(
+                query=query,
+                context=context,
+                session_id=session_id,
+                domain=domain,
+                query_type=query_type,
+                use_cache=use_cache,
+            ):
+                if field == "answer":
+                    answer = value
+                else:
+                    yield "field", {"name": field, "value": value}
+
+            related_cases = await related_task if query_type == "legal" else []
+            yield "related_cases", related_cases
+
+            yield "done", {
+                "context": context,
+                "answer": answer,
+                "related_cases": related_cases,
             }
+        finally:
+            # Also reached when the client disconnects mid-stream
+            for task in (classify_task, context_task, related_task):
+                task.cancel()
+
+    async def search_batch(
+        self,
+        queries: List[Tuple[str, str]],
+        n_results: int = 5,
+        include_answers: bool = False,
+        concurrency: int = 8,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Tuple[int, List[Dict], Dict]]:
+        """
+        Retrieval (and optionally a search answer) for many (query, domain)
+        pairs. All queries are embedded up front in one batched call, then
+        at most ``concurrency`` of them are searched at a time. Yields
+        (index, context, answer or None) in completion order.
 
-    def find_related_cases(self, query: str) -> List[str]:
+        Each query gets its own LLM deadline: a large batch streams for longer
+        than the request deadline that covers a single search.
+        """
+        # Primes the query embedding cache that retrieve_context reads
+        await self.embed_queries([query for query, _ in queries])
+        slots = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, query: str, domain: str):
+            async with slots:
+                with request_deadline(LLM_REQUEST_DEADLINE):
+                    context = await self.retrieve_context(query, domain, n_results)
+                    answer = None
+                    if include_answers:
+                        answer = await self.search_answer(
+                            query, context, domain, use_cache
+                        )
+                return index, context, answer
+
+        tasks = [
+            asyncio.create_task(run(index, query, domain))
+            for index, (query, domain) in enumerate(queries)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # Also reached when the client disconnects mid-stream
+            for task in tasks:
+                task.cancel()
+
+    async def find_related_cases(self, query: str) -> List[str]:
         """
         Dynamically identifies landmark Supreme Court and High Court judgments related to the query.
         """
+        return await self.single_flight.do(
+            ("related_cases", normalize_query(query)),
+            lambda: self._find_related_cases(query),
+        )
+
+    async def _find_related_cases(self, query: str) -> List[str]:
         prompt = f"""Identify 3 landmark Supreme Court or High Court judgments of India related to this legal query: "{query}".
         
         For each case, provide:
@@ -331,10 +1027,9 @@ Provide a detailed, comprehensive response in JSON format."""
         """
 
         try:
-            response = self.chat.chat.completions.create(
-                model="llama-3.3-70b-versatile",
+            response = await self.llm.complete(
+                "related_cases",
                 temperature=0.1,
-                max_tokens=400,
                 response_format={"type": "json_object"},
                 messages=[
                     {
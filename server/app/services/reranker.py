@@ -0,0 +1,106 @@
+import os
+from typing import Collection, Dict, List
+
+import numpy as np
+from langchain_core.documents import Document
+
+
+class ContextReranker:
+    """
+    Picks the final prompt context from an over-fetched candidate list.
+
+    Candidates arrive in fused (vector + BM25) order. Relevance blends query
+    similarity with a prior for the fused rank, weighted by ``rank_weight``,
+    so a keyword hit the dense model scores low still competes. Candidates below
+    ``score_margin`` of the best relevance are dropped, except ``lexical`` hits
+    (found by BM25 alone) in the fused top ``k``, whose low similarity is the
+    dense model's miss rather than a relevance signal. Maximal marginal
+    relevance then selects up to ``k`` chunks, trading
+    relevance against similarity to chunks already chosen, with at most
+    ``max_per_act`` chunks from any one act. Overlapping chunks and repeated
+    boilerplate therefore collapse to one representative.
+    """
+
+    def __init__(
+        self,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.7,
+        max_per_act: int = 2,
+        score_margin: float = 0.1,
+        rank_weight: float = 0.5,
+    ):
+        self.fetch_k = fetch_k
+        self.lambda_mult = lambda_mult
+        self.max_per_act = max_per_act
+        self.score_margin = score_margin
+        self.rank_weight = rank_weight
+
+    @classmethod
+    def from_env(cls) -> "ContextReranker":
+        return cls(
+            fetch_k=int(os.environ.get("RERANK_FETCH_K", "20")),
+            lambda_mult=float(os.environ.get("RERANK_LAMBDA", "0.7")),
+            max_per_act=int(os.environ.get("RERANK_MAX_PER_ACT", "2")),
+            score_margin=float(os.environ.get("RERANK_SCORE_MARGIN", "0.1")),
+            rank_weight=float(os.environ.get("RERANK_RANK_WEIGHT", "0.5")),
+        )
+
+    def rerank(
+        self,
+        query_vector: List[float],
+        candidates: List[Document],
+        vectors: Dict[str, np.ndarray],
+        k: int,
+        lexical: Collection[str] = (),
+    ) -> List[Document]:
+        candidates = [doc for doc in candidates if doc.id in vectors]
+        if not candidates:
+            return []
+
+        query = self._unit(np.asarray([query_vector], dtype=np.float32))[0]
+        matrix = self._unit(
+            np.stack(
+                [np.asarray(vectors[doc.id], dtype=np.float32) for doc in candidates]
+            )
+        )
+        # 1.0 for the first fused candidate down to 0 past the last
+        prior = 1.0 - np.arange(len(candidates)) / len(candidates)
+        relevance = (1 - self.rank_weight) * (matrix @ query) + self.rank_weight * prior
+
+        within_margin = relevance >= relevance.max() - self.score_margin
+        within_margin[:k] |= np.array([doc.id in lexical for doc in candidates[:k]])
+        keep = np.flatnonzero(within_margin)
+        pairwise = matrix[keep] @ matrix[keep].T
+
+        selected: List[int] = []
+        per_act: Dict[str, int] = {}
+        # Highest similarity of each candidate to any chunk selected so far
+        redundancy = np.zeros(len(keep))
+        available = np.ones(len(keep), dtype=bool)
+
+        while len(selected) < k and available.any():
+            mmr = (
+                self.lambda_mult * relevance[keep] - (1 - self.lambda_mult) * redundancy
+            )
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+            available[best] = False
+
+            act = candidates[keep[best]].metadata.get("act", "")
+            if per_act.get(act, 0) >= self.max_per_act:
+                continue
+            per_act[act] = per_act.get(act, 0) + 1
+            redundancy = (
+                np.maximum(redundancy, pairwise[best])
+                if selected
+                else pairwise[best].copy()
+            )
+            selected.append(best)
+
+        return [candidates[keep[i]] for i in selected]
+
+    @staticmethod
+    def _unit(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
@@ -1,5 +1,6 @@
-import requests
+import httpx
 import os
+from functools import cached_property
 
 
 class SarvamService:
@@ -7,8 +8,14 @@ class SarvamService:
         self.api_key = os.getenv("SARVAM_API_KEY")
         self.base_url = "https://api.sarvam.ai"
 
-    def text_to_speech(self, text: str):
-        url = f"{self.base_url}/text-to-speech"
+    @cached_property
+    def client(self) -> httpx.AsyncClient:
+        # One pooled async client per process, built on first use; requests
+        # share keep-alive connections
+        return httpx.AsyncClient(base_url=self.base_url, timeout=60.0)
+
+    async def text_to_speech(self, text: str):
+        url = "/text-to-speech"
         payload = {
             "inputs": [text],
             "target_language_code": "hi-IN",
@@ -26,7 +33,7 @@ class SarvamService:
         }
 
         try:
-            response = requests.post(url, json=payload, headers=headers)
+            response = await self.client.post(url, json=payload, headers=headers)
             response.raise_for_status()
 
             # Check if audios exists
@@ -39,8 +46,8 @@ class SarvamService:
         except Exception:
             return None
 
-    def speech_to_text(self, audio_file_content):
-        url = f"{self.base_url}/speech-to-text"
+    async def speech_to_text(self, audio_file_content):
+        url = "/speech-to-text"
 
         # Determine if it's a file path or bytes. Assuming bytes from UploadFile
         files = {"file": ("audio.webm", audio_file_content, "audio/webm")}
@@ -48,7 +55,9 @@ class SarvamService:
         headers = {"api-subscription-key": self.api_key}
 
         try:
-            response = requests.post(url, files=files, data=data, headers=headers)
+            response = await self.client.post(
+                url, files=files, data=data, headers=headers
+            )
             response.raise_for_status()
             return response.json()["transcript"]
         except Exception:
@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+from app.data.legal_mapping import IPC_BNS_MAPPING
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+SECTION_INDEX_PATH = os.environ.get(
+    "SECTION_INDEX_PATH", os.path.join(BASE_DIR, "data", "index", "sections.json")
+)
+
+# Short code -> phrase that identifies the act's file/metadata name
+ACT_ALIASES = {
+    "bns": "bharatiya nyaya sanhita",
+    "bnss": "bharatiya nagarik suraksha sanhita",
+    "bsa": "bharatiya sakshya adhiniyam",
+    "it": "information technology act",
+    "dpdp": "digital personal data protection",
+    "companies": "company_act",
+    "ibc": "insolvency_and_bankruptcy",
+    "llp": "liability",
+}
+
+ACT_PATTERN = (
+    r"bnss|bns|bsa|ipc|it\s+act|dpdp|companies\s+act|company\s+act|ibc|llp\s+act"
+)
+SECTION_NUMBER = r"(\d{1,3}[a-z]?)\b"
+
+# "BNS 318", "IPC Section 420", "BNSS s. 482"
+ACT_FIRST_PATTERN = re.compile(
+    rf"\b({ACT_PATTERN})\s*(?:section|sec\.?|s\.)?\s*{SECTION_NUMBER}",
+    re.IGNORECASE,
+)
+# "Section 318 of BNS", "section 66E of the IT Act"
+SECTION_FIRST_PATTERN = re.compile(
+    rf"\b(?:section|sec\.?|s\.)\s*{SECTION_NUMBER}\s*(?:of\s+)?(?:the\s+)?({ACT_PATTERN})\b",
+    re.IGNORECASE,
+)
+
+
+def act_code(act_name: str) -> str:
+    """Normalises an act name from chunk metadata (usually the file name)."""
+    name = os.path.splitext(str(act_name))[0].lower()
+    # Longest phrase first so "nagarik suraksha" (BNSS) is not read as BNS
+    for code, phrase in sorted(ACT_ALIASES.items(), key=lambda a: -len(a[1])):
+        if phrase in name:
+            return code
+    return " ".join(name.replace("_", " ").split())
+
+
+def _query_act_code(token: str) -> str:
+    token = " ".join(token.lower().split())
+    if token in ("companies act", "company act"):
+        return "companies"
+    if token == "it act":
+        return "it"
+    if token == "llp act":
+        return "llp"
+    return token
+
+
+def _ipc_to_bns(section: str) -> List[str]:
+    # Keyed by IPC section only: get_mapping() falls back to matching BNS
+    # numbers, which would turn "IPC 303" into BNS 303 (theft). Unmapped
+    # sections resolve to nothing and the query goes to normal retrieval.
+    mapping = IPC_BNS_MAPPING.get(section.upper())
+    if isinstance(mapping, str):
+        # Alias of another IPC section, e.g. "300" -> "302"
+        mapping = IPC_BNS_MAPPING.get(mapping)
+    if not mapping:
+        return []
+    # bns_section looks like "318", "101-102 (Def) / 103 (Pun)"
+    return re.findall(r"\d+[A-Z]?", str(mapping.get("bns_section", "")))
+
+
+def parse_section_references(query: str) -> List[tuple]:
+    """
+    Extracts (act code, section) pairs named in a query. IPC references are
+    translated to their BNS sections through the IPC -> BNS mapping.
+    """
+    matches = [(m.group(1), m.group(2)) for m in ACT_FIRST_PATTERN.finditer(query)]
+    matches += [(m.group(2), m.group(1)) for m in SECTION_FIRST_PATTERN.finditer(query)]
+
+    references = []
+    for act, section in matches:
+        code = _query_act_code(act)
+        section = section.upper()
+        targets = (
+            [("bns", s) for s in _ipc_to_bns(section)]
+            if code == "ipc"
+            else [(code, section)]
+        )
+        for target in targets:
+            if target not in references:
+                references.append(target)
+    return references
+
+
+class SectionIndex:
+    """
+    Precomputed (act, section) -> chunk lookup built at ingestion.
+
+    Lets queries that name a section ("BNS Section 318", "IPC 420") fetch the
+    exact statutory text by key instead of through similarity search. Chunks
+    are stored with their vector store IDs so answers cite the same sources.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._sections: Dict[str, List[str]] = {}
+        self._docs: Dict[str, Document] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str = SECTION_INDEX_PATH) -> "SectionIndex":
+        index = cls(path=path)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            index._sections = data["sections"]
+            index._docs = {
+                doc_id: Document(page_content=doc["text"], metadata=doc["metadata"])
+                for doc_id, doc in data["docs"].items()
+            }
+        return index
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                "sections": self._sections,
+                "docs": {
+                    doc_id: {"text": doc.page_content, "metadata": doc.metadata}
+                    for doc_id, doc in self._docs.items()
+                },
+            }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(self.path + ".tmp", self.path)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    @staticmethod
+    def key(act: str, section: str) -> str:
+        return f"{act_code(act)}:{str(section).strip().upper()}"
+
+    def add_documents(self, documents: Sequence[Document], ids: Sequence[str]):
+        with self._lock:
+            for doc_id, doc in zip(ids, documents):
+                act = doc.metadata.get("act")
+                section = doc.metadata.get("section")
+                if not act or not section or section in ("N/A", "Preamble"):
+                    continue
+                self._docs[doc_id] = Document(
+                    page_content=doc.page_content, metadata=dict(doc.metadata)
+                )
+                chunk_ids = self._sections.setdefault(self.key(act, section), [])
+                if doc_id not in chunk_ids:
+                    chunk_ids.append(doc_id)
+
+    def delete(self, ids: Sequence[str]):
+        removed = set(ids)
+        with self._lock:
+            for doc_id in removed:
+                self._docs.pop(doc_id, None)
+            for key in list(self._sections):
+                remaining = [i for i in self._sections[key] if i not in removed]
+                if remaining:
+                    self._sections[key] = remaining
+                else:
+                    del self._sections[key]
+
+    def lookup(
+        self, query: str, domain: Optional[str] = None, k: int = 5
+    ) -> List[Document]:
+        """Chunks for every section the query names, in the order named."""
+        results = []
+        for act, section in parse_section_references(query):
+            for doc_id in self._sections.get(f"{act}:{section}", []):
+                doc = self._docs.get(doc_id)
+                if doc is None or (domain and doc.metadata.get("domain") != domain):
+                    continue
+                results.append(
+                    Document(
+                        id=doc_id,
+                        page_content=doc.page_content,
+                        metadata=dict(doc.metadata),
+                    )
+                )
+                if len(results) == k:
+                    return results
+        return results
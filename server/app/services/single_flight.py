@@ -0,0 +1,73 @@
+import asyncio
+import copy
+import os
+from typing import Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent async calls.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still in flight await the same result instead of repeating the upstream
+    call. Followers get a deep copy so no caller can mutate another's result.
+    The shared call is cancelled only once every caller waiting on it has
+    been cancelled, and errors propagate to all of them. Nothing is cached:
+    the key is released as soon as the call finishes.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.calls = 0
+        self.shared = 0
+        self._calls: Dict[Hashable, _Call] = {}
+
+    @classmethod
+    def from_env(cls) -> "SingleFlight":
+        return cls(enabled=os.environ.get("SINGLE_FLIGHT", "true").lower() == "true")
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable]):
+        if not self.enabled:
+            return await fn()
+
+        call = self._calls.get(key)
+        leader = call is None
+        if leader:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._release(key, call))
+            self.calls += 1
+        else:
+            self.shared += 1
+
+        call.waiters += 1
+        try:
+            # Shielded so one caller going away does not cancel the others
+            result = await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self._release(key, call)
+                call.task.cancel()
+        return result if leader else copy.deepcopy(result)
+
+    def _release(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, float]:
+        requests = self.calls + self.shared
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.calls,
+            "coalesced": self.shared,
+            "coalesced_rate": self.shared / requests if requests else 0.0,
+        }
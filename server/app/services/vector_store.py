@@ -0,0 +1,107 @@
+import os
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from langchain_core.documents import Document
+
+if TYPE_CHECKING:
+    # Only annotations here; importing these pulls in langchain's runnables
+    from langchain_core.embeddings import Embeddings
+    from langchain_core.vectorstores import VectorStore
+
+load_dotenv()
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# "pinecone" (default) or "local" for the in-process index under data/index
+VECTOR_STORE_BACKEND = os.environ.get("VECTOR_STORE", "pinecone").lower()
+LOCAL_VECTOR_STORE_PATH = os.environ.get(
+    "LOCAL_VECTOR_STORE_PATH", os.path.join(BASE_DIR, "data", "index")
+)
+
+
+def build_vector_store(embedding: "Embeddings") -> "VectorStore":
+    """Vector store backend selected by the VECTOR_STORE environment variable."""
+    if VECTOR_STORE_BACKEND == "local":
+        from app.services.local_vector_store import LocalVectorStore
+
+        return LocalVectorStore(embedding=embedding, path=LOCAL_VECTOR_STORE_PATH)
+
+    from langchain_pinecone import PineconeVectorStore
+    from pinecone import Pinecone
+
+    pc = Pinecone(api_key=os.environ.get("PINECONE_API_KEY"))
+    index_name = os.environ.get("PINECONE_INDEX", "samvidhan")
+    return PineconeVectorStore(index=pc.Index(index_name), embedding=embedding)
+
+
+def search_with_vectors(
+    store: "VectorStore", embedding: List[float], k: int, filter: Optional[dict] = None
+) -> List[Tuple[Document, np.ndarray]]:
+    """Top-k Documents with their stored embeddings, for local reranking."""
+    if hasattr(store, "similarity_search_with_vectors"):
+        return store.similarity_search_with_vectors(embedding, k=k, filter=filter)
+
+    results = store.index.query(
+        vector=embedding,
+        top_k=k,
+        include_values=True,
+        include_metadata=True,
+        filter=filter,
+    )
+    hits = []
+    for match in results["matches"]:
+        metadata = dict(match["metadata"])
+        text = metadata.pop(store._text_key, None)
+        if text is None:
+            continue
+        hits.append(
+            (
+                Document(id=match["id"], page_content=text, metadata=metadata),
+                np.asarray(match["values"], dtype=np.float32),
+            )
+        )
+    return hits
+
+
+def fetch_vectors(store: "VectorStore", ids: List[str]) -> Dict[str, np.ndarray]:
+    """Stored embeddings by chunk ID; IDs missing from the index are omitted."""
+    if not ids:
+        return {}
+    if hasattr(store, "get_vectors"):
+        return store.get_vectors(ids)
+
+    fetched = store.index.fetch(ids=list(ids))
+    return {
+        doc_id: np.asarray(vector.values, dtype=np.float32)
+        for doc_id, vector in fetched.vectors.items()
+    }
+
+
+def upsert_vectors(
+    store: "VectorStore",
+    documents: List[Document],
+    vectors: List[List[float]],
+    ids: List[str],
+):
+    """Writes Documents with precomputed embeddings, replacing existing IDs."""
+    if hasattr(store, "add_vectors"):
+        store.add_vectors(
+            np.asarray(vectors, dtype=np.float32),
+            [doc.page_content for doc in documents],
+            [doc.metadata for doc in documents],
+            ids,
+        )
+        return
+
+    store.index.upsert(
+        vectors=[
+            {
+                "id": doc_id,
+                "values": [float(x) for x in vector],
+                "metadata": {**doc.metadata, store._text_key: doc.page_content},
+            }
+            for doc_id, doc, vector in zip(ids, documents, vectors)
+        ]
+    )
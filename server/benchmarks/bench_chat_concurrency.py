@@ -0,0 +1,158 @@
+"""
+Load benchmark for the /api/chat pipeline against stub upstreams.
+
+Groq, Mistral and Pinecone are replaced with in-process stubs that sleep for a
+fixed latency, so the numbers only reflect how the server schedules work.
+If concurrent chats overlap, wall-clock time for N parallel requests stays
+close to the latency of a single request instead of growing with N.
+
+Usage:
+    python benchmarks/bench_chat_concurrency.py [concurrency]
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Dummy credentials so the real clients can be constructed offline
+os.environ.setdefault("PINECONE_API_KEY", "bench")
+os.environ.setdefault("MISTRAL_API_KEY", "bench")
+os.environ.setdefault("GROQ_API_KEY", "bench")
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+# Throwaway database for chat-history rehydration
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(
+    tempfile.mkdtemp(), "bench.db"
+)
+
+LLM_LATENCY = 0.20
+EMBED_LATENCY = 0.05
+VECTOR_LATENCY = 0.03
+
+
+class StubIndex:
+    config = SimpleNamespace(host="stub", api_key="bench")
+
+
+class StubPinecone:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def Index(self, name):
+        return StubIndex()
+
+
+import pinecone  # noqa: E402
+
+pinecone.Pinecone = StubPinecone
+
+from app.database import Base, engine  # noqa: E402
+from app.routers.chat import chat, ChatRequest  # noqa: E402
+from app.services.rag_service import rag_service  # noqa: E402
+
+
+def _completion(content: str):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _reply_for(messages) -> str:
+    prompt = messages[-1]["content"]
+    if "ONE WORD" in prompt:
+        return "legal"
+    if "landmark" in prompt:
+        return json.dumps({"cases": ["Case A (x)", "Case B (y)", "Case C (z)"]})
+    return json.dumps(
+        {"law": "law", "examples": "examples", "simple_answer": "ok", "citations": []}
+    )
+
+
+class AsyncStubCompletions:
+    async def create(self, messages, **kwargs):
+        await asyncio.sleep(LLM_LATENCY)
+        return _completion(_reply_for(messages))
+
+
+class BlockingStubCompletions:
+    """Mimics the old synchronous Groq client called from an async route."""
+
+    async def create(self, messages, **kwargs):
+        time.sleep(LLM_LATENCY)
+        return _completion(_reply_for(messages))
+
+
+class StubEmbeddings:
+    async def aembed_query(self, text):
+        await asyncio.sleep(EMBED_LATENCY)
+        return [0.0] * 1024
+
+    async def aembed_documents(self, texts):
+        await asyncio.sleep(EMBED_LATENCY)
+        return [[0.0] * 1024 for _ in texts]
+
+    def embed_query(self, text):
+        time.sleep(EMBED_LATENCY)
+        return [0.0] * 1024
+
+
+class StubVectorStore:
+    def similarity_search_with_vectors(self, embedding, k=4, **kwargs):
+        time.sleep(VECTOR_LATENCY)
+        return []
+
+
+def install_stubs(completions):
+    rag_service.llm.primary.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+    rag_service.llm.secondary = None
+    rag_service.embeddings = StubEmbeddings()
+    rag_service.vector_store = StubVectorStore()
+
+
+async def run(concurrency: int) -> float:
+    requests = [
+        ChatRequest(message=f"What is Section {400 + i} IPC?", conversation_id=i)
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            # Bypass the answer cache so every request reaches the upstreams
+            chat(request, current_user=None, db=None, x_bypass_cache="1")
+            for request in requests
+        )
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    Base.metadata.create_all(bind=engine)
+
+    install_stubs(AsyncStubCompletions())
+    asyncio.run(run(1))
+    single = asyncio.run(run(1))
+    overlapped = asyncio.run(run(concurrency))
+
+    install_stubs(BlockingStubCompletions())
+    blocking = asyncio.run(run(concurrency))
+
+    # classify + embed + vector query + answer + related cases, back to back
+    serial = 3 * LLM_LATENCY + EMBED_LATENCY + VECTOR_LATENCY
+
+    print(f"Concurrency:                     {concurrency}")
+    print(f"Sum of upstream stage latencies: {serial * 1000:.0f} ms")
+    print(f"Single request latency:          {single * 1000:.0f} ms")
+    print(f"Async clients, {concurrency} concurrent:    {overlapped * 1000:.0f} ms")
+    print(f"Blocking clients, {concurrency} concurrent: {blocking * 1000:.0f} ms")
+    print(f"Throughput gain:                 {blocking / overlapped:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
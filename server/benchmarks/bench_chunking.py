@@ -0,0 +1,116 @@
+"""
+Chunkers compared on the bundled act PDFs: chunk count and size (what the
+embedding API is billed for), chunking throughput, and BM25 recall@k on
+data/retrieval_eval.jsonl (see bench_hybrid_retrieval.py for the relevance
+rule).
+
+The two chunkers ingestion used before chunking.chunk_statute (recursive
+900-character splits and "Section N" splits truncated at 8000 characters)
+are rebuilt here as baselines. Pages are extracted once up front, so
+chunks/s measures chunking alone.
+
+Usage:
+    python benchmarks/bench_chunking.py
+"""
+
+import glob
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document  # noqa: E402
+
+from app.services.bm25_index import BM25Index  # noqa: E402
+from app.services.chunking import chunk_statute  # noqa: E402
+from app.services.ingestion import read_pages  # noqa: E402
+from bench_hybrid_retrieval import (  # noqa: E402
+    EVAL_PATH,
+    FETCH_K,
+    K_VALUES,
+    SERVER_DIR,
+    is_relevant,
+    load_eval,
+)
+
+
+def recursive_900(pages, metadata):
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=900, chunk_overlap=10, separators=["\n\n", "\n", " ", ""]
+    )
+    return splitter.create_documents(pages, metadatas=[metadata] * len(pages))
+
+
+def section_truncated_8000(pages, metadata):
+    splits = re.split(r"(Section\s+\d+[A-Z]*)", "\n".join(pages))
+    chunks = [splits[0].strip()[:8000]] if splits[0].strip() else []
+    for i in range(1, len(splits), 2):
+        body = splits[i + 1] if i + 1 < len(splits) else ""
+        chunks.append(f"{splits[i]}\n{body}".strip()[:8000])
+    return [Document(page_content=text, metadata=metadata) for text in chunks]
+
+
+def statute(chunk_size, chunk_overlap):
+    return lambda pages, metadata: list(
+        chunk_statute(pages, metadata, chunk_size, chunk_overlap)
+    )
+
+
+CHUNKERS = [
+    ("recursive 900/10 (old)", recursive_900),
+    ("section, cut at 8000 (old)", section_truncated_8000),
+    ("statute 800/80", statute(800, 80)),
+    ("statute 1500/150", statute(1500, 150)),
+    ("statute 2500/250", statute(2500, 250)),
+    ("statute 4000/400", statute(4000, 400)),
+]
+
+
+def main():
+    cases = load_eval(EVAL_PATH)
+    acts = {
+        os.path.basename(path).replace(".pdf", ""): list(read_pages(path))
+        for path in glob.glob(
+            os.path.join(SERVER_DIR, "data", "acts", "**", "*.pdf"), recursive=True
+        )
+    }
+    pages = sum(len(act_pages) for act_pages in acts.values())
+    print(f"{len(acts)} acts, {pages} pages, {len(cases)} queries\n")
+    recall_header = "".join(f"{f'R@{k}':>7}" for k in K_VALUES)
+    print(
+        f"{'chunker':<28}{'chunks':>8}{'mean chars':>12}{'total chars':>13}"
+        f"{'chunks/s':>10}{recall_header}"
+    )
+
+    for name, chunker in CHUNKERS:
+        index = BM25Index()
+        chunks = 0
+        characters = 0
+        elapsed = 0.0
+        for act, act_pages in acts.items():
+            start = time.perf_counter()
+            docs = chunker(act_pages, {"act": act})
+            elapsed += time.perf_counter() - start
+            index.add_documents(docs, [f"{act}:{i}" for i in range(len(docs))])
+            chunks += len(docs)
+            characters += sum(len(doc.page_content) for doc in docs)
+
+        hits = {k: 0 for k in K_VALUES}
+        for case in cases:
+            results = index.search(case["query"], k=FETCH_K)
+            for k in K_VALUES:
+                if any(is_relevant(doc, case) for doc in results[:k]):
+                    hits[k] += 1
+        recall = "".join(f"{hits[k] / len(cases):>7.2f}" for k in K_VALUES)
+        print(
+            f"{name:<28}{chunks:>8}{characters // chunks:>12}{characters:>13}"
+            f"{chunks / elapsed:>10.0f}{recall}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Full index rebuild with and without the on-disk embedding cache: chunks sent
+to the embedding API and wall time for a cold build, then for a rebuild from
+an empty index (as after recreate_index_mistral.py) with the cache warm.
+Also times cache lookups for single queries and ingestion-sized batches.
+
+Uses the bundled act PDFs with the ingest.py defaults, a throwaway local
+vector store and cache directory, and a counting stub embedder that sleeps
+EMBED_LATENCY_MS per batch like a remote API call.
+
+Usage:
+    python benchmarks/bench_disk_embedding_cache.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+workdir = tempfile.mkdtemp()
+os.environ["VECTOR_STORE"] = "local"
+os.environ["LOCAL_VECTOR_STORE_PATH"] = os.path.join(workdir, "vectors")
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from app.services.bm25_index import BM25Index  # noqa: E402
+from app.services.disk_embedding_cache import DiskEmbeddingCache  # noqa: E402
+from app.services.ingestion import IngestManifest, IngestionPipeline  # noqa: E402
+from app.services.section_index import SectionIndex  # noqa: E402
+from app.services.vector_store import build_vector_store  # noqa: E402
+from ingest import list_sources, pipeline_name, source_metadata  # noqa: E402
+
+EMBED_LATENCY_MS = float(os.environ.get("EMBED_LATENCY_MS", "200"))
+DIM = 1024
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.texts = 0
+
+    def embed_documents(self, texts):
+        time.sleep(EMBED_LATENCY_MS / 1000)
+        self.texts += len(texts)
+        return [[float(len(text) % 7)] + [0.5] * (DIM - 1) for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def build(embeddings, cache):
+    """One full ingest into an empty index; returns (wall seconds, stats)."""
+    shutil.rmtree(os.path.join(workdir, "vectors"), ignore_errors=True)
+    for name in ("bm25.json", "sections.json", "manifest.json"):
+        if os.path.exists(os.path.join(workdir, name)):
+            os.remove(os.path.join(workdir, name))
+    pipeline = IngestionPipeline.from_env(
+        IngestManifest.load(
+            os.path.join(workdir, "manifest.json"),
+            pipeline_name("mistral"),
+        ),
+        embeddings,
+        build_vector_store(embeddings),
+        BM25Index.load(os.path.join(workdir, "bm25.json")),
+        SectionIndex.load(os.path.join(workdir, "sections.json")),
+        metadata_for=source_metadata,
+        embed_rate_limit=0,
+        embedding_cache=cache,
+    )
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    start = time.perf_counter()
+    try:
+        pipeline.run(list_sources())
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return time.perf_counter() - start, pipeline.throughput()["embed"]
+
+
+def main():
+    cache_dir = os.path.join(workdir, "embeddings")
+    print(f"{EMBED_LATENCY_MS:.0f} ms per embedding request, {DIM}-d vectors")
+    print(f"{'run':<32}{'sent to API':>12}{'cached':>9}{'embed busy':>12}{'wall':>9}")
+    for label, use_cache in (
+        ("no cache", False),
+        ("cold cache", True),
+        ("rebuild, warm cache", True),
+    ):
+        embeddings = CountingEmbeddings()
+        cache = DiskEmbeddingCache(cache_dir, "mistral-embed") if use_cache else None
+        elapsed, embed = build(embeddings, cache)
+        print(
+            f"{label:<32}{embeddings.texts:>12}{embed.get('cached', 0):>9}"
+            f"{embed['busy_s']:>11.1f}s{elapsed:>8.1f}s"
+        )
+
+    # Fresh instance: what a restarted API server sees
+    cache = DiskEmbeddingCache(cache_dir, "mistral-embed")
+    bm25_index = BM25Index.load(os.path.join(workdir, "bm25.json"))
+    texts = [doc.page_content for doc in list(bm25_index._docs.values())[:1000]]
+    start = time.perf_counter()
+    for text in texts:
+        cache.get_many([text])
+    single = (time.perf_counter() - start) / len(texts)
+    start = time.perf_counter()
+    for i in range(0, len(texts), 100):
+        cache.get_many(texts[i : i + 100])
+    batched = (time.perf_counter() - start) / (len(texts) / 100)
+    start = time.perf_counter()
+    DiskEmbeddingCache(cache_dir, "mistral-embed")
+    opened = time.perf_counter() - start
+    print(
+        f"{len(cache)} cached vectors: open {opened * 1000:.1f} ms, "
+        f"single lookup {single * 1e6:.0f} us, batch of 100 {batched * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
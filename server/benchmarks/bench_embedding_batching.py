@@ -0,0 +1,82 @@
+"""
+Query embedding throughput with and without micro-batching.
+
+The embedding API is replaced by a stub that, like a rate-limited upstream,
+serves a few requests at a time with a fixed per-request latency plus a small
+per-text cost. Distinct queries arrive at a steady rate and are embedded either
+one request each or through the EmbeddingBatcher. No network or API keys are needed.
+
+Usage:
+    python benchmarks/bench_embedding_batching.py [queries] [arrival_rate_per_s]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.embedding_batcher import EmbeddingBatcher  # noqa: E402
+
+REQUEST_LATENCY = 0.05
+PER_TEXT_LATENCY = 0.001
+MAX_CONCURRENT_REQUESTS = 4
+
+
+class StubEmbeddingAPI:
+    def __init__(self):
+        self.requests = 0
+        self._slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def embed(self, texts):
+        async with self._slots:
+            self.requests += 1
+            await asyncio.sleep(REQUEST_LATENCY + PER_TEXT_LATENCY * len(texts))
+            return [[float(len(text))] * 8 for text in texts]
+
+
+async def run(embed, queries: int, rate: float):
+    latencies = []
+
+    async def one(i):
+        await asyncio.sleep(i / rate)
+        start = time.perf_counter()
+        await embed(f"query number {i}")
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(queries)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return queries / elapsed, latencies[len(latencies) // 2] * 1000
+
+
+async def main():
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 400
+
+    api = StubEmbeddingAPI()
+    unbatched = await run(lambda text: api.embed([text]), queries, rate)
+    unbatched_requests = api.requests
+
+    api = StubEmbeddingAPI()
+    batcher = EmbeddingBatcher(api.embed)
+    batched = await run(batcher.embed, queries, rate)
+    stats = batcher.stats()
+
+    print(f"{queries} queries arriving at {rate:.0f}/s")
+    print(f"{'mode':<12}{'requests':>9}{'queries/s':>11}{'p50':>9}")
+    print(
+        f"{'unbatched':<12}{unbatched_requests:>9}{unbatched[0]:>11.0f}"
+        f"{unbatched[1]:>7.0f}ms"
+    )
+    print(f"{'batched':<12}{api.requests:>9}{batched[0]:>11.0f}{batched[1]:>7.0f}ms")
+    print(
+        f"Mean batch size {stats['mean_batch_size']:.1f}, "
+        f"fill ratio {stats['fill_ratio']:.2f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
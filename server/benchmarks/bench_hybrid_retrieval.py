@@ -0,0 +1,139 @@
+"""
+Recall@k and latency of BM25, vector and hybrid (reciprocal rank fusion)
+retrieval over the statute corpus.
+
+Each line of data/retrieval_eval.jsonl names a query, the act it should be
+answered from and a phrase the relevant chunk contains; a query counts as a
+hit at k when any of the top-k chunks is from that act and contains the
+phrase.
+
+The corpus is the BM25 index written by ingest.py / ingest_mistral.py (same
+chunk IDs as the vector store). Without one, the PDFs under data/acts are
+chunked on the fly and only BM25 is measured. Vector and hybrid modes need
+MISTRAL_API_KEY plus the configured vector store; query embeddings are
+computed up front so the latencies compare retrieval alone.
+
+Usage:
+    python benchmarks/bench_hybrid_retrieval.py [eval.jsonl]
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.bm25_index import (  # noqa: E402
+    BM25Index,
+    BM25_INDEX_PATH,
+    reciprocal_rank_fusion,
+)
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_DIR = os.path.dirname(BENCH_DIR)
+EVAL_PATH = os.path.join(BENCH_DIR, "data", "retrieval_eval.jsonl")
+K_VALUES = (1, 3, 5)
+FETCH_K = max(K_VALUES)
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def load_eval(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build_corpus_from_pdfs():
+    from app.services.chunking import chunk_statute
+    from app.services.ingestion import read_pages
+
+    index = BM25Index()
+    for pdf_path in glob.glob(
+        os.path.join(SERVER_DIR, "data", "acts", "**", "*.pdf"), recursive=True
+    ):
+        act = os.path.basename(pdf_path).replace(".pdf", "")
+        chunks = list(chunk_statute(read_pages(pdf_path), {"act": act}))
+        index.add_documents(chunks, [f"{act}:{i}" for i in range(len(chunks))])
+    return index
+
+
+def is_relevant(doc, case):
+    return case["act"].lower() in str(doc.metadata.get("act", "")).lower() and (
+        normalize(case["match"]) in normalize(doc.page_content)
+    )
+
+
+def evaluate(name, cases, search):
+    hits = {k: 0 for k in K_VALUES}
+    latencies = []
+    for case in cases:
+        start = time.perf_counter()
+        results = search(case)
+        latencies.append((time.perf_counter() - start) * 1000)
+        for k in K_VALUES:
+            if any(is_relevant(doc, case) for doc in results[:k]):
+                hits[k] += 1
+
+    latencies.sort()
+    recall = "  ".join(f"R@{k}={hits[k] / len(cases):.2f}" for k in K_VALUES)
+    print(
+        f"{name:<8} {recall}  "
+        f"p50={latencies[len(latencies) // 2]:.2f} ms  max={latencies[-1]:.2f} ms"
+    )
+
+
+def main():
+    cases = load_eval(sys.argv[1] if len(sys.argv) > 1 else EVAL_PATH)
+
+    index = BM25Index.load(BM25_INDEX_PATH)
+    from_ingest = len(index) > 0
+    if not from_ingest:
+        print("No BM25 index found; chunking data/acts PDFs (BM25 only)...")
+        start = time.perf_counter()
+        index = build_corpus_from_pdfs()
+        print(f"Built in {time.perf_counter() - start:.1f} s")
+    print(f"Corpus: {len(index)} chunks, {len(cases)} queries\n")
+
+    evaluate("bm25", cases, lambda case: index.search(case["query"], k=FETCH_K))
+
+    if not from_ingest or not os.environ.get("MISTRAL_API_KEY"):
+        print(
+            "\nSkipping vector and hybrid: needs an ingested index and MISTRAL_API_KEY"
+        )
+        return
+
+    from langchain_mistralai import MistralAIEmbeddings
+
+    from app.services.vector_store import build_vector_store
+
+    embeddings = MistralAIEmbeddings(
+        model="mistral-embed", api_key=os.environ.get("MISTRAL_API_KEY")
+    )
+    vector_store = build_vector_store(embeddings)
+    vectors = {
+        case["query"]: vector
+        for case, vector in zip(
+            cases, embeddings.embed_documents([case["query"] for case in cases])
+        )
+    }
+
+    def vector_search(case):
+        return vector_store.similarity_search_by_vector(
+            vectors[case["query"]], k=FETCH_K
+        )
+
+    def hybrid_search(case):
+        return reciprocal_rank_fusion(
+            [vector_search(case), index.search(case["query"], k=FETCH_K)]
+        )[:FETCH_K]
+
+    evaluate("vector", cases, vector_search)
+    evaluate("hybrid", cases, hybrid_search)
+
+
+if __name__ == "__main__":
+    main()
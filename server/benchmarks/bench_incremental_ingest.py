@@ -0,0 +1,116 @@
+"""
+Incremental ingestion cost: chunks embedded and wall time for a full run,
+a no-op re-run, and runs where one act is removed and then restored, plus
+per-stage throughput (pages/s, chunks/s, vectors/s) of the full run.
+
+Uses the bundled act PDFs with the ingest.py defaults, a throwaway local
+vector store and a counting stub embedder that sleeps EMBED_LATENCY_MS per
+batch like a remote API call, so no API keys are needed.
+
+Usage:
+    python benchmarks/bench_incremental_ingest.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+workdir = tempfile.mkdtemp()
+os.environ["VECTOR_STORE"] = "local"
+os.environ["LOCAL_VECTOR_STORE_PATH"] = os.path.join(workdir, "vectors")
+
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+from app.services.bm25_index import BM25Index  # noqa: E402
+from app.services.ingestion import IngestManifest, IngestionPipeline  # noqa: E402
+from app.services.section_index import SectionIndex  # noqa: E402
+from app.services.vector_store import build_vector_store  # noqa: E402
+from ingest import list_sources, pipeline_name, source_metadata  # noqa: E402
+
+EMBED_LATENCY_MS = float(os.environ.get("EMBED_LATENCY_MS", "200"))
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.texts = 0
+
+    def embed_documents(self, texts):
+        time.sleep(EMBED_LATENCY_MS / 1000)
+        self.texts += len(texts)
+        return [[1.0] + [0.0] * 15 for _ in texts]
+
+    def embed_query(self, text):
+        return [1.0] + [0.0] * 15
+
+
+def main():
+    embeddings = CountingEmbeddings()
+    vector_store = build_vector_store(embeddings)
+    bm25_index = BM25Index.load(os.path.join(workdir, "bm25.json"))
+    section_index = SectionIndex.load(os.path.join(workdir, "sections.json"))
+    manifest = IngestManifest.load(
+        os.path.join(workdir, "manifest.json"),
+        pipeline_name("mistral"),
+    )
+    pipeline = IngestionPipeline.from_env(
+        manifest,
+        embeddings,
+        vector_store,
+        bm25_index,
+        section_index,
+        metadata_for=source_metadata,
+        embed_rate_limit=0,
+    )
+
+    sources = list_sources()
+    removed = sorted(sources)[0]
+    scenarios = [
+        ("full ingest", sources),
+        ("no changes", sources),
+        (
+            f"remove {os.path.basename(removed)}",
+            {name: path for name, path in sources.items() if name != removed},
+        ),
+        ("restore it", sources),
+    ]
+
+    print(
+        f"{len(sources)} PDFs, {pipeline.parse_workers} parse workers, "
+        f"{pipeline.embed_concurrency} embed workers, {EMBED_LATENCY_MS:.0f} ms/batch"
+    )
+    print(f"{'run':<45}{'embedded':>9}{'deleted':>9}{'vectors':>9}{'wall':>9}")
+    throughput = None
+    for label, run_sources in scenarios:
+        embedded_before = embeddings.texts
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        start = time.perf_counter()
+        try:
+            stats = pipeline.run(run_sources)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<45}{embeddings.texts - embedded_before:>9}"
+            f"{stats['chunks_deleted']:>9}{len(vector_store):>9}{elapsed:>8.1f}s"
+        )
+        throughput = throughput or pipeline.throughput()
+
+    print("Full ingest by stage")
+    for stage, report in throughput.items():
+        rates = "  ".join(
+            f"{value:>8} {unit[: -len('_per_s')]}/s"
+            for unit, value in report.items()
+            if unit.endswith("_per_s")
+        )
+        print(
+            f"  {stage:<8}{rates:<40}active {report['active_s']:>6.1f}s  "
+            f"busy {report['busy_s']:>6.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
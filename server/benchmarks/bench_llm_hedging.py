@@ -0,0 +1,79 @@
+"""
+Checks the hedge delay when one task is called both streamed and not.
+
+"legal_answer" is streamed by /api/chat/stream, where a call returns at the
+response headers, and called plainly by /api/chat, where it returns after the
+whole generation. Stub backends answer streamed calls in STREAM_SECONDS and
+plain calls in FULL_SECONDS. After warming the primary with both, a streamed
+call whose headers are slow should be hedged to the secondary near the
+streamed p95, not wait out the p95 of full generations. The check fails if
+the two modes share one latency window.
+
+Usage:
+    python benchmarks/bench_llm_hedging.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.llm_client import ChatBackend, LLMClient  # noqa: E402
+
+TASK = "legal_answer"
+STREAM_SECONDS = 0.02
+FULL_SECONDS = 0.5
+SLOW_STREAM_SECONDS = 2.0
+WARM_CALLS = 40
+
+
+class StubCompletions:
+    def __init__(self, name: str):
+        self.name = name
+        self.slow_stream = False
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    async def create(self, stream: bool = False, **kwargs):
+        self.calls += 1
+        if stream:
+            await asyncio.sleep(
+                SLOW_STREAM_SECONDS if self.slow_stream else STREAM_SECONDS
+            )
+        else:
+            await asyncio.sleep(FULL_SECONDS)
+        return self.name
+
+
+async def main():
+    primary_client = StubCompletions("primary")
+    secondary_client = StubCompletions("secondary")
+    client = LLMClient(
+        ChatBackend("primary", lambda: primary_client),
+        ChatBackend("secondary", lambda: secondary_client),
+    )
+    messages = [{"role": "user", "content": "What is Section 318 BNS?"}]
+
+    # Alternate the modes as the two chat endpoints would
+    for i in range(WARM_CALLS):
+        await client.complete(TASK, messages, stream=i % 2 == 0)
+    streamed_p95 = client.primary.p95(TASK, stream=True)
+    full_p95 = client.primary.p95(TASK)
+    print(f"primary p95: streamed {streamed_p95:.3f}s, full {full_p95:.3f}s")
+
+    primary_client.slow_stream = True
+    secondary_client.calls = 0
+    start = time.perf_counter()
+    winner = await client.complete(TASK, messages, stream=True)
+    elapsed = time.perf_counter() - start
+    print(f"slow streamed call answered by {winner} in {elapsed:.3f}s")
+
+    if secondary_client.calls != 1 or elapsed >= FULL_SECONDS:
+        sys.exit("FAIL: the streamed call was hedged on the p95 of full generations")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""
+Latency benchmark for the in-process LocalVectorStore.
+
+Builds a throwaway index of random unit vectors sized like the statute corpus
+and measures single-query and batched top-k search, with and without the
+domain filter. No network or API keys are needed.
+
+Usage:
+    python benchmarks/bench_local_vector_store.py [n_chunks] [dim]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.local_vector_store import LocalVectorStore  # noqa: E402
+
+DOMAINS = ["Criminal Law", "Corporate & Commercial Law", "Cyber & IT Law"]
+
+
+def timed(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    n_chunks = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    dim = int(sys.argv[2]) if len(sys.argv) > 2 else 1024
+    rng = np.random.default_rng(0)
+
+    store = LocalVectorStore(embedding=None, path=tempfile.mkdtemp())
+    vectors = rng.standard_normal((n_chunks, dim)).astype(np.float32)
+    start = time.perf_counter()
+    store.add_vectors(
+        vectors,
+        texts=[f"chunk {i}" for i in range(n_chunks)],
+        metadatas=[{"domain": DOMAINS[i % len(DOMAINS)]} for i in range(n_chunks)],
+        ids=[str(i) for i in range(n_chunks)],
+    )
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Reopen from disk so searches run against the memory-mapped matrix
+    store = LocalVectorStore(embedding=None, path=store.path)
+    query = rng.standard_normal(dim).tolist()
+    batch = rng.standard_normal((32, dim)).tolist()
+
+    print(f"Index: {n_chunks} chunks x {dim} dims (built in {build_ms:.0f} ms)")
+    print(
+        f"top-5, no filter:       "
+        f"{timed(lambda: store.similarity_search_by_vector(query, k=5), 200):.3f} ms"
+    )
+    print(
+        f"top-5, domain filter:   "
+        f"{timed(lambda: store.similarity_search_by_vector(query, k=5, filter={'domain': DOMAINS[0]}), 200):.3f} ms"
+    )
+    batch_ms = timed(lambda: store.batch_similarity_search_by_vector(batch, k=5), 20)
+    print(f"top-5, batch of 32:     {batch_ms:.3f} ms ({batch_ms / 32:.3f} ms/query)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Latency of each LLM-backed task with the model routing table versus sending
+everything to the large model.
+
+Runs the real service methods against Groq, so GROQ_API_KEY is required. Each
+task is called ``rounds`` times per configuration and the p50 latency is reported
+with the delta the routing table buys:
+
+    classify       -> /api/chat classification step
+    casual         -> /api/chat casual reply
+    related_cases  -> related judgments on /api/chat and /api/search
+    compare        -> /api/compare LLM fallback for unmapped sections
+
+Usage:
+    python benchmarks/bench_model_routing.py [rounds]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Retrieval is not exercised: an empty local index and a dummy embedding key
+# let the service be constructed offline
+os.environ["VECTOR_STORE"] = "local"
+os.environ["LOCAL_VECTOR_STORE_PATH"] = tempfile.mkdtemp()
+os.environ.setdefault("MISTRAL_API_KEY", "bench")
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+if not os.environ.get("GROQ_API_KEY"):
+    sys.exit("GROQ_API_KEY is required: this benchmark calls the real models")
+
+from app.database import Base, engine  # noqa: E402
+from app.models import conversation, user  # noqa: E402,F401
+from app.models.schemas import CompareRequest  # noqa: E402
+from app.routers.compare import compare_laws  # noqa: E402
+from app.services.model_routes import (  # noqa: E402
+    LARGE_MODEL,
+    MODEL_ROUTES,
+    ModelRoute,
+)
+from app.services.rag_service import rag_service  # noqa: E402
+
+Base.metadata.create_all(bind=engine)
+
+TASKS = {
+    "classify": lambda i: rag_service.classify_query_llm(
+        f"My landlord kept my deposit, what can I do? ({i})"
+    ),
+    "casual": lambda i: rag_service.generate_answer(
+        "Hi there, thanks for the help!",
+        [],
+        session_id=f"bench-casual-{i}",
+        query_type="casual",
+    ),
+    "related_cases": lambda i: rag_service.find_related_cases(
+        "right to privacy and phone tapping"
+    ),
+    "compare": lambda i: compare_laws(CompareRequest(ipc_section="498A")),
+}
+
+
+async def measure(task, rounds):
+    latencies = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        await TASKS[task](i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return latencies[len(latencies) // 2]
+
+
+async def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    routed = dict(MODEL_ROUTES)
+    all_large = {
+        task: ModelRoute(
+            LARGE_MODEL, route.max_tokens, route.timeout, route.secondary_model
+        )
+        for task, route in routed.items()
+    }
+
+    print(f"{'task':<15}{'model':<28}{'large p50':>11}{'routed p50':>12}{'delta':>9}")
+    for task in TASKS:
+        MODEL_ROUTES.update(all_large)
+        large_p50 = await measure(task, rounds)
+        MODEL_ROUTES.update(routed)
+        routed_p50 = await measure(task, rounds)
+        print(
+            f"{task:<15}{routed[task].model:<28}{large_p50:>9.0f}ms"
+            f"{routed_p50:>10.0f}ms{routed_p50 - large_p50:>+7.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
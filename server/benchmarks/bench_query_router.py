@@ -0,0 +1,110 @@
+"""
+Accuracy and latency benchmark for the local query router.
+
+Evaluates app.services.query_router against the labelled set in
+benchmarks/data/query_router_eval.jsonl. With --llm it also runs the
+original Groq classification prompt on the same set (needs GROQ_API_KEY)
+and reports the latency saved per request.
+
+Usage:
+    python benchmarks/bench_query_router.py [--llm] [--train]
+
+--train rebuilds the bundled naive Bayes model from
+benchmarks/data/query_router_train.jsonl before evaluating.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.query_router import (  # noqa: E402
+    MODEL_PATH,
+    NaiveBayesModel,
+    QueryRouter,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+MIN_CONFIDENCE = float(os.environ.get("QUERY_ROUTER_MIN_CONFIDENCE", "0.8"))
+
+
+def load_samples(name):
+    with open(os.path.join(DATA_DIR, name), "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate_router(router, samples):
+    correct = confident = confident_correct = 0
+    start = time.perf_counter()
+    for sample in samples:
+        label, confidence = router.classify(sample["query"])
+        correct += label == sample["label"]
+        if confidence >= MIN_CONFIDENCE:
+            confident += 1
+            confident_correct += label == sample["label"]
+    elapsed = time.perf_counter() - start
+    return {
+        "accuracy": correct / len(samples),
+        "coverage": confident / len(samples),
+        "confident_accuracy": confident_correct / confident if confident else 0.0,
+        "latency_us": elapsed / len(samples) * 1e6,
+    }
+
+
+async def evaluate_llm(samples):
+    from app.services.rag_service import rag_service
+
+    correct = 0
+    latencies = []
+    for sample in samples:
+        start = time.perf_counter()
+        label = await rag_service.classify_query_llm(sample["query"])
+        latencies.append(time.perf_counter() - start)
+        correct += label == sample["label"]
+    latencies.sort()
+    return {
+        "accuracy": correct / len(samples),
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+    }
+
+
+def main():
+    if "--train" in sys.argv:
+        training = load_samples("query_router_train.jsonl")
+        model = NaiveBayesModel.fit([(s["query"], s["label"]) for s in training])
+        model.save(MODEL_PATH)
+        print(f"Trained model on {len(training)} samples -> {MODEL_PATH}")
+
+    samples = load_samples("query_router_eval.jsonl")
+    print(f"Evaluation set: {len(samples)} labelled queries")
+    print(f"Confidence threshold: {MIN_CONFIDENCE}\n")
+
+    for name, router in [
+        ("rules only", QueryRouter()),
+        ("rules + model", QueryRouter.from_env()),
+    ]:
+        r = evaluate_router(router, samples)
+        print(
+            f"{name:<14} accuracy={r['accuracy']:.1%}  "
+            f"answered locally={r['coverage']:.1%} "
+            f"(accuracy {r['confident_accuracy']:.1%})  "
+            f"latency={r['latency_us']:.1f} us/query"
+        )
+
+    if "--llm" in sys.argv:
+        llm = asyncio.run(evaluate_llm(samples))
+        local = evaluate_router(QueryRouter.from_env(), samples)
+        saved_ms = llm["mean_ms"] * local["coverage"] - local["latency_us"] / 1000
+        print(
+            f"\n{'LLM prompt':<14} accuracy={llm['accuracy']:.1%}  "
+            f"p50={llm['p50_ms']:.0f} ms  mean={llm['mean_ms']:.0f} ms"
+        )
+        print(f"Mean latency saved per request: {saved_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
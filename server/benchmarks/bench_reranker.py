@@ -0,0 +1,95 @@
+"""
+Checks that hybrid retrieval survives reranking and times ContextReranker.
+
+Builds a synthetic fused candidate list the way retrieve_context does: dense
+hits close to the query and a BM25-only chunk for an exact section ("Section
+318") that the dense model scores well below them. The check fails if that
+chunk is cut from the reranked context, as happens when relevance is query
+similarity alone (RERANK_RANK_WEIGHT=0). A second list, two close dense hits
+followed by weakly related filler, fails if the filler is not dropped by the
+score margin.
+
+Usage:
+    python benchmarks/bench_reranker.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.documents import Document  # noqa: E402
+
+from app.services.bm25_index import reciprocal_rank_fusion  # noqa: E402
+from app.services.reranker import ContextReranker  # noqa: E402
+
+DIM = 1024
+FETCH_K = 20
+K = 5
+RUNS = 1000
+
+
+def near(query, similarity, rng):
+    """A unit vector with the given cosine similarity to the unit query."""
+    noise = rng.standard_normal(DIM)
+    noise -= (noise @ query) * query
+    noise /= np.linalg.norm(noise)
+    return similarity * query + np.sqrt(1 - similarity**2) * noise
+
+
+def main():
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(DIM)
+    query /= np.linalg.norm(query)
+
+    dense, vectors = [], {}
+    for i in range(FETCH_K):
+        doc = Document(
+            id=f"dense-{i}",
+            page_content=f"cheating and dishonest inducement, passage {i}",
+            metadata={"act": f"Act {i % 8}"},
+        )
+        dense.append(doc)
+        vectors[doc.id] = near(query, 0.85 - 0.005 * i, rng)
+
+    exact = Document(
+        id="bm25-318",
+        page_content="318. Cheating.-(1) Whoever, by deceiving any person...",
+        metadata={"act": "Bharatiya Nyaya Sanhita", "section": "318"},
+    )
+    vectors[exact.id] = near(query, 0.6, rng)
+    candidates = reciprocal_rank_fusion([dense, [exact]])
+
+    reranker = ContextReranker.from_env()
+    results = reranker.rerank(query.tolist(), candidates, vectors, K, {exact.id})
+    position = (
+        [doc.id for doc in results].index(exact.id) + 1 if exact in results else None
+    )
+    print(
+        f"BM25-only exact section: fused rank {candidates.index(exact) + 1}, "
+        f"reranked position {position} of {len(results)}"
+    )
+    if position is None:
+        sys.exit("FAIL: the lexical hit was dropped by the reranker")
+
+    filler = dense[:2] + dense[FETCH_K - 8 :]
+    filler_vectors = {doc.id: vectors[doc.id] for doc in dense[:2]}
+    for doc in dense[FETCH_K - 8 :]:
+        filler_vectors[doc.id] = near(query, 0.3, rng)
+    kept = reranker.rerank(query.tolist(), filler, filler_vectors, K)
+    print(f"Two relevant hits and {len(filler) - 2} filler: kept {len(kept)} of {K}")
+    if len(kept) > 2:
+        sys.exit("FAIL: low-relevance filler was not dropped")
+
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        reranker.rerank(query.tolist(), candidates, vectors, K, {exact.id})
+    elapsed = (time.perf_counter() - start) / RUNS
+    print(f"rerank {len(candidates)} -> {K}: {elapsed * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
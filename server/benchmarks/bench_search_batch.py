@@ -0,0 +1,78 @@
+"""
+Bulk retrieval through /api/search/batch versus one /api/search-style
+retrieval per query, as analysts' bulk jobs did before.
+
+Reuses the stub upstreams from bench_chat_concurrency and counts embedding
+requests. Queries are distinct so neither path is helped by caching.
+
+Usage:
+    python benchmarks/bench_search_batch.py [queries]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_chat_concurrency import (  # noqa: E402
+    AsyncStubCompletions,
+    StubEmbeddings,
+    install_stubs,
+    rag_service,
+)
+
+embed_requests = 0
+
+
+class CountingEmbeddings(StubEmbeddings):
+    async def aembed_query(self, text):
+        global embed_requests
+        embed_requests += 1
+        return await super().aembed_query(text)
+
+    async def aembed_documents(self, texts):
+        global embed_requests
+        embed_requests += 1
+        return await super().aembed_documents(texts)
+
+
+async def one_by_one(queries):
+    for query in queries:
+        await rag_service.retrieve_context(query)
+
+
+async def batched(queries):
+    async for _ in rag_service.search_batch([(query, None) for query in queries]):
+        pass
+
+
+def measure(run, queries):
+    global embed_requests
+    rag_service.embedding_cache._entries.clear()
+    embed_requests = 0
+    start = time.perf_counter()
+    asyncio.run(run(queries))
+    return time.perf_counter() - start, embed_requests
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    install_stubs(AsyncStubCompletions())
+    rag_service.embeddings = CountingEmbeddings()
+
+    queries = [f"FIR description {i}: accused took a phone by force" for i in range(n)]
+    serial, serial_requests = measure(one_by_one, queries)
+    batch, batch_requests = measure(batched, queries)
+
+    print(f"{n} queries")
+    print(f"{'mode':<14}{'embed requests':>15}{'wall':>10}{'queries/s':>11}")
+    print(
+        f"{'one by one':<14}{serial_requests:>15}{serial * 1000:>8.0f}ms{n / serial:>11.0f}"
+    )
+    print(f"{'batch':<14}{batch_requests:>15}{batch * 1000:>8.0f}ms{n / batch:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+/api/search latency through the stateless search path versus the chat
+pipeline it used before (classification, shared "default" session history and
+the full legal prompt).
+
+Reuses the stub upstreams from bench_chat_concurrency, so the difference comes
+from the stages each path runs and the prompt sizes. The queries are phrased so
+the local router is unsure and the old path calls the LLM classifier.
+
+Usage:
+    python benchmarks/bench_search_fast_path.py [searches]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_chat_concurrency import (  # noqa: E402
+    AsyncStubCompletions,
+    install_stubs,
+    rag_service,
+)
+from app.services.history_store import history_store  # noqa: E402
+
+
+async def measure(search, n: int):
+    latencies = []
+    for i in range(n):
+        start = time.perf_counter()
+        await search(f"my neighbour keeps parking in front of my gate {i}")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+async def chat_path(query):
+    await rag_service.answer_query(query=query, use_cache=False)
+
+
+async def search_path(query):
+    await rag_service.search_query(query=query, use_cache=False)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    install_stubs(AsyncStubCompletions())
+    rag_service.single_flight.enabled = False
+
+    print(f"{n} sequential searches")
+    print(f"{'path':<16}{'p50':>8}{'shared history':>16}")
+    for name, search in (("chat pipeline", chat_path), ("search path", search_path)):
+        history_store.clear("default")
+        p50 = asyncio.run(measure(search, n))
+        # Messages every anonymous searcher would now see in their prompt
+        shared = len(asyncio.run(history_store.get_messages("default")))
+        print(f"{name:<16}{p50:>6.0f}ms{shared:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Upstream calls made by a burst of identical /api/chat questions, with request
+coalescing (single-flight) on and off.
+
+Reuses the stub upstreams from bench_chat_concurrency, wrapped to count every
+LLM and embedding call. Each request in the burst uses its own conversation,
+as when a topic trends across many users.
+
+Usage:
+    python benchmarks/bench_single_flight.py [burst_size]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from bench_chat_concurrency import (  # noqa: E402
+    AsyncStubCompletions,
+    StubEmbeddings,
+    StubVectorStore,
+    chat,
+    ChatRequest,
+    rag_service,
+    Base,
+    engine,
+)
+
+calls = Counter()
+
+
+class CountingCompletions(AsyncStubCompletions):
+    async def create(self, messages, **kwargs):
+        calls["llm"] += 1
+        return await super().create(messages, **kwargs)
+
+
+class CountingEmbeddings(StubEmbeddings):
+    async def aembed_query(self, text):
+        calls["embed"] += 1
+        return await super().aembed_query(text)
+
+    async def aembed_documents(self, texts):
+        calls["embed"] += 1
+        return await super().aembed_documents(texts)
+
+
+class CountingVectorStore(StubVectorStore):
+    def similarity_search_with_vectors(self, embedding, k=4, **kwargs):
+        calls["vector"] += 1
+        return super().similarity_search_with_vectors(embedding, k, **kwargs)
+
+
+async def burst(size: int, offset: int) -> float:
+    requests = [
+        # Below the local router's confidence so classification hits the LLM
+        ChatRequest(
+            message="can my landlord keep my deposit", conversation_id=offset + i
+        )
+        for i in range(size)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            chat(request, current_user=None, db=None, x_bypass_cache="1")
+            for request in requests
+        )
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    Base.metadata.create_all(bind=engine)
+
+    rag_service.llm.primary.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=CountingCompletions())
+    )
+    rag_service.llm.secondary = None
+    rag_service.embeddings = CountingEmbeddings()
+    rag_service.vector_store = CountingVectorStore()
+
+    print(f"Burst of {size} identical questions")
+    print(f"{'single-flight':<15}{'llm':>6}{'embed':>7}{'vector':>8}{'wall':>9}")
+    results = {}
+    for run, enabled in enumerate((False, True)):
+        rag_service.single_flight.enabled = enabled
+        # Fresh query embedding cache and conversations for each run
+        rag_service.embedding_cache._entries.clear()
+        calls.clear()
+        elapsed = asyncio.run(burst(size, offset=(run + 1) * 10000))
+        results[enabled] = sum(calls.values())
+        print(
+            f"{'on' if enabled else 'off':<15}{calls['llm']:>6}{calls['embed']:>7}"
+            f"{calls['vector']:>8}{elapsed * 1000:>7.0f}ms"
+        )
+    print(f"Upstream call reduction: {results[False] / max(results[True], 1):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
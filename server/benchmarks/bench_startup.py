@@ -0,0 +1,103 @@
+"""
+Cold-start benchmark: how long a fresh process takes to import the app, to
+answer its first /health request, and to finish the background warm-up.
+
+Each run is a new interpreter, as for an autoscaled replica. Dummy keys and
+a throwaway local vector store keep it offline; with the default Pinecone
+backend the warm-up additionally includes the index lookup round trip.
+Also lists the slowest imports (cumulative, from -X importtime).
+
+Usage:
+    python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    client.get("/health")
+    ready = time.perf_counter()
+    while not client.get("/health").json()["warmed_up"]:
+        time.sleep(0.01)
+    warm = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "first_response": ready - start,
+    "warmed_up": warm - start,
+}))
+"""
+
+
+def environment():
+    env = dict(os.environ)
+    for key in ("GROQ_API_KEY", "MISTRAL_API_KEY", "PINECONE_API_KEY"):
+        env.setdefault(key, "bench")
+    env.setdefault("HF_HUB_OFFLINE", "1")
+    env["VECTOR_STORE"] = "local"
+    env["LOCAL_VECTOR_STORE_PATH"] = tempfile.mkdtemp()
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+    return env
+
+
+def probe(env):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(env, n=8):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SERVER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Direct imports of main only, to avoid listing a chain of parents
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    env = environment()
+    results = [probe(env) for _ in range(runs)]
+
+    print(f"Median of {runs} cold starts")
+    for stage in ("import", "first_response", "warmed_up"):
+        median = statistics.median(r[stage] for r in results)
+        print(f"  {stage:<16}{median * 1000:>8.0f} ms")
+
+    print("Slowest imports under main (cumulative)")
+    for cumulative, name in slowest_imports(env):
+        print(f"  {name:<40}{cumulative / 1000:>8.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import os
 from pinecone import Pinecone
 from dotenv import load_dotenv
+from app.services.ingestion import reset_ingest_state
 
 load_dotenv()
 
@@ -12,4 +13,5 @@ index = pc.Index(index_name)
 
 print(f"Deleting all vectors from index '{index_name}'...")
 index.delete(delete_all=True)
+reset_ingest_state()
 print("✅ All vectors deleted! Index is now empty and ready for fresh data.")
@@ -1,147 +1,210 @@
+import argparse
 import os
-import re
-from typing import List, Dict
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_pinecone import PineconeVectorStore
-from pinecone import Pinecone
+from typing import Dict
 from dotenv import load_dotenv
-from uuid import uuid4
+from app.services.vector_store import build_vector_store, VECTOR_STORE_BACKEND
+from app.services.ingestion import (
+    DATA_DIR,
+    INGEST_MANIFEST_PATH,
+    IngestManifest,
+    IngestionPipeline,
+    watch,
+)
+from app.services.bm25_index import BM25Index, BM25_INDEX_PATH
+from app.services.chunking import CHUNK_OVERLAP, CHUNK_SIZE
+from app.services.disk_embedding_cache import EMBEDDING_CACHE, DiskEmbeddingCache
+from app.services.section_index import SectionIndex, SECTION_INDEX_PATH
 
 load_dotenv()
 
-print("Google API:", os.environ.get("GOOGLE_API_KEY"))
-print("Pinecone API:", os.environ.get("PINECONE_API_KEY"))
+DOMAIN_MAP = {
+    "acts/criminal_law": "Criminal Law",
+    "acts/corporate_law": "Corporate & Commercial Law",
+    "acts/it_law": "Cyber & IT Law",
+    "policies": "Policy",
+    "cases": "Case Law",
+}
 
-BASE_DIR = os.path.dirname(__file__)
-DATA_DIR = os.path.join(BASE_DIR, "data")
+# Embedding model and the environment variable holding its API key
+EMBEDDERS = {
+    "mistral": ("mistral-embed", "MISTRAL_API_KEY"),
+    "gemini": ("models/embedding-001", "GOOGLE_API_KEY"),
+}
 
 
-def chunk_text_by_section(text: str, act_name: str, domain: str) -> List[Dict]:
-    pattern = r"(Section\s+\d+[A-Z]*)"
-    splits = re.split(pattern, text)
-    chunks = []
-    MAX_CHUNK_SIZE = 8000
+def pipeline_name(
+    embedder: str, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP
+) -> str:
+    """Recorded in the manifest; changing the model or chunking re-indexes everything"""
+    return f"{EMBEDDERS[embedder][0]}|statute:{chunk_size}:{chunk_overlap}"
 
-    if splits[0].strip():
-        preamble_text = splits[0].strip()[:MAX_CHUNK_SIZE]
-        chunks.append(
-            {
-                "text": preamble_text,
-                "metadata": {"act": act_name, "section": "Preamble", "domain": domain},
-            }
-        )
-
-    for i in range(1, len(splits), 2):
-        header = splits[i]
-        body = splits[i + 1] if i + 1 < len(splits) else ""
-        full_chunk = f"{header}\n{body}".strip()
-
-        if len(full_chunk) > MAX_CHUNK_SIZE:
-            full_chunk = full_chunk[:MAX_CHUNK_SIZE] + "... [truncated]"
-
-        sec_num = header.replace("Section", "").strip()
-
-        chunks.append(
-            {
-                "text": full_chunk,
-                "metadata": {"act": act_name, "section": sec_num, "domain": domain},
-            }
-        )
-    return chunks
-
-
-def ingest_data():
-    print("Starting SamvidhanAI Data Ingestion with Pinecone...")
-
-    pc = Pinecone(api_key=os.environ.get("PINECONE_API_KEY"))
-    index_name = os.environ.get("PINECONE_INDEX", "samvidhan")
-    index = pc.Index(index_name)
-
-    print("Initializing Google Gemini embeddings...")
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
-        google_api_key=os.environ.get("GOOGLE_API_KEY"),
-        task_type="retrieval_document",
-        max_retries=1,
-    )
-    vector_store = PineconeVectorStore(embedding=embeddings, index=index)
-
-    domain_map = {
-        "acts/it_law": "IT_LAW",
-        "acts/criminal_law": "CRIMINAL_LAW",
-        "acts/corporate_law": "CORPORATE_LAW",
-        "policies": "POLICY",
-        "cases": "CASE_LAW",
-    }
 
-    all_documents = []
-
-    for subfolder, domain in domain_map.items():
+def list_sources() -> Dict[str, str]:
+    sources = {}
+    for subfolder in DOMAIN_MAP:
         folder_path = os.path.join(DATA_DIR, subfolder)
         if not os.path.exists(folder_path):
-            print(f"Folder not found: {folder_path}, skipping...")
             continue
-
         for filename in os.listdir(folder_path):
-            file_path = os.path.join(folder_path, filename)
+            if filename.endswith((".pdf", ".txt")):
+                sources[f"{subfolder}/{filename}"] = os.path.join(folder_path, filename)
+    return sources
 
-            if filename.endswith(".pdf"):
-                print(f"Processing PDF {filename} ({domain})...")
 
-                loader = PyPDFLoader(file_path)
-                documents = loader.load()
+def source_metadata(name: str) -> Dict[str, str]:
+    subfolder, filename = name.rsplit("/", 1)
+    return {
+        "act": os.path.splitext(filename)[0],
+        "domain": DOMAIN_MAP[subfolder],
+        "source_file": f"./data/{name}",
+    }
 
-                raw_text = "\n".join([doc.page_content for doc in documents])
 
-                file_chunks = chunk_text_by_section(raw_text, filename, domain)
+def build_embeddings(embedder: str):
+    model, key_name = EMBEDDERS[embedder]
+    api_key = os.environ.get(key_name)
+    if not api_key:
+        raise ValueError(f"{key_name} not found in .env")
 
-                for chunk in file_chunks:
-                    from langchain_core.documents import Document
+    if embedder == "mistral":
+        from langchain_mistralai import MistralAIEmbeddings
 
-                    doc = Document(
-                        page_content=chunk["text"], metadata=chunk["metadata"]
-                    )
-                    all_documents.append(doc)
+        return MistralAIEmbeddings(model=model, mistral_api_key=api_key)
 
-            elif filename.endswith(".txt"):
-                print(f"Processing TXT {filename} ({domain})...")
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        raw_text = f.read()
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-                    file_chunks = chunk_text_by_section(raw_text, filename, domain)
+    return GoogleGenerativeAIEmbeddings(
+        model=model,
+        google_api_key=api_key,
+        task_type="retrieval_document",
+        max_retries=1,
+    )
 
-                    for chunk in file_chunks:
-                        from langchain_core.documents import Document
 
-                        doc = Document(
-                            page_content=chunk["text"], metadata=chunk["metadata"]
-                        )
-                        all_documents.append(doc)
-                except Exception as e:
-                    print(f"Error reading {filename}: {e}")
+def print_throughput(pipeline: IngestionPipeline):
+    for stage, report in pipeline.throughput().items():
+        rates = ", ".join(
+            f"{value} {unit[: -len('_per_s')]}/s"
+            for unit, value in report.items()
+            if unit.endswith("_per_s")
+        )
+        print(
+            f"  {stage:<7} {rates or 'idle'} "
+            f"(active {report['active_s']}s, busy {report['busy_s']}s)"
+        )
 
-    if all_documents:
-        print(f"\nTotal chunks to upload: {len(all_documents)}")
 
-        uuids = [str(uuid4()) for _ in range(len(all_documents))]
+def ingest_data(
+    embedder: str = "mistral",
+    chunk_size: int = CHUNK_SIZE,
+    chunk_overlap: int = CHUNK_OVERLAP,
+    watch_mode: bool = False,
+    interval: float = 5.0,
+):
+    print(
+        f"Starting SamvidhanAI Data Ingestion ({embedder}, {VECTOR_STORE_BACKEND})..."
+    )
+    if VECTOR_STORE_BACKEND == "pinecone" and not os.environ.get("PINECONE_API_KEY"):
+        raise ValueError("PINECONE_API_KEY not found in .env")
 
-        print("Uploading to Pinecone...")
-        vector_store.add_documents(documents=all_documents, ids=uuids)
+    embeddings = build_embeddings(embedder)
+    vector_store = build_vector_store(embeddings)
+    bm25_index = BM25Index.load(BM25_INDEX_PATH)
+    section_index = SectionIndex.load(SECTION_INDEX_PATH)
 
+    if not os.path.exists(INGEST_MANIFEST_PATH):
         print(
-            "SUCCESS: All chunks + metadata + embeddings uploaded to Pinecone successfully!"
+            "No ingestion manifest yet: chunks from earlier runs are not tracked, "
+            "clear the index first (clear_pinecone.py) if it already has data."
         )
-    else:
+    manifest = IngestManifest.load(
+        INGEST_MANIFEST_PATH, pipeline_name(embedder, chunk_size, chunk_overlap)
+    )
+    embedding_cache = (
+        DiskEmbeddingCache.from_env(EMBEDDERS[embedder][0]) if EMBEDDING_CACHE else None
+    )
+    pipeline = IngestionPipeline.from_env(
+        manifest,
+        embeddings,
+        vector_store,
+        bm25_index,
+        section_index,
+        metadata_for=source_metadata,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        embedding_cache=embedding_cache,
+    )
+
+    def run(sources: Dict[str, str]) -> Dict[str, int]:
+        stats = pipeline.run(sources)
+        print_throughput(pipeline)
+        return stats
+
+    if watch_mode:
+        watch(list_sources, run, interval)
+        return
+
+    sources = list_sources()
+    if not sources:
         print("No PDF/TXT data found. Please add files to 'server/data/acts/...'")
+        return
+
+    print(f"Found {len(sources)} source files")
+    stats = run(sources)
+    print(f"\nIngestion summary: {stats}")
+    print(f"  BM25 keyword index: {len(bm25_index)} chunks")
+    print(f"  Section lookup table: {len(section_index)} sections")
+    if embedding_cache is not None:
+        print(f"  Embedding cache: {embedding_cache.stats()}")
+
+    if VECTOR_STORE_BACKEND == "local":
+        total_vectors = len(vector_store)
+    else:
+        total_vectors = vector_store.index.describe_index_stats().total_vector_count
+    expected = len(manifest.chunk_ids())
+    if total_vectors != expected:
+        print(f"Warning: expected {expected} vectors but found {total_vectors}")
+    if stats["files_failed"]:
+        print(f"{stats['files_failed']} files failed and will be retried next run.")
+    else:
+        print("SUCCESS: Index is up to date with server/data.")
 
 
-if __name__ == "__main__":
+def main(default_embedder: str = "mistral"):
+    parser = argparse.ArgumentParser(description="Incremental SamvidhanAI ingestion")
+    parser.add_argument(
+        "--embedder", choices=sorted(EMBEDDERS), default=default_embedder
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="target chunk characters"
+    )
+    parser.add_argument(
+        "--chunk-overlap",
+        type=int,
+        default=CHUNK_OVERLAP,
+        help="characters repeated between chunks of a long section",
+    )
+    parser.add_argument(
+        "--watch", action="store_true", help="re-index server/data on change"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5.0, help="watch polling interval (s)"
+    )
+    args = parser.parse_args()
     try:
-        ingest_data()
+        ingest_data(
+            embedder=args.embedder,
+            chunk_size=args.chunk_size,
+            chunk_overlap=args.chunk_overlap,
+            watch_mode=args.watch,
+            interval=args.interval,
+        )
     except Exception as e:
         print(f"Ingestion Failed: {e}")
         import traceback
 
         traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
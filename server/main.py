@@ -1,10 +1,20 @@
-from fastapi import FastAPI
+import asyncio
+import os
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import search, summarize, compare, auth, conversations, chat, speech
 from app.database import engine, Base, SessionLocal
 from app.models.conversation import LegalDomain
+from app.services.rag_service import rag_service
+from app.services.llm_client import LLM_REQUEST_DEADLINE, llm_client, request_deadline
+
+# PDF summaries generate up to 4000 tokens, and their route timeout (90 s)
+# exceeds the default request deadline
+LLM_SUMMARIZE_DEADLINE = float(os.environ.get("LLM_SUMMARIZE_DEADLINE", "120"))
 
-Base.metadata.create_all(bind=engine)
+# Build the RAG clients and indexes in the background once the server is up
+WARM_UP = os.environ.get("WARM_UP", "true").lower() == "true"
 
 app = FastAPI(
     title="SamvidhanAI Server",
@@ -21,6 +31,29 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def llm_deadline(request: Request, call_next):
+    if request.url.path.startswith(summarize.router.prefix):
+        seconds = LLM_SUMMARIZE_DEADLINE
+    else:
+        seconds = LLM_REQUEST_DEADLINE
+    with request_deadline(seconds):
+        return await call_next(request)
+
+
+@app.on_event("startup")
+def create_tables():
+    Base.metadata.create_all(bind=engine)
+
+
+@app.on_event("startup")
+async def schedule_warm_up():
+    if WARM_UP:
+        # Not awaited: the server starts accepting traffic right away, and
+        # requests that arrive first build whatever they need on demand
+        app.state.warm_up = asyncio.create_task(asyncio.to_thread(rag_service.warm_up))
+
+
 @app.on_event("startup")
 def seed_legal_domains():
     db = SessionLocal()
@@ -86,6 +119,16 @@ def seed_legal_domains():
         db.close()
 
 
+@app.on_event("shutdown")
+def persist_caches():
+    rag_service.embedding_cache.save()
+
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm_client.aclose()
+
+
 @app.get("/")
 def read_root():
     return {"message": "SamvidhanAI Server is running. RAG System Ready with Pinecone."}
@@ -93,7 +136,24 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
+    return {"status": "ok", "warmed_up": rag_service.warmed_up}
+
+
+@app.get("/health/cache")
+def cache_stats():
+    return {
+        "query_embeddings": rag_service.embedding_cache.stats(),
+        "disk_embeddings": rag_service.disk_embedding_stats(),
+        "answers": rag_service.answer_cache.stats(),
+        "search_answers": rag_service.search_answer_cache.stats(),
+        "single_flight": rag_service.single_flight.stats(),
+        "embedding_batches": rag_service.embedding_batcher.stats(),
+    }
+
+
+@app.get("/health/llm")
+def llm_stats():
+    return llm_client.stats()
 
 
 app.include_router(search.router)
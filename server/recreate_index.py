@@ -1,6 +1,7 @@
 import os
 from pinecone import Pinecone, ServerlessSpec
 from dotenv import load_dotenv
+from app.services.ingestion import reset_ingest_state
 
 load_dotenv()
 
@@ -23,4 +24,5 @@ pc.create_index(
     metric="cosine",
     spec=ServerlessSpec(cloud="aws", region="us-east-1"),
 )
+reset_ingest_state()
 print("SUCCESS! New index created with 768 dimensions for Google Gemini embeddings!")
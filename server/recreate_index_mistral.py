@@ -1,6 +1,7 @@
 
 from pinecone import Pinecone, ServerlessSpec
 from dotenv import load_dotenv
+from app.services.ingestion import reset_ingest_state
 import os
 import time
 
@@ -29,6 +30,7 @@ print("[*] Waiting for index to be ready...")
 while not pc.describe_index(index_name).status["ready"]:
     time.sleep(1)
 
+reset_ingest_state()
 print(f"\n[+] Index '{index_name}' created successfully!")
 print(f"[+] Dimension: 1024 (Mistral)")
 print(f"[+] Metric: cosine")
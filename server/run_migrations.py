@@ -0,0 +1,31 @@
+"""
+Runs every migration script in one interpreter, in order, so startup pays for
+Python, SQLAlchemy and the database driver once instead of once per script.
+A script that exits with an error stops the run with the same status.
+"""
+
+import os
+import runpy
+import sys
+
+MIGRATIONS = [
+    "add_citations_migration.py",
+    "add_related_cases_migration.py",
+    "add_message_history_index_migration.py",
+    "add_conversation_summary_migration.py",
+]
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    for script in MIGRATIONS:
+        try:
+            runpy.run_path(os.path.join(BASE_DIR, script), run_name="__main__")
+        except SystemExit as e:
+            if e.code:
+                sys.exit(e.code)
+
+
+if __name__ == "__main__":
+    main()
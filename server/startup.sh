@@ -3,9 +3,8 @@ set -e
 
 echo "🔄 Running database migrations..."
 
-# Run the migration scripts
-python add_citations_migration.py
-python add_related_cases_migration.py
+# Run the migration scripts (all in one process)
+python run_migrations.py
 
 echo "✅ Migrations complete!"
 echo "🚀 Starting FastAPI server..."
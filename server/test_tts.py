@@ -1,4 +1,5 @@
 from app.services.sarvam_service import SarvamService
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -7,7 +8,7 @@ load_dotenv()
 def test_tts():
     service = SarvamService()
     print("Testing TTS...")
-    audio = service.text_to_speech("Namaste, this is a test audio.")
+    audio = asyncio.run(service.text_to_speech("Namaste, this is a test audio."))
     if audio:
         print("TTS Success! Audio length:", len(audio))
     else: